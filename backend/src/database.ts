@@ -37,6 +37,10 @@ export async function initDatabase() {
       is_correct BOOLEAN NOT NULL,
       FOREIGN KEY (question_id) REFERENCES questions(id)
     );
+
+    CREATE INDEX IF NOT EXISTS idx_answers_question_id ON answers(question_id);
+    CREATE INDEX IF NOT EXISTS idx_questions_category_difficulty
+      ON questions(category_id, difficulty);
   `);
 
   // Seed if empty
@@ -77,8 +81,23 @@ async function seedDatabase() {
 }
 
 // Fetch a random question from the DB
+// Uses the dense sampling keys built by scripts/optimize_database.py when
+// present (one primary-key lookup), falling back to a full random scan.
+// Triggers keep the keys in step with inserts and deletes, so every stored
+// question can be picked.
 export async function getRandomQuestion(): Promise<QuestionTemplate | null> {
-  const questionRow = await db.get(`
+  const sampledRow = await db.get(`
+    SELECT q.id, q.text, q.difficulty, c.name as category
+    FROM question_sample s
+    JOIN questions q ON q.id = s.question_id
+    JOIN categories c ON q.category_id = c.id
+    WHERE s.stratum = 'all'
+      AND s.slot = (
+        SELECT abs(random()) % size FROM question_sample_counts WHERE stratum = 'all'
+      )
+  `).catch(() => undefined);
+
+  const questionRow = sampledRow ?? await db.get(`
     SELECT q.id, q.text, q.difficulty, c.name as category
     FROM questions q
     JOIN categories c ON q.category_id = c.id
@@ -86,7 +105,36 @@ export async function getRandomQuestion(): Promise<QuestionTemplate | null> {
   `);
 
   if (!questionRow) return null;
+  return loadQuestion(questionRow);
+}
+
+// Pick one of the shuffled no-repeat decks built by scripts/build_decks.py,
+// or null if there are none.
+export async function pickDeck(): Promise<number | null> {
+  const row = await db.get(`
+    SELECT abs(random()) % ((SELECT MAX(deck_id) FROM decks) + 1) AS deckId
+  `).catch(() => undefined);
+  return row?.deckId ?? null;
+}
+
+// Fetch the question at `position` (0-based round) of a deck: one
+// primary-key lookup. Returns null past the end of the deck.
+export async function getDeckQuestion(deckId: number, position: number): Promise<QuestionTemplate | null> {
+  const questionRow = await db.get(`
+    SELECT q.id, q.text, q.difficulty, c.name as category
+    FROM decks d
+    JOIN questions q ON q.id = d.question_id
+    JOIN categories c ON q.category_id = c.id
+    WHERE d.deck_id = ? AND d.position = ?
+  `, deckId, position).catch(() => undefined);
+
+  if (!questionRow) return null;
+  return loadQuestion(questionRow);
+}
 
+async function loadQuestion(
+  questionRow: { id: number; text: string; difficulty: QuestionTemplate['difficulty']; category: string }
+): Promise<QuestionTemplate> {
   const answerRows = await db.all(`
     SELECT text, is_correct as isCorrect
     FROM answers
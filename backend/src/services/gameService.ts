@@ -7,7 +7,7 @@ import { gameState, updateGameState, resetGame as resetGameState } from '../game
 import { Player, Question } from '@/common/types/game';
 import { broadcastGameState, broadcastPlayerUpdates, sendPlayerKickedMessage } from '../websocket';
 import { config } from '../config';
-import { getRandomQuestion } from '../database';
+import { getDeckQuestion, getRandomQuestion, pickDeck } from '../database';
 import { shuffleArray, createIndexMapping } from '../utils/arrayUtils';
 
 // ============================================================================
@@ -24,6 +24,9 @@ let nextGamePlayers: { id: string; name: string; avatar: number }[] = [];
 // Track which player should start the round for fair rotation
 let startingPlayerIndex: number = 0;
 
+// Precomputed deck for the current game (see scripts/build_decks.py), or null
+let currentDeckId: number | null = null;
+
 // ============================================================================
 // TIMER MANAGEMENT
 // ============================================================================
@@ -212,7 +215,14 @@ function endRound(): void {
  * Shuffles answer options and resets player states
  */
 async function startNewRound(): Promise<void> {
-    const questionTemplate = await getRandomQuestion();
+    // Each game plays through one deck, so questions don't repeat within it
+    if (gameState.currentRound === 0) {
+        currentDeckId = await pickDeck();
+    }
+    const deckQuestion = currentDeckId !== null
+        ? await getDeckQuestion(currentDeckId, gameState.currentRound)
+        : null;
+    const questionTemplate = deckQuestion ?? await getRandomQuestion();
     if (!questionTemplate) {
         endGame('No more questions!');
         return;
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for the question generation and ingest pipeline.
+
+Everything runs against fake_gemini.FakeClient with a configurable simulated
+latency and a throwaway SQLite file, so results are comparable between runs
+and machines without API access. Each stage reports questions/sec, latency
+percentiles and peak RSS. Every stage runs in a fresh interpreter, so the
+peak is that stage's alone (plus the interpreter's own footprint) rather
+than the highest of all stages run so far.
+
+Stages:
+    generate   generate_batch end to end (worker pool, parsing, ingest)
+    parse      generate_questions per call with zero API latency
+    ingest     question_db.insert_questions in response-sized batches
+    legacy     the original row-at-a-time insert with no validation or
+               duplicate checks, one connection and commit per response,
+               kept as a baseline for ingest
+
+With --startup, cli.py start-up is checked instead: each command's wall
+time above a bare interpreter must stay under STARTUP_BUDGET_MS, and none
+of the SDK/imaging modules in HEAVY_MODULES may be imported.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import resource
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from fake_gemini import FakeClient, fake_questions
+
+STAGES = ("generate", "parse", "ingest", "legacy")
+DEFAULT_SIZES = (1000, 10000)
+QUESTIONS_PER_JOB = 10
+
+STARTUP_BUDGET_MS = 100
+STARTUP_RUNS = 5
+HEAVY_MODULES = {"google", "PIL", "pydantic", "httpx", "requests"}
+CLI_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cli.py")
+
+
+def percentile(values, pct):
+    """
+    Return the pct-th percentile of values (nearest-rank).
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def peak_rss_mb():
+    # ru_maxrss is KB on Linux and bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+
+
+def _result(stage, size, questions, elapsed, latencies):
+    return {
+        "stage": stage,
+        "size": size,
+        "questions": questions,
+        "seconds": elapsed,
+        "questions_per_sec": questions / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1e3,
+        "p90_ms": percentile(latencies, 90) * 1e3,
+        "p99_ms": percentile(latencies, 99) * 1e3,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+class _TimedClient:
+    """Wraps a client and records the latency of every generate_content call."""
+
+    def __init__(self, client):
+        self._client = client
+        self.latencies = []
+        self.models = self
+
+    def generate_content(self, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._client.models.generate_content(**kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+
+
+def _jobs(size):
+    jobs = []
+    for i in range(max(1, size // QUESTIONS_PER_JOB)):
+        jobs.append((f"Benchmark - Category {i % 400}", "Medium", QUESTIONS_PER_JOB))
+    return jobs
+
+
+def bench_generate(size, db_path, latency, concurrency):
+    from generate_batch_questions import generate_batch
+
+    client = _TimedClient(FakeClient(latency=latency, seed=size))
+    with contextlib.redirect_stdout(io.StringIO()):
+        summary = generate_batch(
+            _jobs(size),
+            concurrency=concurrency,
+            client=client,
+            db_path=db_path,
+            resume=False,
+        )
+    return _result(
+        "generate",
+        size,
+        summary["questions_added"],
+        summary["elapsed_seconds"],
+        client.latencies,
+    )
+
+
+def bench_parse(size):
+    from generate_questions import generate_questions
+
+    client = FakeClient(seed=size)
+    latencies = []
+    questions = 0
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for category, difficulty, count in _jobs(size):
+            call_started = time.perf_counter()
+            questions += len(generate_questions(category, difficulty, count, client=client))
+            latencies.append(time.perf_counter() - call_started)
+    return _result("parse", size, questions, time.perf_counter() - started, latencies)
+
+
+def _batches(size):
+    rng = random.Random(size)
+    return [
+        fake_questions(category, difficulty, count, rng)
+        for category, difficulty, count in _jobs(size)
+    ]
+
+
+def bench_ingest(size, db_path):
+    from question_db import connect, insert_questions, load_category_ids
+
+    batches = _batches(size)
+    conn = connect(db_path)
+    category_ids = load_category_ids(conn)
+    latencies = []
+    questions = 0
+    started = time.perf_counter()
+    for batch in batches:
+        call_started = time.perf_counter()
+        questions += insert_questions(conn, batch, category_ids).added
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+    conn.close()
+    return _result("ingest", size, questions, elapsed, latencies)
+
+
+def _legacy_insert(questions_data, db_path):
+    # The insert loop add_questions_to_database used before the bulk path:
+    # a connection per call and a statement per row.
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    for question_data in questions_data:
+        cursor.execute(
+            "INSERT OR IGNORE INTO categories (name) VALUES (?)",
+            (question_data["category"],),
+        )
+        cursor.execute(
+            "SELECT id FROM categories WHERE name = ?", (question_data["category"],)
+        )
+        (category_id,) = cursor.fetchone()
+        cursor.execute(
+            "INSERT INTO questions (text, category_id, difficulty) VALUES (?, ?, ?)",
+            (question_data["question"], category_id, question_data["difficulty"]),
+        )
+        question_id = cursor.lastrowid
+        for option in question_data["options"]:
+            cursor.execute(
+                "INSERT INTO answers (question_id, text, is_correct) VALUES (?, ?, ?)",
+                (question_id, option["text"], option["isCorrect"]),
+            )
+    conn.commit()
+    conn.close()
+    return len(questions_data)
+
+
+def bench_legacy(size, db_path):
+    from question_db import connect
+
+    batches = _batches(size)
+    connect(db_path).close()
+    latencies = []
+    questions = 0
+    started = time.perf_counter()
+    for batch in batches:
+        call_started = time.perf_counter()
+        questions += _legacy_insert(batch, db_path)
+        latencies.append(time.perf_counter() - call_started)
+    return _result("legacy", size, questions, time.perf_counter() - started, latencies)
+
+
+def run_stage(stage, size, latency, concurrency):
+    """
+    Run one stage in this process against a throwaway database.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        if stage == "generate":
+            return bench_generate(size, db_path, latency, concurrency)
+        if stage == "parse":
+            return bench_parse(size)
+        if stage == "ingest":
+            return bench_ingest(size, db_path)
+        return bench_legacy(size, db_path)
+
+
+def _run_isolated(stage, size, latency, concurrency):
+    # ru_maxrss never goes down, so each stage gets its own interpreter.
+    completed = subprocess.run(
+        [
+            sys.executable,
+            os.path.abspath(__file__),
+            "--run-stage",
+            stage,
+            "--sizes",
+            str(size),
+            "--latency",
+            str(latency),
+            "--concurrency",
+            str(concurrency),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def run(stages, sizes, latency, concurrency):
+    results = []
+    for size in sizes:
+        for stage in stages:
+            result = _run_isolated(stage, size, latency, concurrency)
+            results.append(result)
+            print(
+                f"{result['stage']:<9} {result['size']:>7} "
+                f"{result['questions_per_sec']:>11.0f} "
+                f"{result['p50_ms']:>9.2f} {result['p90_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+                f"{result['peak_rss_mb']:>9.1f}",
+                flush=True,
+            )
+    return results
+
+
+def _startup_ms(argv, runs=STARTUP_RUNS):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *argv],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def _imported_modules(argv):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=False,
+    )
+    return {
+        line.rsplit("|", 1)[1].strip().split(".")[0]
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+def check_startup(runs=STARTUP_RUNS):
+    """
+    Time cli.py --help, the wrapped scripts' --help and the database-only
+    commands. Returns True if all stay within STARTUP_BUDGET_MS of a bare
+    interpreter and import none of HEAVY_MODULES.
+    """
+    from question_db import connect
+
+    baseline = _startup_ms(["-c", "pass"], runs)
+    print(f"bare interpreter: {baseline:.1f} ms (budget: +{STARTUP_BUDGET_MS} ms)")
+    print(f"{'command':<36} {'ms':>8} {'over bare':>10}  heavy imports")
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "startup.db")
+        connect(db_path).close()
+        commands = [
+            ["--help"],
+            ["generate", "--help"],
+            ["batch", "--help"],
+            ["image", "--help"],
+            ["stats", "--db", db_path],
+            ["search", "--db", db_path, "messi"],
+            ["ingest", "--db", db_path, os.path.join(tmp, "missing.json")],
+        ]
+        for command in commands:
+            argv = [CLI_PATH, *command]
+            ms = _startup_ms(argv, runs)
+            heavy = sorted(_imported_modules(argv) & HEAVY_MODULES)
+            within = ms - baseline <= STARTUP_BUDGET_MS and not heavy
+            ok = ok and within
+            label = " ".join(command).replace(db_path, "DB").replace(tmp, "<tmp>")
+            print(
+                f"{label:<36} {ms:>8.1f} {ms - baseline:>+10.1f}  "
+                f"{', '.join(heavy) or '-'}{'' if within else '  OVER BUDGET'}"
+            )
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--stages",
+        default=",".join(STAGES),
+        help=f"comma-separated stages to run (default: {','.join(STAGES)})",
+    )
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="comma-separated corpus sizes in questions, e.g. 1000,10000,100000",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.05,
+        help="simulated seconds per API call in the generate stage (default: 0.05)",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=16,
+        help="worker pool size for the generate stage (default: 16)",
+    )
+    parser.add_argument("--json", help="also write results as JSON to this file")
+    parser.add_argument(
+        "--startup",
+        action="store_true",
+        help="check cli.py start-up time and imports instead of running stages",
+    )
+    # Used by run() to measure one stage in a child process.
+    parser.add_argument("--run-stage", choices=STAGES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.startup:
+        sys.exit(0 if check_startup() else 1)
+
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(sorted(unknown))}")
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    logging.disable(logging.WARNING)
+
+    if args.run_stage:
+        result = run_stage(args.run_stage, sizes[0], args.latency, args.concurrency)
+        print(json.dumps(result))
+        return
+
+    print(
+        f"{'stage':<9} {'size':>7} {'questions/s':>11} "
+        f"{'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'peak MB':>9}"
+    )
+    results = run(stages, sizes, args.latency, args.concurrency)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
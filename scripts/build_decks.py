@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Build shuffled, no-repeat question decks for game sessions.
+
+A deck holds one question per round (config.maxRounds in the backend). Its
+rounds are split across difficulties in proportion to the corpus, each
+round's category is drawn with the alias method from that difficulty's
+per-category counts, and no category or question appears twice in a deck.
+Within each category/difficulty the questions are dealt from a shuffled
+pool that is only reshuffled once exhausted, so none of a category's
+questions is dealt again before all of them have been.
+
+Decks are written to the decks table as (deck_id, position) -> question_id
+with deck ids numbered 0..count-1, so the server picks a deck per game and
+fetches each round's question with one primary-key lookup. Rerun after
+ingesting new questions.
+"""
+
+import argparse
+import math
+import os
+import random
+import re
+import time
+
+from question_db import DEFAULT_DB_PATH, connect
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_CONFIG = os.path.join(REPO_ROOT, "backend", "src", "config.ts")
+DEFAULT_ROUNDS = 10
+# Category weights are counts ** DEFAULT_FLATTEN: 1 keeps the corpus mix,
+# 0 gives every category the same share of rounds.
+DEFAULT_FLATTEN = 0.5
+# Draws per round before a deck may repeat a category.
+_MAX_DRAWS = 64
+
+DECK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS decks (
+    deck_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    question_id INTEGER NOT NULL,
+    PRIMARY KEY (deck_id, position)
+) WITHOUT ROWID;
+"""
+
+
+def read_max_rounds(config_path=BACKEND_CONFIG):
+    """
+    Return maxRounds from the backend config, or DEFAULT_ROUNDS if the file
+    or setting is missing.
+    """
+    try:
+        with open(config_path, encoding="utf-8") as f:
+            match = re.search(r"\bmaxRounds\s*:\s*(\d+)", f.read())
+    except OSError:
+        return DEFAULT_ROUNDS
+    return int(match.group(1)) if match else DEFAULT_ROUNDS
+
+
+class AliasTable:
+    """
+    Walker's alias method: O(n) setup, then O(1) weighted draws of `items`.
+    """
+
+    def __init__(self, items, weights):
+        self.items = list(items)
+        n = len(self.items)
+        total = sum(weights)
+        scaled = [weight * n / total for weight in weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+
+    def draw(self, rng=random):
+        i = rng.randrange(len(self.items))
+        return self.items[i if rng.random() < self.prob[i] else self.alias[i]]
+
+
+class _Pool:
+    # Questions of one category/difficulty, dealt in shuffled order.
+    def __init__(self, question_ids, rng):
+        self.ids = list(question_ids)
+        self.rng = rng
+        self.next = len(self.ids)
+
+    def take(self, exclude):
+        for _ in range(len(self.ids)):
+            if self.next == len(self.ids):
+                self.rng.shuffle(self.ids)
+                self.next = 0
+            question_id = self.ids[self.next]
+            self.next += 1
+            if question_id not in exclude:
+                return question_id
+        return None
+
+
+def load_strata(conn):
+    """
+    Return {(category_id, difficulty): [question ids]}.
+    """
+    strata = {}
+    for category_id, difficulty, question_id in conn.execute(
+        "SELECT category_id, difficulty, id FROM questions ORDER BY category_id, difficulty, id"
+    ):
+        strata.setdefault((category_id, difficulty), []).append(question_id)
+    return strata
+
+
+def allocate(total, counts):
+    """
+    Split `total` slots across the keys of `counts` in proportion to their
+    values (largest remainder). Returns {key: slots}.
+    """
+    size = sum(counts.values())
+    quotas = {key: total * count / size for key, count in counts.items()}
+    slots = {key: math.floor(quota) for key, quota in quotas.items()}
+    by_remainder = sorted(quotas, key=lambda key: slots[key] - quotas[key])
+    for key in by_remainder[: total - sum(slots.values())]:
+        slots[key] += 1
+    return slots
+
+
+def build_decks(strata, deck_count, deck_size, flatten=DEFAULT_FLATTEN, rng=None):
+    """
+    Yield `deck_count` decks of `deck_size` distinct question ids each, in
+    play order. See the module docstring for how questions are chosen.
+    """
+    rng = rng or random.Random()
+    if sum(len(ids) for ids in strata.values()) < deck_size:
+        raise ValueError(f"need at least {deck_size} questions to build a deck")
+
+    pools = {key: _Pool(ids, rng) for key, ids in strata.items()}
+    per_difficulty = {}
+    for key, ids in strata.items():
+        per_difficulty.setdefault(key[1], {})[key] = len(ids)
+    tables = {
+        difficulty: AliasTable(counts, [count**flatten for count in counts.values()])
+        for difficulty, counts in per_difficulty.items()
+    }
+    difficulty_counts = {
+        difficulty: sum(counts.values()) for difficulty, counts in per_difficulty.items()
+    }
+    all_keys = list(strata)
+
+    for _ in range(deck_count):
+        deck = []
+        used = set()
+        used_categories = set()
+        slots = allocate(deck_size, difficulty_counts)
+        for difficulty, rounds in slots.items():
+            for _ in range(rounds):
+                question_id = None
+                for attempt in range(_MAX_DRAWS * 2):
+                    if attempt < _MAX_DRAWS:
+                        key = tables[difficulty].draw(rng)
+                        if key[0] in used_categories:
+                            continue
+                    else:
+                        # Too few categories left in this difficulty.
+                        key = rng.choice(all_keys)
+                    question_id = pools[key].take(used)
+                    if question_id is not None:
+                        break
+                if question_id is None:
+                    raise ValueError("could not fill a deck without repeats")
+                deck.append(question_id)
+                used.add(question_id)
+                used_categories.add(key[0])
+        rng.shuffle(deck)
+        yield deck
+
+
+def write_decks(conn, decks):
+    """
+    Replace the decks table with `decks` in one transaction.
+
+    Returns (decks written, rows written).
+    """
+    conn.executescript(DECK_SCHEMA)
+    count = 0
+    rows = 0
+    with conn:
+        conn.execute("DELETE FROM decks")
+        for deck_id, deck in enumerate(decks):
+            conn.executemany(
+                "INSERT INTO decks (deck_id, position, question_id) VALUES (?, ?, ?)",
+                [(deck_id, position, question_id) for position, question_id in enumerate(deck)],
+            )
+            count += 1
+            rows += len(deck)
+    return count, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--db",
+        default=DEFAULT_DB_PATH,
+        help=f"SQLite database path (default: {DEFAULT_DB_PATH})",
+    )
+    parser.add_argument(
+        "-n",
+        "--decks",
+        type=int,
+        help="decks to build (default: enough to deal every question once)",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        help="questions per deck (default: maxRounds from backend/src/config.ts)",
+    )
+    parser.add_argument(
+        "--flatten",
+        type=float,
+        default=DEFAULT_FLATTEN,
+        help="category weight exponent: 1 follows the corpus mix, 0 treats "
+        f"every category equally (default: {DEFAULT_FLATTEN})",
+    )
+    parser.add_argument("--seed", type=int, help="random seed for reproducible decks")
+    args = parser.parse_args()
+
+    deck_size = args.rounds or read_max_rounds()
+    conn = connect(args.db)
+    started = time.perf_counter()
+    strata = load_strata(conn)
+    questions = sum(len(ids) for ids in strata.values())
+    deck_count = args.decks if args.decks is not None else questions // deck_size
+
+    try:
+        decks = build_decks(
+            strata, deck_count, deck_size, flatten=args.flatten, rng=random.Random(args.seed)
+        )
+        written, rows = write_decks(conn, decks)
+        (covered,) = conn.execute("SELECT COUNT(DISTINCT question_id) FROM decks").fetchone()
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        conn.close()
+
+    print(
+        f"Wrote {written} decks of {deck_size} questions ({rows} rows) from "
+        f"{questions} questions in {len(strata)} category/difficulty strata "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+    print(f"Decks cover {covered}/{questions} questions ({covered / (questions or 1):.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Stream questions from NDJSON or JSON-array files into the database.
+
+Files are read incrementally, so memory use does not grow with file size:
+NDJSON one line at a time, JSON arrays through json_stream.iter_json_array.
+The format is detected from the first non-blank character ('[' means a JSON
+array, anything else NDJSON) unless --format is given.
+
+Questions are inserted with question_db.insert_questions in batches of
+--batch-size, one transaction per batch, so they get the same validation,
+quarantine and duplicate checks as generated questions. NDJSON lines that
+aren't valid JSON are quarantined too, with reason "malformed_json". A
+batch that has been committed stays committed if a later one fails.
+Progress (share of the file read, questions per second) is printed to
+stderr.
+"""
+
+import argparse
+import codecs
+import json
+import logging
+import os
+import sys
+import time
+from itertools import islice
+
+from json_stream import JSONStreamError, iter_json_array
+from question_db import (
+    DEFAULT_DB_PATH,
+    IngestResult,
+    connect,
+    insert_questions,
+    load_category_ids,
+)
+from validation import insert_quarantine
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("auto", "json", "ndjson")
+DEFAULT_BATCH_SIZE = 5000
+READ_SIZE = 1 << 20
+# Seconds between progress lines.
+PROGRESS_INTERVAL = 0.5
+
+
+class _ByteCounter:
+    # Counts the bytes read so far, for progress against the file size.
+    def __init__(self):
+        self.bytes_read = 0
+
+
+def detect_format(path):
+    """
+    Return "json" if the first non-blank character of `path` is '[',
+    otherwise "ndjson".
+    """
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(4096)
+            if not chunk:
+                return "ndjson"
+            # Skip a UTF-8 byte order mark along with whitespace.
+            stripped = chunk.lstrip(b" \t\r\n\xef\xbb\xbf")
+            if stripped:
+                return "json" if stripped[:1] == b"[" else "ndjson"
+
+
+def _iter_ndjson(f, counter, path, malformed):
+    for line_number, line in enumerate(f, 1):
+        counter.bytes_read += len(line)
+        if not line.strip():
+            continue
+        try:
+            # Decoded here: json.loads would guess UTF-16/32 from the bytes.
+            question = json.loads(line.decode("utf-8-sig" if line_number == 1 else "utf-8"))
+        except ValueError as e:
+            # UnicodeDecodeError is a ValueError too.
+            logger.warning("%s:%d: quarantining malformed line: %s", path, line_number, e)
+            malformed.append(
+                (
+                    line.decode("utf-8", errors="replace").rstrip("\r\n"),
+                    [("malformed_json", f"{path}:{line_number}: {e}")],
+                )
+            )
+            continue
+        yield question
+
+
+def _iter_chunks(f, counter):
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    while True:
+        data = f.read(READ_SIZE)
+        counter.bytes_read += len(data)
+        if not data:
+            yield decoder.decode(b"", final=True)
+            return
+        yield decoder.decode(data)
+
+
+def iter_questions(f, fmt, counter, path="<stream>", malformed=None):
+    """
+    Yield the question objects in binary file `f`, in format "json" or
+    "ndjson", adding the bytes read to `counter.bytes_read`.
+
+    Malformed NDJSON lines are skipped and, if `malformed` is a list,
+    appended to it as validation.insert_quarantine rejects. A malformed JSON
+    array raises JSONStreamError, since nothing after the error can be
+    trusted, and invalid UTF-8 in one raises UnicodeDecodeError. Objects are
+    yielded unvalidated; insert_questions checks them.
+    """
+    if fmt == "json":
+        return iter_json_array(_iter_chunks(f, counter))
+    return _iter_ndjson(f, counter, path, [] if malformed is None else malformed)
+
+
+def _progress(path, done, total, rows, seconds, end=""):
+    share = f"{done / total:6.1%}" if total else "  100%"
+    rate = rows / seconds if seconds > 0 else 0.0
+    print(
+        f"\r{path}: {share}  {rows} questions  {rate:,.0f}/s",
+        end=end,
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def _quarantine_malformed(conn, malformed, result):
+    if malformed:
+        with conn:
+            insert_quarantine(conn, malformed)
+        result.rejected += len(malformed)
+        malformed.clear()
+
+
+def import_file(
+    conn,
+    path,
+    fmt="auto",
+    batch_size=DEFAULT_BATCH_SIZE,
+    category_ids=None,
+    progress=True,
+):
+    """
+    Insert every question in `path` in transactions of `batch_size`
+    questions. Pass the same `category_ids` across calls to read the
+    categories table once.
+
+    Malformed NDJSON lines are written to the quarantine table and counted
+    as rejected. Returns an IngestResult. Raises OSError, UnicodeDecodeError
+    or JSONStreamError; questions from batches committed before the error
+    stay in the database.
+    """
+    if category_ids is None:
+        category_ids = load_category_ids(conn)
+    if fmt == "auto":
+        fmt = detect_format(path)
+
+    result = IngestResult()
+    counter = _ByteCounter()
+    total = os.path.getsize(path)
+    rows = 0
+    started = last_report = time.perf_counter()
+
+    malformed = []
+    with open(path, "rb") as f:
+        questions = iter_questions(f, fmt, counter, path, malformed)
+        try:
+            while batch := list(islice(questions, batch_size)):
+                result.merge(insert_questions(conn, batch, category_ids))
+                _quarantine_malformed(conn, malformed, result)
+                rows += len(batch)
+                now = time.perf_counter()
+                if progress and now - last_report >= PROGRESS_INTERVAL:
+                    _progress(path, counter.bytes_read, total, rows, now - started)
+                    last_report = now
+            _quarantine_malformed(conn, malformed, result)
+        finally:
+            if progress:
+                elapsed = time.perf_counter() - started
+                _progress(path, counter.bytes_read, total, rows, elapsed, end="\n")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="+", help="NDJSON or JSON-array files of questions")
+    parser.add_argument(
+        "--db",
+        default=DEFAULT_DB_PATH,
+        help=f"SQLite database path (default: {DEFAULT_DB_PATH})",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="auto",
+        help="input format (default: detect from the first character)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"questions per transaction (default: {DEFAULT_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="don't print progress"
+    )
+    args = parser.parse_args(argv)
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s - %(message)s")
+    conn = connect(args.db)
+    category_ids = load_category_ids(conn)
+    failed = False
+    try:
+        for path in args.files:
+            try:
+                result = import_file(
+                    conn,
+                    path,
+                    fmt=args.format,
+                    batch_size=args.batch_size,
+                    category_ids=category_ids,
+                    progress=not args.quiet,
+                )
+            except (OSError, UnicodeDecodeError, JSONStreamError) as e:
+                print(f"{path}: {e}")
+                failed = True
+                continue
+            print(
+                f"{path}: {result.added} added, {result.duplicates} duplicates, "
+                f"{result.rejected} quarantined"
+            )
+    finally:
+        conn.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
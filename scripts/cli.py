@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Command-line entry point for the question tooling.
+
+Subcommands:
+    generate   run generate_questions.py (all of its options apply)
+    batch      run generate_batch_questions.py (all of its options apply)
+    ingest     run bulk_import.py (all of its options apply)
+    stats      summarize the questions in the database
+    search     ranked full-text search over questions and answers
+    image      run generate_image.py (all of its options apply)
+
+Only argparse is imported up front. Each subcommand imports what it needs
+when it runs, so --help and the database-only commands never load the
+Gemini SDK, and stats and search need nothing beyond sqlite3. See
+benchmark.py --startup for the start-up time check.
+"""
+
+import argparse
+import os
+import sys
+
+# Same as question_db.DEFAULT_DB_PATH, which is too heavy to import for --help.
+DEFAULT_DB_PATH = "./sport10.db"
+# Subcommands that hand their remaining arguments to another script's parser.
+PASSTHROUGH = {"generate", "batch", "image", "ingest"}
+
+
+def cmd_generate(args, argv):
+    from generate_questions import main
+
+    return main(argv)
+
+
+def cmd_batch(args, argv):
+    from generate_batch_questions import main
+
+    return main(argv)
+
+
+def cmd_image(args, argv):
+    from generate_image import main
+
+    return main(argv)
+
+
+def cmd_ingest(args, argv):
+    from bulk_import import main
+
+    return main(argv)
+
+
+def cmd_stats(args):
+    import sqlite3
+
+    # Read-only and without question_db: stats never creates or migrates a
+    # database, and skips importing the ingest machinery.
+    if not os.path.exists(args.db):
+        print(f"No such database: {args.db}")
+        return 1
+    conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+    try:
+        (questions,) = conn.execute("SELECT COUNT(*) FROM questions").fetchone()
+        (answers,) = conn.execute("SELECT COUNT(*) FROM answers").fetchone()
+        (categories,) = conn.execute(
+            "SELECT COUNT(DISTINCT category_id) FROM questions"
+        ).fetchone()
+        quarantined = 0
+        if conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'quarantine'"
+        ).fetchone():
+            (quarantined,) = conn.execute("SELECT COUNT(*) FROM quarantine").fetchone()
+        print(
+            f"{questions} questions, {answers} answers in {categories} categories "
+            f"({quarantined} quarantined)"
+        )
+        for difficulty, count in conn.execute(
+            "SELECT difficulty, COUNT(*) FROM questions GROUP BY difficulty ORDER BY 2 DESC"
+        ):
+            print(f"  {difficulty:<8} {count:>7}")
+        if args.top:
+            print(f"Top {args.top} categories:")
+            for name, count in conn.execute(
+                """
+                SELECT c.name, COUNT(*)
+                FROM questions q
+                JOIN categories c ON c.id = q.category_id
+                GROUP BY q.category_id
+                ORDER BY 2 DESC, c.name
+                LIMIT ?
+                """,
+                (args.top,),
+            ):
+                print(f"  {count:>7}  {name}")
+    finally:
+        conn.close()
+    return 0
+
+
+def cmd_search(args):
+    import sqlite3
+    import time
+
+    from search_index import has_search_index, print_hits, search
+
+    if not os.path.exists(args.db):
+        print(f"No such database: {args.db}")
+        return 1
+    conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+    try:
+        if not has_search_index(conn):
+            print("No search index; build it with: python search_index.py build")
+            return 1
+        started = time.perf_counter()
+        try:
+            hits = search(conn, " ".join(args.terms), args.limit, raw=args.raw)
+        except sqlite3.OperationalError as e:
+            print(f"Invalid query: {e}")
+            return 1
+        print_hits(hits, time.perf_counter() - started)
+    finally:
+        conn.close()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", metavar="command", required=True)
+
+    db_parser = argparse.ArgumentParser(add_help=False)
+    db_parser.add_argument(
+        "--db",
+        default=DEFAULT_DB_PATH,
+        help=f"SQLite database path (default: {DEFAULT_DB_PATH})",
+    )
+
+    # --help for these is answered by the wrapped script's own parser.
+    subparsers.add_parser(
+        "generate", add_help=False, help="generate questions for one category"
+    )
+    subparsers.add_parser(
+        "batch", add_help=False, help="generate questions for many categories at once"
+    )
+    subparsers.add_parser("image", add_help=False, help="generate images with Imagen")
+
+    subparsers.add_parser(
+        "ingest", add_help=False, help="import questions from NDJSON or JSON files"
+    )
+
+    stats = subparsers.add_parser(
+        "stats", parents=[db_parser], help="summarize the questions in the database"
+    )
+    stats.add_argument(
+        "-n",
+        "--top",
+        type=int,
+        default=10,
+        help="list this many of the largest categories (default: 10)",
+    )
+
+    search = subparsers.add_parser(
+        "search", parents=[db_parser], help="full-text search over questions and answers"
+    )
+    search.add_argument(
+        "terms",
+        nargs="+",
+        help='words to find; "quote" phrases, end a word with * for a prefix',
+    )
+    search.add_argument(
+        "-n", "--limit", type=int, default=20, help="most hits to show (default: 20)"
+    )
+    search.add_argument(
+        "--raw", action="store_true", help="pass the query to FTS5 unchanged"
+    )
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+
+    if args.command in PASSTHROUGH:
+        handlers = {
+            "generate": cmd_generate,
+            "batch": cmd_batch,
+            "image": cmd_image,
+            "ingest": cmd_ingest,
+        }
+        return handlers[args.command](args, extra)
+    if extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+
+    handlers = {"stats": cmd_stats, "search": cmd_search}
+    return handlers[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
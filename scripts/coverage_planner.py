@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Coverage-driven generation planning.
+
+Instead of asking for a fixed count per category on every run, the planner
+reads how many questions each category/difficulty already has (one
+aggregate query), compares that with a quota derived from the per-category
+weights in categories.CATEGORIES, and emits jobs only for the deficits.
+
+Categories are compared by their normalized name (see taxonomy), so
+questions stored under an older spelling such as "Sports - Soccer" count
+towards the same quota.
+
+Run as a script for a dry-run report of the planned API calls.
+"""
+
+import argparse
+import math
+
+from categories import CATEGORIES, DIFFICULTIES
+from question_db import DEFAULT_DB_PATH, connect
+from taxonomy import canonical_name
+
+# Largest job the planner emits; bigger deficits are split across requests.
+DEFAULT_MAX_JOB_SIZE = 10
+
+
+def question_counts(conn):
+    """
+    Return {(canonical category name, difficulty): question count}.
+    """
+    counts = {}
+    for name, difficulty, count in conn.execute(
+        """
+        SELECT c.name, q.difficulty, COUNT(*)
+        FROM questions q
+        JOIN categories c ON c.id = q.category_id
+        GROUP BY q.category_id, q.difficulty
+        """
+    ):
+        key = (canonical_name(name), difficulty)
+        counts[key] = counts.get(key, 0) + count
+    return counts
+
+
+def plan_coverage(
+    counts,
+    categories=CATEGORIES,
+    difficulties=DIFFICULTIES,
+    scale=1.0,
+    max_job_size=DEFAULT_MAX_JOB_SIZE,
+):
+    """
+    Compare `counts` (see question_counts) with each category's quota of
+    weight * `scale` questions per difficulty.
+
+    Returns (jobs, rows): the (category, difficulty, count) jobs needed to
+    fill every deficit, at most `max_job_size` questions each, and one
+    report row dict per category/difficulty. Categories listed more than
+    once under equivalent names get the largest of their weights.
+    """
+    quotas = {}
+    for category, weight in categories:
+        key = canonical_name(category)
+        if key not in quotas or weight > quotas[key][1]:
+            quotas[key] = (category, weight)
+
+    jobs = []
+    rows = []
+    for key, (category, weight) in quotas.items():
+        target = math.ceil(weight * scale)
+        for difficulty in difficulties:
+            have = counts.get((key, difficulty), 0)
+            deficit = max(0, target - have)
+            requests = math.ceil(deficit / max_job_size)
+            for i in range(requests):
+                jobs.append(
+                    (category, difficulty, min(max_job_size, deficit - i * max_job_size))
+                )
+            rows.append(
+                {
+                    "category": category,
+                    "difficulty": difficulty,
+                    "have": have,
+                    "target": target,
+                    "deficit": deficit,
+                    "requests": requests,
+                }
+            )
+    return jobs, rows
+
+
+def plan_jobs(conn, scale=1.0, max_job_size=DEFAULT_MAX_JOB_SIZE):
+    """
+    Return the deficit jobs for the database behind `conn`.
+    """
+    jobs, _ = plan_coverage(question_counts(conn), scale=scale, max_job_size=max_job_size)
+    return jobs
+
+
+def print_plan(rows, verbose=False):
+    """
+    Print a dry-run summary of a plan_coverage report.
+    """
+    short = [row for row in rows if row["deficit"]]
+    if verbose:
+        for row in sorted(short, key=lambda row: -row["deficit"]):
+            print(
+                f"  {row['have']:>4}/{row['target']:<4} +{row['deficit']:<4} "
+                f"{row['difficulty']:<6} {row['category']}"
+            )
+
+    questions = sum(row["deficit"] for row in rows)
+    requests = sum(row["requests"] for row in rows)
+    print(
+        f"{len(rows) - len(short)}/{len(rows)} category/difficulty quotas met; "
+        f"{len(short)} short by {questions} questions"
+    )
+    print(f"Planned API calls: {requests} (before packing), {questions} questions")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--db",
+        default=DEFAULT_DB_PATH,
+        help=f"SQLite database path (default: {DEFAULT_DB_PATH})",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="quota per difficulty as a multiple of each category's weight (default: 1)",
+    )
+    parser.add_argument(
+        "--max-job-size",
+        type=int,
+        default=DEFAULT_MAX_JOB_SIZE,
+        help=f"most questions per planned request (default: {DEFAULT_MAX_JOB_SIZE})",
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="list every quota with a deficit"
+    )
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    _, rows = plan_coverage(
+        question_counts(conn), scale=args.scale, max_job_size=args.max_job_size
+    )
+    conn.close()
+    print_plan(rows, verbose=args.verbose)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Compile the question corpus into a compact, read-only packed deck file.
+
+The file is meant to be memory-mapped and served from directly, with no
+per-round database I/O. All integers are little-endian:
+
+    header      8s magic "S10DECK1", u32 question count, u32 string count,
+                u64 offset of the string offsets, u64 offset of the string
+                data, u64 offset of the record offsets, u64 offset of the
+                records
+    strings     u32[string count + 1] offsets into the UTF-8 string data;
+                string i is data[offsets[i]:offsets[i + 1]]
+    records     u32[question count + 1] offsets into the record data; each
+                record is u32 id, u32 text, u32 category, u32 difficulty,
+                u16 option count, u16 correct-answer bitmask, then one u32 per
+                option - every text field is a string table index
+
+Every distinct text (questions, answers, categories, difficulties) is stored
+once, so answers repeated across questions cost four bytes per use.
+"""
+
+import argparse
+import mmap
+import os
+import random
+import sqlite3
+import struct
+import time
+
+from question_db import DEFAULT_DB_PATH
+
+MAGIC = b"S10DECK1"
+HEADER = struct.Struct("<8sIIQQQQ")
+RECORD_HEAD = struct.Struct("<IIIIHH")
+OFFSET = struct.Struct("<I")
+OFFSET_PAIR = struct.Struct("<II")
+MAX_OPTIONS = 16
+
+DEFAULT_DECK_PATH = "./sport10.deck"
+
+
+class _StringTable:
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def intern(self, text):
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+
+def _offsets(chunks):
+    offsets = [0]
+    for chunk in chunks:
+        offsets.append(offsets[-1] + len(chunk))
+    return struct.pack(f"<{len(offsets)}I", *offsets)
+
+
+def export_deck(conn, deck_path=DEFAULT_DECK_PATH):
+    """
+    Write every question in `conn` to a packed deck file.
+
+    Questions with more than MAX_OPTIONS answers are truncated to fit the
+    correct-answer bitmask. Returns the number of questions written.
+    """
+    strings = _StringTable()
+
+    options = {}
+    for question_id, text, is_correct in conn.execute(
+        "SELECT question_id, text, is_correct FROM answers ORDER BY question_id, id"
+    ):
+        options.setdefault(question_id, []).append((strings.intern(text), bool(is_correct)))
+
+    records = []
+    for question_id, text, category, difficulty in conn.execute(
+        """
+        SELECT q.id, q.text, c.name, q.difficulty
+        FROM questions q JOIN categories c ON c.id = q.category_id
+        ORDER BY q.id
+        """
+    ):
+        answers = options.get(question_id, [])[:MAX_OPTIONS]
+        mask = 0
+        for i, (_, is_correct) in enumerate(answers):
+            if is_correct:
+                mask |= 1 << i
+        records.append(
+            RECORD_HEAD.pack(
+                question_id,
+                strings.intern(text),
+                strings.intern(category),
+                strings.intern(difficulty),
+                len(answers),
+                mask,
+            )
+            + struct.pack(f"<{len(answers)}I", *(sid for sid, _ in answers))
+        )
+
+    encoded = [text.encode("utf-8") for text in strings.strings]
+    string_offsets = _offsets(encoded)
+    record_offsets = _offsets(records)
+
+    string_offsets_at = HEADER.size
+    string_data_at = string_offsets_at + len(string_offsets)
+    record_offsets_at = string_data_at + sum(len(chunk) for chunk in encoded)
+    # Keep the u32 record offsets 4-byte aligned.
+    padding = -record_offsets_at % 4
+    record_offsets_at += padding
+    records_at = record_offsets_at + len(record_offsets)
+
+    tmp_path = f"{deck_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(
+            HEADER.pack(
+                MAGIC,
+                len(records),
+                len(encoded),
+                string_offsets_at,
+                string_data_at,
+                record_offsets_at,
+                records_at,
+            )
+        )
+        f.write(string_offsets)
+        f.writelines(encoded)
+        f.write(b"\0" * padding)
+        f.write(record_offsets)
+        f.writelines(records)
+    os.replace(tmp_path, deck_path)
+    return len(records)
+
+
+class PackedDeck:
+    """
+    Read-only view of a packed deck file backed by mmap.
+
+    Opening only parses the header; questions are decoded on access. Offsets
+    are read as explicit little-endian integers, so a deck reads the same on
+    any host.
+    """
+
+    def __init__(self, deck_path=DEFAULT_DECK_PATH):
+        with open(deck_path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            self._count,
+            _,
+            self._string_offsets_at,
+            self._string_data_at,
+            self._record_offsets_at,
+            self._records_at,
+        ) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{deck_path} is not a packed deck file")
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def string(self, string_id):
+        start, end = OFFSET_PAIR.unpack_from(
+            self._map, self._string_offsets_at + 4 * string_id
+        )
+        data = self._string_data_at
+        return self._map[data + start : data + end].decode("utf-8")
+
+    def question(self, index):
+        """
+        Return question number `index` (0-based) in the QuestionTemplate shape
+        the server uses: id, question, options, category, difficulty.
+        """
+        (offset,) = OFFSET.unpack_from(self._map, self._record_offsets_at + 4 * index)
+        at = self._records_at + offset
+        question_id, text, category, difficulty, count, mask = RECORD_HEAD.unpack_from(
+            self._map, at
+        )
+        answer_ids = struct.unpack_from(f"<{count}I", self._map, at + RECORD_HEAD.size)
+        return {
+            "id": question_id,
+            "question": self.string(text),
+            "options": [
+                {"text": self.string(sid), "isCorrect": bool(mask >> i & 1)}
+                for i, sid in enumerate(answer_ids)
+            ],
+            "category": self.string(category),
+            "difficulty": self.string(difficulty),
+        }
+
+    def random_question(self, rng=random):
+        return self.question(rng.randrange(self._count)) if self._count else None
+
+
+def _connect_read_only(db_path):
+    # mode=ro fails on a missing file instead of creating an empty database.
+    return sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+
+def _sqlite_random_question(conn):
+    row = conn.execute(
+        """
+        SELECT q.id, q.text, q.difficulty, c.name
+        FROM questions q JOIN categories c ON q.category_id = c.id
+        ORDER BY RANDOM() LIMIT 1
+        """
+    ).fetchone()
+    answers = conn.execute(
+        "SELECT text, is_correct FROM answers WHERE question_id = ?", (row[0],)
+    ).fetchall()
+    return row, answers
+
+
+def compare(db_path, deck_path, picks=1000):
+    """
+    Print file sizes, open time and per-question pick time for both formats.
+    """
+    db_size = os.path.getsize(db_path)
+    deck_size = os.path.getsize(deck_path)
+    print(f"SQLite database: {db_size / 1024:8.1f} KB  {db_path}")
+    print(
+        f"Packed deck:     {deck_size / 1024:8.1f} KB  {deck_path} "
+        f"({deck_size / db_size:.0%} of the database)"
+    )
+
+    started = time.perf_counter()
+    conn = _connect_read_only(db_path)
+    conn.execute("SELECT COUNT(*) FROM questions").fetchone()
+    db_open = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(picks):
+        _sqlite_random_question(conn)
+    db_pick = (time.perf_counter() - started) / picks
+    conn.close()
+
+    started = time.perf_counter()
+    deck = PackedDeck(deck_path)
+    deck_open = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(picks):
+        deck.random_question()
+    deck_pick = (time.perf_counter() - started) / picks
+    deck.close()
+
+    print(f"Open:  SQLite {db_open * 1e3:7.2f} ms   deck {deck_open * 1e3:7.2f} ms")
+    print(
+        f"Pick:  SQLite {db_pick * 1e6:7.1f} µs   deck {deck_pick * 1e6:7.1f} µs "
+        f"(average of {picks} random questions)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--db",
+        default=DEFAULT_DB_PATH,
+        help=f"SQLite database path (default: {DEFAULT_DB_PATH})",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=DEFAULT_DECK_PATH,
+        help=f"packed deck path (default: {DEFAULT_DECK_PATH})",
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="print a size and load-time comparison against the database",
+    )
+    args = parser.parse_args()
+    if not os.path.exists(args.db):
+        parser.error(f"no such database: {args.db}")
+
+    conn = _connect_read_only(args.db)
+    started = time.perf_counter()
+    count = export_deck(conn, args.output)
+    conn.close()
+    print(
+        f"Exported {count} questions to {args.output} in {time.perf_counter() - started:.2f}s"
+    )
+
+    if args.compare:
+        compare(args.db, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the Gemini client.
+
+FakeClient mimics the parts of genai.Client that the generation scripts use,
+so batch runs and benchmarks can be exercised without network access or an
+API key. Responses are synthetic questions that follow the prompt contract.
+"""
+
+import hashlib
+import json
+import random
+import re
+import struct
+import threading
+import time
+import zlib
+
+
+class FakeUsage:
+    def __init__(self, total_token_count):
+        self.total_token_count = total_token_count
+
+
+class FakeResponse:
+    def __init__(self, text, total_tokens=None):
+        self.text = text
+        self.usage_metadata = FakeUsage(total_tokens) if total_tokens is not None else None
+
+
+class FakeAPIError(Exception):
+    """Raised by FakeClient to simulate a failed API call."""
+
+    def __init__(self, code, message):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class FakeImage:
+    def __init__(self, image_bytes, mime_type="image/png"):
+        self.image_bytes = image_bytes
+        self.mime_type = mime_type
+
+
+class FakeGeneratedImage:
+    def __init__(self, image):
+        self.image = image
+
+
+class FakeImagesResponse:
+    def __init__(self, generated_images):
+        self.generated_images = generated_images
+
+
+def fake_png(seed, size=64):
+    """
+    Return the bytes of a small valid PNG whose colours depend on `seed`.
+    """
+    rng = random.Random(seed)
+    row = bytes(rng.getrandbits(8) for _ in range(3)) * size
+    raw = b"".join(b"\x00" + row for _ in range(size))
+
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    header = struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(raw))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _prompt_text(contents):
+    if isinstance(contents, str):
+        return contents
+    texts = []
+    for content in contents:
+        # Plain dicts or SDK types objects, as the real client accepts both.
+        if isinstance(content, dict):
+            parts = content.get("parts")
+        else:
+            parts = getattr(content, "parts", None)
+        for part in parts or []:
+            if isinstance(part, dict):
+                text = part.get("text")
+            else:
+                text = getattr(part, "text", None)
+            if text:
+                texts.append(text)
+    return "\n".join(texts)
+
+
+def _parse_prompt(prompt):
+    count = re.search(r"Generate (\d+) trivia questions", prompt)
+    category = re.search(r"^Category: (.*)$", prompt, re.MULTILINE)
+    difficulty = re.search(r"^Difficulty: (.*)$", prompt, re.MULTILINE)
+    return (
+        category.group(1).strip() if category else "General",
+        difficulty.group(1).strip() if difficulty else "Medium",
+        int(count.group(1)) if count else 5,
+    )
+
+
+_PACKED_JOB_RE = re.compile(
+    r"^(\d+)\. Category: (.*) \| Difficulty: (.*) \| Count: (\d+)$", re.MULTILINE
+)
+
+
+def _parse_packed_prompt(prompt):
+    return [
+        (int(number), category.strip(), difficulty.strip(), int(count))
+        for number, category, difficulty, count in _PACKED_JOB_RE.findall(prompt)
+    ]
+
+
+def fake_questions(category, difficulty, count, rng=None):
+    """
+    Build a list of synthetic questions in the format the prompt asks for.
+    """
+    rng = rng or random.Random()
+    questions = []
+    for _ in range(count):
+        topic = f"{category} Topic {rng.getrandbits(48):012x}"
+        correct = rng.randint(1, 10)
+        flags = [True] * correct + [False] * (10 - correct)
+        rng.shuffle(flags)
+        questions.append(
+            {
+                "question": topic,
+                "options": [
+                    {"text": f"{topic} Option {i + 1}", "isCorrect": flag}
+                    for i, flag in enumerate(flags)
+                ],
+                "category": category,
+                "difficulty": difficulty,
+            }
+        )
+    return questions
+
+
+class _FakeModels:
+    def __init__(self, client):
+        self._client = client
+
+    def _response_text(self, contents):
+        client = self._client
+        client._record_call()
+        if client.failure_rate and client._random() < client.failure_rate:
+            raise FakeAPIError(503, "The model is overloaded (simulated)")
+
+        prompt = _prompt_text(contents)
+        with client._lock:
+            rng = random.Random(client._rng.getrandbits(64))
+
+        packed_jobs = _parse_packed_prompt(prompt)
+        if packed_jobs:
+            entries = [
+                {"job": number, "questions": fake_questions(category, difficulty, count, rng)}
+                for number, category, difficulty, count in packed_jobs
+            ]
+            total = sum(count for *_, count in packed_jobs)
+            return json.dumps({"jobs": entries}), total
+
+        category, difficulty, count = _parse_prompt(prompt)
+        return json.dumps(fake_questions(category, difficulty, count, rng)), count
+
+    def generate_content(self, model, contents, config=None):
+        text, count = self._response_text(contents)
+        latency = self._client._latency(count)
+        if latency:
+            time.sleep(latency)
+        # Roughly four characters per token, like the real tokenizer.
+        return FakeResponse(text, (len(_prompt_text(contents)) + len(text)) // 4)
+
+    def generate_images(self, model, prompt, config=None):
+        """
+        Return one synthetic PNG per requested image; the same prompt always
+        gives the same image.
+        """
+        client = self._client
+        client._record_call()
+        if client.failure_rate and client._random() < client.failure_rate:
+            raise FakeAPIError(503, "The model is overloaded (simulated)")
+        if client.latency:
+            time.sleep(client.latency)
+        count = (config or {}).get("number_of_images", 1)
+        seed = hashlib.sha256(prompt.encode("utf-8")).digest()
+        return FakeImagesResponse(
+            [FakeGeneratedImage(FakeImage(fake_png(seed + bytes([i])))) for i in range(count)]
+        )
+
+    def generate_content_stream(self, model, contents, config=None):
+        """
+        Yield the response in small chunks, spreading latency across them.
+        """
+        text, count = self._response_text(contents)
+        latency = self._client._latency(count)
+        chunk_size = self._client.stream_chunk_size
+        chunks = [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]
+        for chunk in chunks:
+            if latency:
+                time.sleep(latency / len(chunks))
+            yield FakeResponse(chunk)
+
+
+class FakeClient:
+    """
+    Drop-in replacement for genai.Client with simulated latency and failures.
+
+    latency is the number of seconds each call blocks for (spread across the
+    chunks of a streamed response), plus latency_per_question for every
+    question in the response; failure_rate is the probability that a call
+    raises FakeAPIError. Prompts from request_packing get a packed response.
+    Safe to share across threads.
+    """
+
+    def __init__(
+        self,
+        latency=0.0,
+        failure_rate=0.0,
+        seed=None,
+        stream_chunk_size=256,
+        latency_per_question=0.0,
+    ):
+        self.latency = latency
+        self.latency_per_question = latency_per_question
+        self.stream_chunk_size = stream_chunk_size
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.models = _FakeModels(self)
+
+    def _record_call(self):
+        with self._lock:
+            self.calls += 1
+
+    def _random(self):
+        with self._lock:
+            return self._rng.random()
+
+    def _latency(self, questions):
+        return self.latency + self.latency_per_question * questions
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Report (and optionally remove) duplicate questions in a question database.
+
+Exact duplicates share a fingerprint: the same normalized topic text and
+the same set of normalized answers (see question_db.question_fingerprint).
+With --near, questions whose text and answers overlap above a similarity
+threshold are reported too (see near_duplicates).
+"""
+
+import argparse
+import logging
+
+from question_db import (
+    DEFAULT_DB_PATH,
+    backfill_fingerprints,
+    connect,
+    delete_questions,
+    question_fingerprint,
+)
+from near_duplicates import DEFAULT_THRESHOLD, find_near_duplicates
+
+
+def find_exact_duplicates(conn):
+    """
+    Return [(duplicate question id, text, id of the kept original), ...].
+    """
+    duplicate_ids = backfill_fingerprints(conn)
+    if not duplicate_ids:
+        return []
+
+    texts = dict(conn.execute("SELECT id, text FROM questions WHERE fingerprint IS NULL"))
+    answers = {}
+    for question_id, text in conn.execute(
+        """
+        SELECT a.question_id, a.text FROM answers a
+        JOIN questions q ON q.id = a.question_id
+        WHERE q.fingerprint IS NULL
+        """
+    ):
+        answers.setdefault(question_id, []).append(text)
+
+    kept = dict(
+        conn.execute(
+            "SELECT fingerprint, id FROM questions WHERE fingerprint IS NOT NULL"
+        )
+    )
+    return [
+        (
+            question_id,
+            texts[question_id],
+            kept.get(question_fingerprint(texts[question_id], answers.get(question_id, ()))),
+        )
+        for question_id in duplicate_ids
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--db",
+        default=DEFAULT_DB_PATH,
+        help=f"SQLite database path (default: {DEFAULT_DB_PATH})",
+    )
+    parser.add_argument(
+        "--delete",
+        action="store_true",
+        help="delete the duplicate copies, keeping the oldest question",
+    )
+    parser.add_argument(
+        "--near",
+        action="store_true",
+        help="also report near-duplicates using MinHash/LSH",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"near-duplicate similarity threshold (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="list every duplicate"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s - %(message)s")
+
+    conn = connect(args.db)
+    (total,) = conn.execute("SELECT COUNT(*) FROM questions").fetchone()
+    duplicates = find_exact_duplicates(conn)
+
+    print(f"Exact duplicates: {len(duplicates)} of {total} questions")
+    if args.verbose:
+        for question_id, text, original_id in duplicates:
+            print(f"  #{question_id} duplicates #{original_id}: {text}")
+
+    if args.delete and duplicates:
+        deleted = delete_questions(conn, [question_id for question_id, _, _ in duplicates])
+        print(f"Deleted {deleted} duplicate questions")
+
+    if args.near:
+        texts = dict(conn.execute("SELECT id, text FROM questions"))
+        pairs = find_near_duplicates(conn, args.threshold)
+        print(
+            f"Near-duplicate pairs (similarity >= {args.threshold:.2f}): {len(pairs)}"
+        )
+        if args.verbose:
+            for first_id, second_id, similarity in pairs:
+                print(
+                    f"  {similarity:.2f} #{first_id} {texts[first_id]!r} ~ "
+                    f"#{second_id} {texts[second_id]!r}"
+                )
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
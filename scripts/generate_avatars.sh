@@ -61,11 +61,9 @@ PROMPTS=(
 # Get the directory of the script
 SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )"
 
-for prompt in "${PROMPTS[@]}"; do
-  echo "Generating image for prompt: '$prompt'"
-  python "$SCRIPT_DIR/generate_image.py" "$prompt"
-  # Optional: add a small delay to avoid hitting rate limits if necessary
-  # sleep 1
-done
+# One process for all prompts: requests run concurrently over a shared client,
+# and rate-limit errors are retried with backoff. Pass extra options through,
+# e.g. ./generate_avatars.sh --rpm 10 -c 2
+python "$SCRIPT_DIR/generate_image.py" "$@" "${PROMPTS[@]}"
 
 echo "Avatar generation complete. Images are in the scripts/images directory."
@@ -1,569 +1,506 @@
 #!/usr/bin/env python3
 
+import argparse
 import os
 import sys
 import time
-from generate_questions import generate_questions, add_questions_to_database
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
+from categories import CATEGORIES, DIFFICULTIES
+from coverage_planner import plan_coverage, print_plan, question_counts
+from generation_session import GenerationSession, create_transport
+from logging_setup import DEFAULT_LOG_FILE, configure_logging
+from metrics import Metrics, describe_generation_metrics
+from near_duplicates import NearDuplicateFilter
+from request_packing import DEFAULT_MAX_PACK, DEFAULT_MAX_PACK_QUESTIONS, AdaptivePacker
+from rate_limit import DEFAULT_RETRIES, RateLimiter
+from response_cache import DEFAULT_MAX_BYTES, ResponseCache
+from question_db import (
+    DEFAULT_DB_PATH,
+    completed_jobs,
+    connect,
+    create_journal,
+    insert_questions,
+    load_category_ids,
+    reset_journal,
+)
 
-def generate_batch():
+DEFAULT_CONCURRENCY = 4
+
+
+def build_jobs(categories=CATEGORIES, difficulties=DIFFICULTIES):
+    """
+    Expand (category, count) pairs into (category, difficulty, count) jobs.
+    """
+    return [
+        (category, difficulty, count)
+        for category, count in categories
+        for difficulty in difficulties
+    ]
+
+
+def _ingest_job(
+    conn,
+    job,
+    questions_data,
+    request_seconds,
+    progress,
+    summary,
+    metrics,
+    category_ids,
+    near_filter,
+    journal=True,
+):
+    category, difficulty, count = job
+    labels = {"category": category, "difficulty": difficulty}
+
+    if isinstance(questions_data, Exception):
+        summary["failed_jobs"] += 1
+        metrics.inc("batch_jobs_total", outcome="error")
+        print(f"{progress} ✗ Error processing {category} ({difficulty}): {questions_data}")
+        return
+
+    try:
+        if questions_data:
+            with metrics.timer("db_write_seconds", **labels):
+                result = insert_questions(
+                    conn,
+                    questions_data,
+                    category_ids,
+                    job=job if journal else None,
+                    near_filter=near_filter,
+                )
+            metrics.inc("batch_jobs_total", outcome="ok")
+            metrics.inc("questions_added_total", result.added, **labels)
+            if result.duplicates:
+                metrics.inc(
+                    "questions_skipped_total",
+                    result.duplicates,
+                    reason="duplicate",
+                    **labels,
+                )
+            if result.near_duplicates:
+                metrics.inc(
+                    "questions_skipped_total",
+                    result.near_duplicates,
+                    reason="near_duplicate",
+                    **labels,
+                )
+            if result.rejected:
+                metrics.inc(
+                    "questions_skipped_total",
+                    result.rejected,
+                    reason="invalid",
+                    **labels,
+                )
+            summary["questions_added"] += result.added
+            summary["duplicates_skipped"] += result.duplicates
+            summary["near_duplicates_skipped"] += result.near_duplicates
+            summary["questions_rejected"] += result.rejected
+            skipped = result.duplicates + result.near_duplicates
+            notes = f", {skipped} duplicates skipped" if skipped else ""
+            if result.rejected:
+                notes += f", {result.rejected} quarantined"
+            print(
+                f"{progress} ✓ Added {result.added} {difficulty} questions "
+                f"for {category} ({request_seconds:.1f}s{notes})"
+            )
+        else:
+            summary["failed_jobs"] += 1
+            metrics.inc("batch_jobs_total", outcome="failed")
+            print(f"{progress} ✗ Failed to generate questions for {category} ({difficulty})")
+
+    except Exception as e:
+        summary["failed_jobs"] += 1
+        metrics.inc("batch_jobs_total", outcome="error")
+        print(f"{progress} ✗ Error processing {category} ({difficulty}): {e}")
+
+
+def generate_batch(
+    jobs=None,
+    concurrency=DEFAULT_CONCURRENCY,
+    client=None,
+    db_path=DEFAULT_DB_PATH,
+    limiter=None,
+    cache=None,
+    resume=True,
+    journal=True,
+    near_threshold=None,
+    metrics=None,
+    metrics_prefix=None,
+    packer=None,
+):
     """
     Generate a batch of questions across multiple categories and difficulties.
+
+    Up to `concurrency` Gemini requests are kept in flight on a worker pool.
+    Completed responses are written to the database from the calling thread
+    as they arrive over one shared connection, so SQLite only ever sees a
+    single writer. A rate_limit.RateLimiter shared by the workers keeps the
+    run within the API's requests/tokens per minute and retries transient
+    errors. An optional response_cache.ResponseCache replays previously
+    successful requests.
+
+    Completed jobs are recorded in the database's batch_jobs journal together
+    with their questions. With `resume` (the default) jobs already in the
+    journal are skipped, so an interrupted run continues where it stopped;
+    otherwise the journal is cleared first. With journal=False the journal
+    is neither consulted nor cleared, for job lists from coverage_planner
+    whose progress is tracked by the question counts themselves.
+
+    Exact duplicates are always skipped; with `near_threshold`, questions at
+    least that similar to an existing one (see near_duplicates) are too.
+
+    Per-stage counters and latency histograms, labelled by category and
+    difficulty, are collected in `metrics` (a new metrics.Metrics if not
+    given). With `metrics_prefix` they are exported at the end of the run to
+    <prefix>.jsonl (appended) and <prefix>.prom (Prometheus textfile).
+
+    With a request_packing.AdaptivePacker, several small jobs are sent per
+    request and the packer tunes how many from the observed throughput and
+    failure rate; each job is still ingested (and journaled) separately.
+
+    Returns a summary dict with job, question and timing totals.
     """
+    if jobs is None:
+        jobs = build_jobs()
 
-    categories = [
-        ("Sports - Soccer", 10),
-        ("Sports - Soccer  - International Competitions", 10),
-        (
-            "Sports - Football - International Competitions - FIFA World Cup - Winners",
-            10,
-        ),
-        (
-            "Sports - Football - International Competitions - FIFA World Cup - Records",
-            10,
-        ),
-        (
-            "Sports - Football - International Competitions - FIFA Women's World Cup - Winners",
-            3,
-        ),
-        (
-            "Sports - Football - International Competitions - FIFA Women's World Cup - Records",
-            3,
-        ),
-        (
-            "Sports - Football - International Competitions - UEFA European Championship (Euros) - Winners",
-            10,
-        ),
-        (
-            "Sports - Football - International Competitions - UEFA European Championship (Euros) - Records",
-            3,
-        ),
-        ("Sports - Football - International Competitions - Copa América - Winners", 3),
-        ("Sports - Football - International Competitions - Copa América - Records", 3),
-        (
-            "Sports - Football - International Competitions - Africa Cup of Nations (AFCON) - Winners",
-            6,
-        ),
-        (
-            "Sports - Football - International Competitions - Africa Cup of Nations (AFCON) - Records",
-            6,
-        ),
-        ("Sports - Football - International Competitions - AFC Asian Cup - Winners", 5),
-        ("Sports - Football - International Competitions - AFC Asian Cup - Records", 3),
-        (
-            "Sports - Football - International Competitions - UEFA Nations League - Winners",
-            5,
-        ),
-        (
-            "Sports - Football - International Competitions - UEFA Nations League - Records",
-            3,
-        ),
-        (
-            "Sports - Football - International Competitions - CONCACAF Gold Cup - Winners",
-            3,
-        ),
-        (
-            "Sports - Football - International Competitions - CONCACAF Gold Cup - Records",
-            3,
-        ),
-        ("Sports - Football - Club Competitions", 3),
-        ("Sports - Football - Club Competitions - UEFA Champions League - Winners", 10),
-        ("Sports - Football - Club Competitions - UEFA Champions League - Records", 10),
-        ("Sports - Football - Club Competitions - UEFA Europa League - Winners", 7),
-        ("Sports - Football - Club Competitions - UEFA Europa League - Records", 7),
-        ("Sports - Football - Club Competitions - UEFA Conference League - Winners", 3),
-        ("Sports - Football - Club Competitions - UEFA Conference League - Records", 3),
-        (
-            "Sports - Football - Club Competitions - UEFA Women's Champions League - Winners",
-            3,
-        ),
-        (
-            "Sports - Football - Club Competitions - UEFA Women's Champions League - Records",
-            3,
-        ),
-        ("Sports - Football - Club Competitions - Copa Libertadores - Winners", 3),
-        ("Sports - Football - Club Competitions - Copa Libertadores - Records", 3),
-        ("Sports - Football - Club Competitions - Copa Sudamericana - Winners", 3),
-        ("Sports - Football - Club Competitions - Copa Sudamericana - Records", 3),
-        ("Sports - Football - Club Competitions - FIFA Club World Cup - Winners", 10),
-        ("Sports - Football - Club Competitions - FIFA Club World Cup - Records", 10),
-        ("Sports - Football - English Football", 10),
-        ("Sports - Football - English Football - Premier League", 10),
-        ("Sports - Football - English Football - Premier League - Arsenal FC", 10),
-        ("Sports - Football - English Football - Premier League - Aston Villa", 3),
-        (
-            "Sports - Football - English Football - Premier League - Brighton & Hove Albion",
-            3,
-        ),
-        ("Sports - Football - English Football - Premier League - Chelsea FC", 10),
-        ("Sports - Football - English Football - Premier League - Crystal Palace", 3),
-        ("Sports - Football - English Football - Premier League - Everton", 3),
-        ("Sports - Football - English Football - Premier League - Fulham", 3),
-        ("Sports - Football - English Football - Premier League - Ipswich Town", 3),
-        ("Sports - Football - English Football - Premier League - Leicester City", 3),
-        ("Sports - Football - English Football - Premier League - Liverpool FC", 10),
-        ("Sports - Football - English Football - Premier League - Manchester City", 10),
-        (
-            "Sports - Football - English Football - Premier League - Manchester United",
-            10,
-        ),
-        ("Sports - Football - English Football - Premier League - Newcastle United", 3),
-        (
-            "Sports - Football - English Football - Premier League - Nottingham Forest",
-            3,
-        ),
-        ("Sports - Football - English Football - Premier League - Southampton", 3),
-        (
-            "Sports - Football - English Football - Premier League - Tottenham Hotspur",
-            10,
-        ),
-        ("Sports - Football - English Football - Premier League - West Ham United", 3),
-        (
-            "Sports - Football - English Football - Premier League - Wolverhampton Wanderers",
-            3,
-        ),
-        (
-            "Sports - Football - English Football - Premier League - Player Statistics",
-            10,
-        ),
-        ("Sports - Football - English Football - Premier League - Team Statistics", 10),
-        (
-            "Sports - Football - English Football - Premier League - Records & Achievements",
-            10,
-        ),
-        (
-            "Sports - Football - English Football - Premier League - Transfers Records",
-            10,
-        ),
-        ("Sports - Football - English Football - Premier League - Manager Records", 10),
-        ("Sports - Football - English Football - Championship - Winners", 3),
-        ("Sports - Football - English Football - Championship - Records", 3),
-        ("Sports - Football - English Football - FA Cup - Winners", 10),
-        ("Sports - Football - English Football - FA Cup - Records", 10),
-        (
-            "Sports - Football - English Football - League Cup (Carabao Cup) - Winners",
-            3,
-        ),
-        (
-            "Sports - Football - English Football - League Cup (Carabao Cup) - Records",
-            3,
-        ),
-        ("Sports - Football - Fantasy Premier League", 10),
-        ("Sports - Football - Fantasy Premier League - Player Points Records", 10),
-        ("Sports - Football - Fantasy Premier League - Season Records", 10),
-        ("Sports - Football - Fantasy Premier League - Gameweek Records", 10),
-        ("Sports - Football - Spanish Football", 10),
-        ("Sports - Football - Spanish Football - La Liga - Winners", 10),
-        ("Sports - Football - Spanish Football - La Liga - Records", 10),
-        ("Sports - Football - Spanish Football - La Liga - Athletic Bilbao", 3),
-        ("Sports - Football - Spanish Football - La Liga - Atlético Madrid", 10),
-        ("Sports - Football - Spanish Football - La Liga - FC Barcelona", 10),
-        ("Sports - Football - Spanish Football - La Liga - Real Betis", 3),
-        ("Sports - Football - Spanish Football - La Liga - Real Madrid", 10),
-        ("Sports - Football - Spanish Football - La Liga - Real Sociedad", 3),
-        ("Sports - Football - Spanish Football - La Liga - Sevilla FC", 3),
-        ("Sports - Football - Spanish Football - La Liga - Valencia CF", 3),
-        ("Sports - Football - Spanish Football - La Liga - Villarreal CF", 3),
-        ("Sports - Football - Spanish Football - Copa del Rey - Winners", 3),
-        ("Sports - Football - Spanish Football - Copa del Rey - Records", 3),
-        ("Sports - Football - German Football", 3),
-        ("Sports - Football - German Football - Bundesliga - Winners", 5),
-        ("Sports - Football - German Football - Bundesliga - Records", 5),
-        ("Sports - Football - German Football - Bundesliga - Bayer 04 Leverkusen", 3),
-        ("Sports - Football - German Football - Bundesliga - Bayern Munich", 6),
-        ("Sports - Football - German Football - Bundesliga - Borussia Dortmund", 5),
-        (
-            "Sports - Football - German Football - Bundesliga - Borussia Mönchengladbach",
-            3,
-        ),
-        ("Sports - Football - German Football - Bundesliga - Eintracht Frankfurt", 3),
-        ("Sports - Football - German Football - Bundesliga - RB Leipzig", 3),
-        ("Sports - Football - German Football - DFB-Pokal - Winners", 3),
-        ("Sports - Football - German Football - DFB-Pokal - Records", 3),
-        ("Sports - Football - Italian Football", 10),
-        ("Sports - Football - Italian Football - Serie A - Winners", 7),
-        ("Sports - Football - Italian Football - Serie A - Records", 6),
-        ("Sports - Football - Italian Football - Serie A - AC Milan", 6),
-        ("Sports - Football - Italian Football - Serie A - AS Roma", 6),
-        ("Sports - Football - Italian Football - Serie A - Atalanta", 3),
-        ("Sports - Football - Italian Football - Serie A - Fiorentina", 3),
-        ("Sports - Football - Italian Football - Serie A - Inter Milan", 6),
-        ("Sports - Football - Italian Football - Serie A - Juventus", 7),
-        ("Sports - Football - Italian Football - Serie A - Lazio", 3),
-        ("Sports - Football - Italian Football - Serie A - Napoli", 3),
-        ("Sports - Football - Italian Football - Coppa Italia - Winners", 3),
-        ("Sports - Football - Italian Football - Coppa Italia - Records", 3),
-        ("Sports - Football - French Football", 3),
-        ("Sports - Football - French Football - Ligue 1 - Winners", 3),
-        ("Sports - Football - French Football - Ligue 1 - Records", 3),
-        ("Sports - Football - French Football - Ligue 1 - AS Monaco", 3),
-        ("Sports - Football - French Football - Ligue 1 - Lille OSC", 3),
-        ("Sports - Football - French Football - Ligue 1 - Olympique Lyonnais", 3),
-        ("Sports - Football - French Football - Ligue 1 - Olympique de Marseille", 3),
-        ("Sports - Football - French Football - Ligue 1 - Paris Saint-Germain", 3),
-        ("Sports - Football - Other European Leagues", 3),
-        (
-            "Sports - Football - Other European Leagues - Eredivisie (Netherlands) - Winners",
-            3,
-        ),
-        (
-            "Sports - Football - Other European Leagues - Eredivisie (Netherlands) - Records",
-            3,
-        ),
-        ("Sports - Football - Other European Leagues - Eredivisie - AFC Ajax", 3),
-        ("Sports - Football - Other European Leagues - Eredivisie - Feyenoord", 3),
-        ("Sports - Football - Other European Leagues - Eredivisie - PSV Eindhoven", 3),
-        (
-            "Sports - Football - Other European Leagues - Primeira Liga (Portugal) - Winners",
-            3,
-        ),
-        (
-            "Sports - Football - Other European Leagues - Primeira Liga (Portugal) - Records",
-            3,
-        ),
-        ("Sports - Football - Other European Leagues - Primeira Liga - SL Benfica", 3),
-        ("Sports - Football - Other European Leagues - Primeira Liga - FC Porto", 3),
-        ("Sports - Football - Other European Leagues - Primeira Liga - Sporting CP", 3),
-        (
-            "Sports - Football - Other European Leagues - Scottish Premiership - Winners",
-            3,
-        ),
-        (
-            "Sports - Football - Other European Leagues - Scottish Premiership - Records",
-            3,
-        ),
-        (
-            "Sports - Football - Other European Leagues - Scottish Premiership - Celtic FC",
-            3,
-        ),
-        (
-            "Sports - Football - Other European Leagues - Scottish Premiership - Rangers FC",
-            3,
-        ),
-        (
-            "Sports - Football - Other European Leagues - Süper Lig (Turkey) - Winners",
-            3,
-        ),
-        (
-            "Sports - Football - Other European Leagues - Süper Lig (Turkey) - Records",
-            3,
-        ),
-        ("Sports - Soccer - Players", 10),
-        ("Sports - Soccer - Players - Legends - Career Records", 10),
-        ("Sports - Football - Players - Legends - Pelé", 3),
-        ("Sports - Football - Players - Legends - Diego Maradona", 3),
-        ("Sports - Football - Players - Legends - Johan Cruyff", 3),
-        ("Sports - Football - Players - Legends - Franz Beckenbauer", 3),
-        ("Sports - Football - Players - Current Stars - Career Records", 3),
-        ("Sports - Football - Players - Current Stars - Lionel Messi", 6),
-        ("Sports - Football - Players - Current Stars - Cristiano Ronaldo", 6),
-        ("Sports - Football - Players - Current Stars - Kylian Mbappé", 3),
-        ("Sports - Football - Players - Current Stars - Erling Haaland", 3),
-        (
-            "Sports - Football - Players - Combined Achievements - Ballon d'Or & World Cup",
-            3,
-        ),
-        (
-            "Sports - Football - Players - Combined Achievements - Champions League & Domestic League",
-            3,
-        ),
-        ("Sports - Football - Awards - Ballon d'Or - Winners", 6),
-        ("Sports - Football - Awards - Ballon d'Or - Records", 6),
-        ("Sports - Tennis", 6),
-        ("Sports - Tennis - Grand Slams - Winners", 7),
-        ("Sports - Tennis - Grand Slams - Australian Open - Winners", 3),
-        ("Sports - Tennis - Grand Slams - French Open (Roland Garros) - Winners", 3),
-        ("Sports - Tennis - Grand Slams - Wimbledon - Winners", 3),
-        ("Sports - Tennis - Grand Slams - US Open - Winners", 3),
-        ("Sports - Tennis - Tours - ATP Tour - Rankings & Records", 3),
-        ("Sports - Tennis - Tours - WTA Tour - Rankings & Records", 3),
-        ("Sports - Tennis - Tournaments - ATP Finals - Winners", 3),
-        ("Sports - Tennis - Tournaments - WTA Finals - Winners", 3),
-        ("Sports - Tennis - Tournaments - Masters 1000 - Winners", 3),
-        ("Sports - Tennis - Team Competitions - Davis Cup - Winners", 3),
-        ("Sports - Tennis - Team Competitions - Billie Jean King Cup - Winners", 3),
-        ("Sports - Tennis - Team Competitions - Laver Cup - Winners", 3),
-        ("Sports - Tennis - Players - Career Records", 3),
-        ("Sports - Tennis - Players - Male Legends - Grand Slam Wins", 3),
-        ("Sports - Tennis - Players - Male Legends - Roger Federer", 3),
-        ("Sports - Tennis - Players - Male Legends - Rafael Nadal", 3),
-        ("Sports - Tennis - Players - Male Legends - Novak Djokovic", 3),
-        ("Sports - Tennis - Players - Male Legends - Björn Borg", 3),
-        ("Sports - Tennis - Players - Female Legends - Grand Slam Wins", 3),
-        ("Sports - Tennis - Players - Female Legends - Serena Williams", 3),
-        ("Sports - Tennis - Players - Female Legends - Steffi Graf", 3),
-        ("Sports - Tennis - Players - Female Legends - Martina Navratilova", 3),
-        ("Sports - Formula 1", 3),
-        ("Sports - Formula 1 - Teams - Championship Wins", 3),
-        ("Sports - Formula 1 - Teams - Scuderia Ferrari", 3),
-        ("Sports - Formula 1 - Teams - Mercedes-AMG Petronas F1 Team", 3),
-        ("Sports - Formula 1 - Teams - Red Bull Racing", 3),
-        ("Sports - Formula 1 - Teams - McLaren F1 Team", 3),
-        ("Sports - Formula 1 - Teams - Alpine F1 Team", 3),
-        ("Sports - Formula 1 - Teams - Aston Martin F1 Team", 3),
-        ("Sports - Formula 1 - Teams - Williams Racing", 3),
-        ("Sports - Formula 1 - Drivers - Championship Wins", 3),
-        ("Sports - Formula 1 - Drivers - Race Wins", 3),
-        ("Sports - Formula 1 - Drivers - Lewis Hamilton", 3),
-        ("Sports - Formula 1 - Drivers - Max Verstappen", 3),
-        ("Sports - Formula 1 - Drivers - Charles Leclerc", 3),
-        ("Sports - Formula 1 - Drivers - Lando Norris", 3),
-        ("Sports - Formula 1 - Drivers - Legends - Championship Wins", 3),
-        ("Sports - Formula 1 - Drivers - Legends - Ayrton Senna", 3),
-        ("Sports - Formula 1 - Drivers - Legends - Michael Schumacher", 3),
-        ("Sports - Formula 1 - Drivers - Legends - Alain Prost", 3),
-        ("Sports - Formula 1 - Circuits - Race History", 3),
-        ("Sports - Formula 1 - Circuits - Monaco Grand Prix", 3),
-        ("Sports - Formula 1 - Circuits - Silverstone Circuit", 3),
-        ("Sports - Formula 1 - Circuits - Monza Circuit", 3),
-        ("Sports - Formula 1 - Circuits - Spa-Francorchamps", 3),
-        ("Sports - Ice Hockey", 3),
-        ("Sports - Ice Hockey - NHL - Stanley Cup Winners", 3),
-        ("Sports - Ice Hockey - NHL - Records & Statistics", 3),
-        ("Sports - Ice Hockey - NHL - Eastern Conference - Teams", 3),
-        ("Sports - Ice Hockey - NHL - Eastern Conference - Boston Bruins", 3),
-        ("Sports - Ice Hockey - NHL - Eastern Conference - Toronto Maple Leafs", 3),
-        ("Sports - Ice Hockey - NHL - Eastern Conference - New York Rangers", 3),
-        ("Sports - Ice Hockey - NHL - Western Conference - Teams", 3),
-        ("Sports - Ice Hockey - NHL - Western Conference - Edmonton Oilers", 3),
-        ("Sports - Ice Hockey - NHL - Western Conference - Colorado Avalanche", 3),
-        (
-            "Sports - Ice Hockey - European Leagues - KHL (Kontinental Hockey League) - Winners",
-            3,
-        ),
-        (
-            "Sports - Ice Hockey - European Leagues - SHL (Swedish Hockey League) - Winners",
-            3,
-        ),
-        ("Sports - Ice Hockey - European Leagues - Liiga (Finland) - Winners", 3),
-        ("Sports - Ice Hockey - European Leagues - DEL (Germany) - Winners", 3),
-        ("Sports - Ice Hockey - International - IIHF World Championship - Winners", 3),
-        ("Sports - Ice Hockey - International - Olympic Ice Hockey - Medalists", 3),
-        ("Sports - Ice Hockey - Players - Career Statistics", 3),
-        ("Sports - Ice Hockey - Players - Wayne Gretzky", 3),
-        ("Sports - Ice Hockey - Players - Sidney Crosby", 3),
-        ("Sports - Ice Hockey - Players - Connor McDavid", 3),
-        ("Sports - UFC (Mixed Martial Arts)", 10),
-        ("Sports - UFC - Champions - Heavyweight", 5),
-        ("Sports - UFC - Champions - Light Heavyweight", 3),
-        ("Sports - UFC - Champions - Middleweight", 3),
-        ("Sports - UFC - Champions - Welterweight", 3),
-        ("Sports - UFC - Champions - Lightweight", 3),
-        ("Sports - UFC - Champions - Featherweight", 3),
-        ("Sports - UFC - Champions - Bantamweight", 3),
-        ("Sports - UFC - Women's Divisions - Champions", 3),
-        ("Sports - UFC - Fighters - Fight Records", 3),
-        ("Sports - UFC - Fighters - Jon Jones", 3),
-        ("Sports - UFC - Fighters - Conor McGregor", 3),
-        ("Sports - UFC - Fighters - Khabib Nurmagomedov", 3),
-        ("Sports - UFC - Fighters - Islam Makhachev", 3),
-        ("Sports - Basketball", 3),
-        ("Sports - Basketball - NBA - Champions", 3),
-        ("Sports - Basketball - NBA - Player Statistics", 3),
-        ("Sports - Basketball - NBA - Team Statistics", 3),
-        ("Sports - Basketball - NBA - Records & Achievements", 3),
-        ("Sports - Basketball - NBA - Boston Celtics", 3),
-        ("Sports - Basketball - NBA - Los Angeles Lakers", 3),
-        ("Sports - Basketball - NBA - Golden State Warriors", 3),
-        ("Sports - Basketball - NBA - Chicago Bulls", 3),
-        ("Sports - Basketball - Players - Career Statistics", 3),
-        ("Sports - Basketball - Players - Michael Jordan", 3),
-        ("Sports - Basketball - Players - LeBron James", 3),
-        ("Sports - Basketball - Players - Stephen Curry", 3),
-        ("Sports - Basketball - Players - Nikola Jokic", 3),
-        ("Sports - Basketball - Players - Victor Wembanyama", 3),
-        ("Sports - Basketball - European Basketball - EuroLeague - Winners", 3),
-        (
-            "Sports - Basketball - European Basketball - EuroLeague - Real Madrid Baloncesto",
-            3,
-        ),
-        (
-            "Sports - Basketball - European Basketball - EuroLeague - FC Barcelona Bàsquet",
-            3,
-        ),
-        (
-            "Sports - Basketball - European Basketball - EuroLeague - Panathinaikos BC",
-            3,
-        ),
-        (
-            "Sports - Basketball - International - FIBA Basketball World Cup - Winners",
-            3,
-        ),
-        ("Sports - Cycling", 3),
-        ("Sports - Cycling - Grand Tours - Winners", 3),
-        ("Sports - Cycling - Grand Tours - Tour de France - Winners", 3),
-        ("Sports - Cycling - Grand Tours - Giro d'Italia - Winners", 3),
-        ("Sports - Cycling - Grand Tours - Vuelta a España - Winners", 3),
-        ("Sports - Cycling - Monuments - Winners", 3),
-        ("Sports - Cycling - Monuments - Milan-San Remo - Winners", 3),
-        ("Sports - Cycling - Monuments - Tour of Flanders - Winners", 3),
-        ("Sports - Cycling - Monuments - Paris-Roubaix - Winners", 3),
-        ("Sports - Cycling - Monuments - Liège-Bastogne-Liège - Winners", 3),
-        ("Sports - Cycling - Monuments - Il Lombardia - Winners", 3),
-        ("Sports - Rugby Union", 3),
-        ("Sports - Rugby Union - International - Rugby World Cup - Winners", 3),
-        (
-            "Sports - Rugby Union - International - Six Nations Championship - Winners",
-            3,
-        ),
-        ("Sports - Rugby Union - International - The Rugby Championship - Winners", 3),
-        ("Sports - Rugby Union - Clubs - European Rugby Champions Cup - Winners", 3),
-        ("Sports - Rugby Union - Clubs - English Premiership - Winners", 3),
-        ("Sports - Rugby Union - Clubs - Top 14 (France) - Winners", 3),
-        ("Sports - Golf", 3),
-        ("Sports - Golf - Majors - Winners", 3),
-        ("Sports - Golf - Majors - The Masters Tournament - Winners", 3),
-        ("Sports - Golf - Majors - PGA Championship - Winners", 3),
-        ("Sports - Golf - Majors - U.S. Open - Winners", 3),
-        ("Sports - Golf - Majors - The Open Championship - Winners", 3),
-        ("Sports - Golf - Team Competitions - Ryder Cup - Winners", 3),
-        ("Sports - Athletics", 3),
-        ("Sports - Athletics - World Athletics Championships - Medalists", 3),
-        ("Sports - Athletics - Diamond League - Winners", 3),
-        ("Sports - Athletics - Disciplines - World Records", 3),
-        ("Sports - Athletics - Disciplines - Sprints - World Records", 3),
-        (
-            "Sports - Athletics - Disciplines - Middle and Long Distance - World Records",
-            3,
-        ),
-        ("Sports - Athletics - Disciplines - Field Events - World Records", 3),
-        ("Sports - Other Motorsports", 3),
-        ("Sports - Other Motorsports - MotoGP - Champions", 3),
-        ("Sports - Other Motorsports - World Rally Championship (WRC) - Champions", 3),
-        ("Sports - Other Motorsports - 24 Hours of Le Mans - Winners", 3),
-        ("Sports - Handball", 3),
-        ("Sports - Handball - EHF Champions League - Winners", 3),
-        ("Sports - Handball - World Men's Handball Championship - Winners", 3),
-        ("Sports - Winter Sports", 3),
-        ("Sports - Winter Sports - Alpine Skiing World Cup - Winners", 3),
-        ("Sports - Winter Sports - Biathlon World Cup - Winners", 3),
-        ("Sports - Winter Sports - Ski Jumping - Winners", 3),
-        ("Sports - Olympic Games", 3),
-        ("Sports - Olympic Games - Summer Olympics - Medal Counts", 3),
-        ("Sports - Olympic Games - Summer Olympics - Host Cities", 3),
-        ("Sports - Olympic Games - Summer Olympics - Athletics Records", 3),
-        ("Sports - Olympic Games - Summer Olympics - Swimming Records", 3),
-        ("Sports - Olympic Games - Winter Olympics - Medal Counts", 3),
-        ("Sports - Olympic Games - Winter Olympics - Host Cities", 3),
-        ("Sports - Olympic Games - Winter Olympics - Skiing Records", 3),
-        ("Sports - Multi-Sport Events", 3),
-        ("Sports - Multi-Sport Events - Commonwealth Games - Medal Counts", 3),
-        ("Sports - Multi-Sport Events - Asian Games - Medal Counts", 3),
-        ("Sports - Coaching/Management Records", 3),
-        ("Sports - Football - Managers - Most Titles Won", 3),
-        ("Sports - Basketball - Coaches - Championship Wins", 3),
-        ("Sports - Venues & Infrastructure", 3),
-        ("Sports - Famous Stadiums - Capacity & Location", 3),
-        ("Sports - Famous Arenas - Key Events Hosted", 3),
-        ("Sports - Doping & Controversies - Factual Cases", 3),
-        ("Sports - Snooker", 6),
-        ("Sports - Snooker - World Snooker Championship - Winners", 6),
-        ("Sports - Snooker - Player Records (e.g., 147 breaks)", 3),
-        ("E-Sports - General", 3),
-        ("E-Sports by Game", 3),
-        (
-            "E-Sports - League of Legends (LoL) - World Championship (Worlds) - Winners",
-            3,
-        ),
-        (
-            "E-Sports - League of Legends (LoL) - LEC (League of Legends EMEA Championship) - Winners",
-            3,
-        ),
-        ("E-Sports - Counter-Strike 2 (CS2) - Majors - Winners", 3),
-        ("E-Sports - Dota 2 - The International - Winners", 3),
-        ("E-Sports - Valorant - Champions Tour (VCT) - Winners", 3),
-        ("E-Sports - Fortnite - Tournament Winners", 3),
-        ("E-Sports - Call of Duty League (CDL) - Champions", 3),
-        ("E-Sports - Rocket League Championship Series (RLCS) - Champions", 3),
-        (
-            "E-Sports - Fighting Games - Evolution Championship Series (EVO) - Winners",
-            3,
-        ),
-        ("E-Sports - Teams - Tournament Wins", 3),
-        ("E-Sports - Players & Personalities - Achievements", 3),
-        ("Video Games - General", 3),
-        ("Video Games by Genre", 3),
-        ("Video Games - Action-Adventure - Grand Theft Auto (GTA) - Game Facts", 3),
-        ("Video Games - First-Person Shooters (FPS) - Notable Titles", 3),
-        ("Video Games - Strategy Games - Notable Titles", 3),
-        ("Video Games - Strategy Games - Civilization Series - Game Facts", 3),
-        ("Video Games - Sports Games - Notable Titles", 3),
-        ("Video Games - Sports Games - EA Sports FC - Game Facts", 3),
-        ("Video Games by Platform - Release Dates", 3),
-        ("Video Games - PC Gaming - Historical Facts", 3),
-        ("Video Games - Console Gaming - Historical Facts", 3),
-        ("Video Games - Indie Games - Award Winners", 3),
-        ("Video Games - Retro Gaming - Console Facts", 3),
-        ("Traditional Games - General", 3),
-        ("Board Games - Popular Titles & Rules", 3),
-        ("Board Games - Strategy - Popular Titles & Rules", 3),
-        ("Board Games - Party Games - Popular Titles & Rules", 3),
-        ("Board Games - Specific Game Facts - Monopoly - Original Rules & Editions", 3),
-        ("Board Games - Specific Game Facts - Chess - Grandmaster Titles & Records", 3),
-        ("Card Games - Traditional - Rules & History", 3),
-        ("Card Games - Collectible Card Games - Game Facts", 3),
-        ("Tabletop Role-Playing Games (TTRPGs) - System Facts", 3),
-        ("Tabletop RPGs - Dungeons & Dragons (D&D) - Edition Facts", 3),
-        ("Gambling - General", 3),
-        ("Sports Betting - Football Betting - Records & Outcomes", 3),
-        ("Sports Betting - Horse Racing - Major Race Winners", 3),
-        ("Sports Betting - Betting Terminology", 3),
-        ("Casino Games - Rules & Odds", 3),
-        ("Casino Games - Poker - Rules & Famous Hands", 3),
-        ("Casino Games - Poker - Texas Hold'em - Rules & Variants", 3),
-        ("Casino Games - Poker - World Series of Poker (WSOP) - Main Event Winners", 3),
-        ("Casino Games - Blackjack - Rules & Strategy Basics", 3),
-        ("Casino Games - Roulette - Payouts & Probabilities", 3),
-        ("Gambling - Historical Gambling Events - Famous Wagers & Outcomes", 3),
-    ]
+    conn = connect(db_path)
+    if journal:
+        create_journal(conn)
+        if resume:
+            done_jobs = completed_jobs(conn)
+            remaining = [job for job in jobs if (job[0], job[1]) not in done_jobs]
+            if len(remaining) < len(jobs):
+                print(
+                    f"Resuming: skipping {len(jobs) - len(remaining)} jobs already in the journal"
+                )
+            jobs = remaining
+        else:
+            reset_journal(conn)
 
-    # difficulties = ["Easy", "Medium", "Hard"]
-    difficulties = ["Medium", "Hard"]
+    if metrics is None:
+        metrics = Metrics()
+    session = GenerationSession(client, cache=cache, metrics=metrics, limiter=limiter)
+    if session.client is None:
+        conn.close()
+        return None
 
-    # Check for API key
-    if not os.environ.get("GEMINI_API_KEY"):
-        print("Please set the GEMINI_API_KEY environment variable")
-        sys.exit(1)
+    requested = sum(count for _, _, count in jobs)
+    print(
+        f"Running {len(jobs)} category/difficulty jobs ({requested} questions) "
+        f"with concurrency {concurrency}..."
+    )
+
+    summary = {
+        "jobs": len(jobs),
+        "requests": 0,
+        "failed_jobs": 0,
+        "questions_requested": requested,
+        "questions_added": 0,
+        "duplicates_skipped": 0,
+        "near_duplicates_skipped": 0,
+        "questions_rejected": 0,
+        "request_seconds": 0.0,
+    }
+    describe_generation_metrics(metrics)
+
+    category_ids = load_category_ids(conn)
+    near_filter = None
+    if near_threshold is not None:
+        near_filter = NearDuplicateFilter(conn, near_threshold)
+    started = time.perf_counter()
+
+    pending = deque(jobs)
+    in_flight = {}
+    done = 0
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+
+        def submit():
+            while pending and len(in_flight) < max(1, concurrency):
+                pack = packer.take(pending) if packer else [pending.popleft()]
+                future = executor.submit(session.run_pack, pack)
+                in_flight[future] = pack
+                summary["requests"] += 1
+
+        submit()
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                pack = in_flight.pop(future)
+                try:
+                    results, request_seconds = future.result()
+                except Exception as e:
+                    results, request_seconds = [e] * len(pack), 0.0
+                summary["request_seconds"] += request_seconds
+                if packer is not None:
+                    packer.record(
+                        len(pack),
+                        sum(len(r) for r in results if isinstance(r, list)),
+                        request_seconds,
+                        failed=not any(isinstance(r, list) and r for r in results),
+                    )
+                    metrics.set("batch_pack_size", packer.size)
+
+                for job, questions_data in zip(pack, results):
+                    done += 1
+                    _ingest_job(
+                        conn,
+                        job,
+                        questions_data,
+                        request_seconds,
+                        f"[{done}/{len(jobs)}]",
+                        summary,
+                        metrics,
+                        category_ids,
+                        near_filter,
+                        journal,
+                    )
+            submit()
+
+    conn.close()
+    summary["elapsed_seconds"] = time.perf_counter() - started
+    metrics.set("batch_elapsed_seconds", summary["elapsed_seconds"])
+    if cache is not None:
+        summary["cache"] = cache.stats()
+    if limiter is not None:
+        summary["rate_limit"] = limiter.stats()
+        metrics.inc("gemini_retries_total", summary["rate_limit"]["retries"])
+        metrics.set("gemini_rate_limit_wait_seconds", summary["rate_limit"]["wait_seconds"])
+    _print_throughput(summary)
+
+    if metrics_prefix:
+        metrics.write_jsonl(f"{metrics_prefix}.jsonl", concurrency=concurrency)
+        metrics.write_prometheus(f"{metrics_prefix}.prom")
+        print(f"Metrics written to {metrics_prefix}.jsonl and {metrics_prefix}.prom")
+    return summary
 
-    questions_per_batch = 3  # Questions per category/difficulty combination
-    total_questions = 0
 
+def _print_throughput(summary):
+    elapsed = summary["elapsed_seconds"] or 1e-9
+    completed = summary["jobs"] - summary["failed_jobs"]
+    print(f"\n🎉 Batch generation complete! Total questions added: {summary['questions_added']}")
     print(
-        f"Generating {questions_per_batch} questions for each category/difficulty combination..."
+        f"Duplicates skipped: {summary['duplicates_skipped']} exact, "
+        f"{summary['near_duplicates_skipped']} near"
     )
+    if summary["questions_rejected"]:
+        print(f"Failed validation (quarantined): {summary['questions_rejected']}")
     print(
-        f"Total: {len(categories)} categories × {len(difficulties)} difficulties × {questions_per_batch} questions = {len(categories) * len(difficulties) * questions_per_batch} questions"
+        f"Jobs: {completed}/{summary['jobs']} succeeded in {elapsed:.1f}s "
+        f"({summary['requests'] / elapsed:.2f} requests/s, "
+        f"{summary['questions_added'] / elapsed:.2f} questions/s)"
     )
+    if summary["requests"]:
+        print(
+            f"Average request latency: {summary['request_seconds'] / summary['requests']:.2f}s, "
+            f"effective parallelism: {summary['request_seconds'] / elapsed:.1f}x"
+        )
+    if "cache" in summary:
+        cache_stats = summary["cache"]
+        print(
+            f"Response cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+            f"({cache_stats['hit_rate']:.0%}), {cache_stats['evictions']} evictions, "
+            f"{cache_stats['entries']} entries / {cache_stats['bytes'] / 1024 / 1024:.1f} MB"
+        )
+    if "rate_limit" in summary:
+        limit_stats = summary["rate_limit"]
+        print(
+            f"Rate limiter: {limit_stats['requests_per_minute']} requests/min, "
+            f"{limit_stats['tokens_per_minute']} tokens/min over the last minute "
+            f"(limits: {limit_stats['rpm_limit'] or 'none'} RPM, "
+            f"{limit_stats['tpm_limit'] or 'none'} TPM); "
+            f"{limit_stats['retries']} retries ({limit_stats['rate_limited']} rate limited), "
+            f"{limit_stats['wait_seconds']:.1f}s spent waiting for budget"
+        )
 
-    for category, count in categories:
-        for difficulty in difficulties:
-            print(
-                f"\nGenerating {questions_per_batch} {difficulty} questions for {category}..."
-            )
 
-            try:
-                # Generate questions
-                questions_data = generate_questions(category, difficulty, count)
-
-                if questions_data:
-                    # Add to database
-                    added_count = add_questions_to_database(questions_data)
-                    total_questions += added_count
-                    print(f"✓ Added {added_count} questions")
-                else:
-                    print(
-                        f"✗ Failed to generate questions for {category} ({difficulty})"
-                    )
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate questions for every category/difficulty combination."
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"number of Gemini requests kept in flight (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--rpm",
+        type=float,
+        help="requests per minute allowed by the API quota (default: unlimited)",
+    )
+    parser.add_argument(
+        "--tpm",
+        type=float,
+        help="tokens per minute allowed by the API quota (default: unlimited)",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help=f"retries for rate-limited or overloaded requests (default: {DEFAULT_RETRIES})",
+    )
+    parser.add_argument(
+        "--db",
+        default=DEFAULT_DB_PATH,
+        help=f"SQLite database path (default: {DEFAULT_DB_PATH})",
+    )
+    parser.add_argument(
+        "--fake",
+        action="store_true",
+        help="use the offline fake client instead of the Gemini API",
+    )
+    parser.add_argument(
+        "--fake-latency",
+        type=float,
+        default=0.5,
+        help="simulated seconds per request with --fake (default: 0.5)",
+    )
+    parser.add_argument(
+        "--fake-failure-rate",
+        type=float,
+        default=0.0,
+        help="probability that a request fails with a retryable error with --fake (default: 0)",
+    )
+    parser.add_argument(
+        "--fake-latency-per-question",
+        type=float,
+        default=0.0,
+        help="extra simulated seconds per generated question with --fake (default: 0)",
+    )
+    parser.add_argument(
+        "--pack",
+        action="store_true",
+        help="pack several small jobs into each request, tuning the pack size adaptively",
+    )
+    parser.add_argument(
+        "--max-pack",
+        type=int,
+        default=DEFAULT_MAX_PACK,
+        help=f"most jobs per packed request (default: {DEFAULT_MAX_PACK})",
+    )
+    parser.add_argument(
+        "--max-pack-questions",
+        type=int,
+        default=DEFAULT_MAX_PACK_QUESTIONS,
+        help=f"most questions per packed request (default: {DEFAULT_MAX_PACK_QUESTIONS})",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="replay identical requests from this on-disk response cache",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_BYTES / 1024 / 1024,
+        help="evict least recently used cache entries above this size (default: %(default)d)",
+    )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="clear the progress journal and run every job again",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="only request the questions missing from each category's quota "
+        "(see coverage_planner.py)",
+    )
+    parser.add_argument(
+        "--quota-scale",
+        type=float,
+        default=1.0,
+        help="with --plan, quota per difficulty as a multiple of the category weight "
+        "(default: 1)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="with --plan, print the planned API calls and exit",
+    )
+    parser.add_argument(
+        "--near-threshold",
+        type=float,
+        help="also skip questions at least this similar to an existing one (e.g. 0.6)",
+    )
+    parser.add_argument(
+        "--metrics-prefix",
+        default="batch_metrics",
+        help="write run metrics to PREFIX.jsonl and PREFIX.prom "
+        "(default: batch_metrics, empty to disable)",
+    )
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="only print warnings and errors from the generator (the log file keeps INFO)",
+    )
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="log full raw API responses",
+    )
+    parser.add_argument(
+        "--log-file",
+        default=DEFAULT_LOG_FILE,
+        help=f"rotating, gzip-compressed log file (default: {DEFAULT_LOG_FILE}, empty to disable)",
+    )
+    args = parser.parse_args(argv)
+
+    jobs = None
+    if args.plan:
+        conn = connect(args.db)
+        jobs, plan_rows = plan_coverage(question_counts(conn), scale=args.quota_scale)
+        conn.close()
+        print_plan(plan_rows, verbose=args.dry_run)
+        if args.dry_run or not jobs:
+            return 0
+    elif args.dry_run:
+        parser.error("--dry-run requires --plan")
+
+    configure_logging(
+        log_file=args.log_file or None, quiet=args.quiet, raw_responses=args.raw
+    )
 
-                # Small delay to avoid rate limiting
-                time.sleep(1)
+    if not args.fake and not os.environ.get("GEMINI_API_KEY"):
+        print("Please set the GEMINI_API_KEY environment variable")
+        return 1
+    client = create_transport(
+        fake=args.fake,
+        latency=args.fake_latency,
+        latency_per_question=args.fake_latency_per_question,
+        failure_rate=args.fake_failure_rate,
+    )
 
-            except Exception as e:
-                print(f"✗ Error processing {category} ({difficulty}): {e}")
-                continue
+    cache = None
+    if args.cache_dir:
+        cache = ResponseCache(args.cache_dir, max_bytes=int(args.cache_max_mb * 1024 * 1024))
 
-    print(f"\n🎉 Batch generation complete! Total questions added: {total_questions}")
+    packer = None
+    if args.pack:
+        packer = AdaptivePacker(
+            max_pack=args.max_pack, max_questions=args.max_pack_questions
+        )
+
+    summary = generate_batch(
+        jobs=jobs,
+        journal=not args.plan,
+        concurrency=args.concurrency,
+        packer=packer,
+        cache=cache,
+        client=client,
+        resume=not args.fresh,
+        near_threshold=args.near_threshold,
+        metrics_prefix=args.metrics_prefix,
+        db_path=args.db,
+        limiter=RateLimiter(rpm=args.rpm, tpm=args.tpm, retries=args.retries),
+    )
+    # Failed jobs stay out of the journal, so rerunning picks them up.
+    return 1 if summary is None or summary["failed_jobs"] else 0
 
 
 if __name__ == "__main__":
-    generate_batch()
+    sys.exit(main())
@@ -1,52 +1,95 @@
+#!/usr/bin/env python3
+"""
+Generate images with Imagen.
+
+Prompts can be given on the command line or read from a file, and are sent
+concurrently on a bounded worker pool that shares one generation session
+(client and rate limiter). The returned bytes are written as-is (no
+decode/re-encode) under their SHA-256, so identical outputs are stored once
+and concurrent runs never collide. Each saved image is appended to
+index.jsonl in the output directory with the prompt that produced it.
+"""
+
+import argparse
+import hashlib
+import json
 import os
 import sys
-from datetime import datetime
-from io import BytesIO
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from rate_limit import DEFAULT_RETRIES, RateLimiter
+
+DEFAULT_IMAGES_DIR = os.path.join(os.path.dirname(__file__), "images")
+DEFAULT_CONCURRENCY = 4
+INDEX_FILE = "index.jsonl"
+
+_EXTENSIONS = {"image/png": ".png", "image/jpeg": ".jpg", "image/webp": ".webp"}
+_index_lock = threading.Lock()
+
+
+def save_image(image_bytes, images_dir, mime_type="image/png"):
+    """
+    Write image bytes to images_dir/<sha256><ext> unless already present.
+
+    Returns (path, sha256, created).
+    """
+    digest = hashlib.sha256(image_bytes).hexdigest()
+    filepath = os.path.join(images_dir, digest + _EXTENSIONS.get(mime_type, ".png"))
+    if os.path.exists(filepath):
+        return filepath, digest, False
+
+    os.makedirs(images_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=images_dir, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(image_bytes)
+    os.replace(tmp_path, filepath)
+    return filepath, digest, True
+
+
+def _append_index(images_dir, prompt, filepath, digest, size):
+    entry = {
+        "file": os.path.basename(filepath),
+        "sha256": digest,
+        "bytes": size,
+        "prompt": prompt,
+    }
+    with _index_lock, open(os.path.join(images_dir, INDEX_FILE), "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
 
-from google import genai
-from PIL import Image
+def _new_session():
+    from generation_session import GenerationSession
 
+    return GenerationSession()
 
-def generate_and_save_image(prompt):
+
+def generate_and_save_image(
+    prompt, session=None, images_dir=DEFAULT_IMAGES_DIR, aspect_ratio="1:1"
+):
     """
     Generates an image based on a prompt and saves it to a file.
+
+    Requests go through `session` (a generation_session.GenerationSession,
+    created if not given). Returns the file path, or None on failure.
     """
     try:
-        client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
-
-        result = client.models.generate_images(
-            model="models/imagen-4.0-generate-preview-06-06",
-            prompt=prompt,
-            config=dict(
-                number_of_images=1,
-                output_mime_type="image/png",
-                person_generation="ALLOW_ADULT",
-                aspect_ratio="1:1",
-            ),
-        )
-
-        if not result.generated_images:
-            print("No images generated.")
-            return
-
-        if len(result.generated_images) != 1:
-            print("Number of images generated does not match the requested number.")
-            return
-
-        # Create the images directory if it doesn't exist
-        images_dir = os.path.join(os.path.dirname(__file__), "images")
-        os.makedirs(images_dir, exist_ok=True)
-
-        # Generate a unique filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{timestamp}.png"
-        filepath = os.path.join(images_dir, filename)
-
-        # Save the image
-        for generated_image in result.generated_images:
-            image = Image.open(BytesIO(generated_image.image.image_bytes))
-            image.save(filepath)
+        if session is None:
+            session = _new_session()
+
+        image = session.generate_image(prompt, aspect_ratio=aspect_ratio)
+        if image is None:
+            return None
+        image_bytes, mime_type = image
+
+        filepath, digest, created = save_image(image_bytes, images_dir, mime_type)
+        _append_index(images_dir, prompt, filepath, digest, len(image_bytes))
+        if created:
             print(f"Image saved successfully: {filepath}")
+        else:
+            print(f"Identical image already stored: {filepath}")
+        return filepath
 
     except Exception as e:
         print(f"An error occurred: {e}")
@@ -54,12 +97,117 @@ def generate_and_save_image(prompt):
             print(
                 "Please make sure your GEMINI_API_KEY environment variable is set correctly."
             )
+        return None
 
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print('Usage: python generate_image.py "<your_prompt>"')
+def generate_images(
+    prompts,
+    concurrency=DEFAULT_CONCURRENCY,
+    session=None,
+    images_dir=DEFAULT_IMAGES_DIR,
+    aspect_ratio="1:1",
+):
+    """
+    Generate and save an image for every prompt, keeping up to
+    `concurrency` requests in flight over one shared session.
+
+    Returns {prompt: file path or None}.
+    """
+    if session is None:
+        session = _new_session()
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {
+            executor.submit(
+                generate_and_save_image, prompt, session, images_dir, aspect_ratio
+            ): prompt
+            for prompt in prompts
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            prompt = futures[future]
+            results[prompt] = future.result()
+            status = "✓" if results[prompt] else "✗"
+            print(f"[{done}/{len(futures)}] {status} {prompt}")
+    return results
+
+
+def read_prompts(path):
+    """
+    Read one prompt per line, skipping blank lines and # comments.
+    """
+    with open(path, encoding="utf-8") as f:
+        return [
+            line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")
+        ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("prompts", nargs="*", help="image prompts")
+    parser.add_argument("-f", "--file", help="read prompts from this file, one per line")
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"number of requests kept in flight (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "-o",
+        "--out-dir",
+        default=DEFAULT_IMAGES_DIR,
+        help="directory to store images in (default: scripts/images)",
+    )
+    parser.add_argument(
+        "--aspect-ratio", default="1:1", help="image aspect ratio (default: 1:1)"
+    )
+    parser.add_argument(
+        "--rpm",
+        type=float,
+        help="requests per minute allowed by the API quota (default: unlimited)",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help=f"retries for rate-limited or overloaded requests (default: {DEFAULT_RETRIES})",
+    )
+    parser.add_argument(
+        "--fake",
+        action="store_true",
+        help="use the offline fake client instead of the Imagen API",
+    )
+    args = parser.parse_args(argv)
+
+    prompts = list(args.prompts)
+    if args.file:
+        prompts += read_prompts(args.file)
+    if not prompts:
+        parser.print_usage()
+        print('Example: python generate_image.py "<your_prompt>" ["<another prompt>" ...]')
+        sys.exit(1)
+
+    # The SDK is only imported once the arguments are known to be usable.
+    from generation_session import GenerationSession, create_transport
+
+    session = GenerationSession(
+        create_transport(fake=args.fake, latency=0.2),
+        limiter=RateLimiter(rpm=args.rpm, retries=args.retries),
+    )
+    results = generate_images(
+        # Duplicate prompts would only produce duplicate requests.
+        list(dict.fromkeys(prompts)),
+        concurrency=args.concurrency,
+        session=session,
+        images_dir=args.out_dir,
+        aspect_ratio=args.aspect_ratio,
+    )
+    saved = sum(1 for path in results.values() if path)
+    print(f"{saved}/{len(results)} images saved to {args.out_dir}")
+    if saved < len(results):
         sys.exit(1)
 
-    input_prompt = sys.argv[1]
-    generate_and_save_image(input_prompt)
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,69 @@
 #!/usr/bin/env python3
 
+import argparse
+import functools
 import os
 import sys
 import json
 import sqlite3
 import logging
-from google import genai
-from google.genai import types
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("generate_questions.log"),
-        logging.StreamHandler(sys.stdout),
-    ],
+import time
+
+import response_cache
+from logging_setup import DEFAULT_LOG_FILE, RAW_RESPONSE_LOGGER, configure_logging
+from metrics import Metrics
+from rate_limit import estimate_tokens
+from json_stream import JSONStreamError, iter_json_array
+from question_db import (
+    DEFAULT_DB_PATH,
+    REQUIRED_FIELDS,
+    IngestResult,
+    add_questions_bulk,
+    connect,
+    insert_questions,
+    load_category_ids,
 )
+
 logger = logging.getLogger(__name__)
+raw_logger = logging.getLogger(RAW_RESPONSE_LOGGER)
 
+MODEL = "gemini-2.5-flash"
+DIFFICULTIES = ("Easy", "Medium", "Hard")
 
-def generate_questions(category, difficulty, count=5):
-    """
-    Generate trivia questions using Gemini AI based on category and difficulty.
+
+def create_client():
     """
-    logger.info(
-        f"Starting question generation - Category: {category}, Difficulty: {difficulty}, Count: {count}"
-    )
+    Create a Gemini client from the GEMINI_API_KEY environment variable.
 
+    The client is safe to share between threads and keeps its connections
+    open, so generation_session.GenerationSession creates one and reuses it
+    for every request.
+    """
     api_key = os.environ.get("GEMINI_API_KEY")
     if not api_key:
         logger.error("GEMINI_API_KEY environment variable not set")
         return None
 
-    logger.debug(f"API key found: {api_key[:10]}...{api_key[-4:]}")
-    client = genai.Client(api_key=api_key)
+    # Imported here so that building requests, the fake client and the
+    # database-only commands work without the SDK installed.
+    from google import genai
+
+    logger.debug("API key found: %s...%s", api_key[:10], api_key[-4:])
+    return genai.Client(api_key=api_key)
+
+
+def _default_client():
+    # Imported here: generation_session builds on this module.
+    from generation_session import default_session
 
-    prompt = f"""Generate {count} trivia questions for a Smart10-style game. Each question should be a clear and direct topic.
+    return default_session().client
+
+
+def build_prompt(category, difficulty, count):
+    """
+    Render the question generation prompt for one category/difficulty pair.
+    """
+    return f"""Generate {count} trivia questions for a Smart10-style game. Each question should be a clear and direct topic.
 
 Category: {category}
 Difficulty: {difficulty}
@@ -67,286 +94,419 @@ Return the response as a JSON array with this exact structure:
 
 Make sure the JSON is valid and properly formatted. Do not include any text before or after the JSON array."""
 
-    logger.debug(f"Generated prompt (length: {len(prompt)})")
-    logger.debug(f"Prompt preview: {prompt[:200]}...")
-
-    model = "gemini-2.5-flash"
-    logger.info(f"Using model: {model}")
-
-    contents = [
-        types.Content(
-            role="user",
-            parts=[
-                types.Part.from_text(text=prompt),
-            ],
-        ),
-    ]
-
-    generate_content_config = types.GenerateContentConfig(
-        thinking_config=types.ThinkingConfig(
-            thinking_budget=-1,
-        ),
-        response_mime_type="application/json",
-    )
 
-    logger.debug(f"Request config: {generate_content_config}")
+@functools.lru_cache(maxsize=None)
+def generation_config():
+    """
+    Return the GenerateContentConfig (in the dict form the SDK accepts)
+    shared by every single-job request.
 
-    try:
-        logger.info("Sending request to Gemini API...")
-        response = client.models.generate_content(
-            model=model,
-            contents=contents,
-            config=generate_content_config,
-        )
+    Built once and never mutated, so its cache-key fingerprint is computed
+    once too (see response_cache.cache_key).
+    """
+    return {
+        "thinking_config": {"thinking_budget": -1},
+        "response_mime_type": "application/json",
+    }
 
-        logger.info(f"Received response from API (length: {len(response.text)})")
-        logger.info("Raw API response:")
-        print("=" * 80)
-        print("RAW API RESPONSE:")
-        print(response.text)
-        print("=" * 80)
 
-        # Parse the JSON response
-        logger.info("Parsing JSON response...")
-        questions_data = json.loads(response.text)
-        logger.info(f"Successfully parsed JSON with {len(questions_data)} questions")
+def user_contents(prompt):
+    """
+    Return generate_content contents holding `prompt` as one user message.
+    """
+    return [{"role": "user", "parts": [{"text": prompt}]}]
 
-        # Log question validation
-        for i, question in enumerate(questions_data):
-            logger.debug(
-                f"Question {i + 1}: {len(question.get('options', []))} options, "
-                f"{sum(1 for opt in question.get('options', []) if opt.get('isCorrect', False))} correct"
-            )
 
-        return questions_data
+@functools.lru_cache(maxsize=1024)
+def build_request(category, difficulty, count):
+    """
+    Build the (model, prompt, contents, config) for a generate_content call.
 
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON parsing error: {e}")
-        logger.error(f"Raw response: {response.text}")
-        return None
-    except Exception as e:
-        logger.error(f"Error generating questions: {e}")
-        logger.error(f"Error type: {type(e).__name__}")
-        return None
+    Requests are memoized, so repeated jobs reuse the rendered prompt and
+    contents; callers must not mutate them.
+    """
+    prompt = build_prompt(category, difficulty, count)
+
+    logger.debug("Generated prompt (length: %d)", len(prompt))
+    logger.debug("Prompt preview: %s...", prompt[:200])
+
+    return MODEL, prompt, user_contents(prompt), generation_config()
 
 
-def add_questions_to_database(questions_data, db_path="./sport10.db"):
+def _total_tokens(response):
+    usage = getattr(response, "usage_metadata", None)
+    return getattr(usage, "total_token_count", None)
+
+
+def request_json(
+    request,
+    client=None,
+    cache=None,
+    metrics=None,
+    labels=None,
+    limiter=None,
+    questions=0,
+):
     """
-    Add generated questions to the SQLite database.
+    Send a (model, prompt, contents, config) request from build_request and
+    return the parsed JSON response.
+
+    Identical requests are answered from `cache` when given, and only
+    responses that parse are stored. With a rate_limit.RateLimiter the call
+    waits for request/token budget (estimated from the prompt and the
+    number of `questions` asked for) and retryable errors are retried with
+    backoff. Request outcome, latency and response size are recorded in
+    `metrics` under `labels`. Returns None if there is neither a cached
+    response nor a usable client; API errors and json.JSONDecodeError
+    propagate.
     """
-    logger.info(f"Adding {len(questions_data)} questions to database: {db_path}")
+    if metrics is None:
+        metrics = Metrics()
+    labels = labels or {}
+    model, prompt, contents, generate_content_config = request
+    logger.info("Using model: %s", model)
+
+    cache_key = None
+    response_text = None
+    if cache is not None:
+        cache_key = response_cache.cache_key(model, prompt, generate_content_config)
+        response_text = cache.get(cache_key)
+        if response_text is not None:
+            logger.info("Using cached response %s", cache_key[:12])
+            metrics.inc("gemini_requests_total", outcome="cache_hit", **labels)
+
+    if response_text is None and client is None:
+        client = _default_client()
+        if client is None:
+            metrics.inc("gemini_failures_total", reason="no_api_key", **labels)
+            return None
+
+    if response_text is None:
+        logger.info("Sending request to Gemini API...")
+        request_started = time.perf_counter()
 
-    try:
-        logger.debug(f"Connecting to database: {db_path}")
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # Create tables if they don't exist
-        logger.info("Creating database tables if they don't exist...")
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS categories (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS questions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                text TEXT NOT NULL,
-                category_id INTEGER NOT NULL,
-                difficulty TEXT NOT NULL,
-                FOREIGN KEY (category_id) REFERENCES categories (id)
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS answers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                question_id INTEGER NOT NULL,
-                text TEXT NOT NULL,
-                is_correct BOOLEAN NOT NULL,
-                FOREIGN KEY (question_id) REFERENCES questions (id)
+        def send():
+            return client.models.generate_content(
+                model=model,
+                contents=contents,
+                config=generate_content_config,
             )
-        """)
 
-        conn.commit()
-        logger.info("Database tables created/verified successfully")
+        try:
+            if limiter is None:
+                response = send()
+            else:
+                response = limiter.call(
+                    send, tokens=estimate_tokens(prompt, questions), usage=_total_tokens
+                )
+            response_text = response.text
+        except Exception:
+            metrics.inc("gemini_requests_total", outcome="error", **labels)
+            raise
+        finally:
+            metrics.observe(
+                "gemini_request_seconds",
+                time.perf_counter() - request_started,
+                **labels,
+            )
+        metrics.inc("gemini_requests_total", outcome="ok", **labels)
+        metrics.inc(
+            "gemini_response_bytes_total", len(response_text.encode("utf-8")), **labels
+        )
 
-        added_count = 0
+        logger.info("Received response from API (length: %d)", len(response_text))
+        raw_logger.info("Raw API response:\n%s", response_text)
 
-        for i, question_data in enumerate(questions_data):
-            logger.debug(f"Processing question {i + 1}/{len(questions_data)}")
+    # Parse the JSON response
+    logger.info("Parsing JSON response...")
+    try:
+        with metrics.timer("gemini_parse_seconds", **labels):
+            data = json.loads(response_text)
+    except json.JSONDecodeError:
+        raw_logger.error("Raw response: %s", response_text)
+        raise
 
-            # Validate question data structure
-            required_fields = ["category", "question", "difficulty", "options"]
-            for field in required_fields:
-                if field not in question_data:
-                    logger.error(f"Question {i + 1} missing required field: {field}")
-                    continue
+    if cache_key is not None:
+        cache.put(cache_key, response_text)
+    return data
 
-            category = question_data["category"]
-            question_text = question_data["question"]
-            difficulty = question_data["difficulty"]
-            options = question_data["options"]
 
-            logger.debug(
-                f"Question {i + 1}: Category={category}, Difficulty={difficulty}, Options={len(options)}"
-            )
+def generate_questions(
+    category, difficulty, count=5, client=None, cache=None, metrics=None, limiter=None
+):
+    """
+    Generate trivia questions using Gemini AI based on category and difficulty.
 
-            # Insert or get category
-            cursor.execute(
-                "INSERT OR IGNORE INTO categories (name) VALUES (?)", (category,)
-            )
-            cursor.execute("SELECT id FROM categories WHERE name = ?", (category,))
-            category_result = cursor.fetchone()
+    If no client is given the shared one from generation_session.default_session
+    is used. Any object exposing models.generate_content (e.g.
+    fake_gemini.FakeClient) can be used.
+    With a response_cache.ResponseCache, identical requests are answered from
+    disk and only successfully parsed responses are stored. Request latency,
+    response size, parse time and failures are recorded in `metrics` (a
+    metrics.Metrics) when given. A shared rate_limit.RateLimiter keeps
+    concurrent callers within the API quota and retries transient errors.
+    """
+    logger.info(
+        "Starting question generation - Category: %s, Difficulty: %s, Count: %d",
+        category,
+        difficulty,
+        count,
+    )
 
-            if not category_result:
-                logger.error(f"Failed to get category ID for: {category}")
-                continue
+    if metrics is None:
+        metrics = Metrics()
+    labels = {"category": category, "difficulty": difficulty}
 
-            category_id = category_result[0]
-            logger.debug(f"Category ID for '{category}': {category_id}")
+    try:
+        questions_data = request_json(
+            build_request(category, difficulty, count),
+            client=client,
+            cache=cache,
+            metrics=metrics,
+            labels=labels,
+            limiter=limiter,
+            questions=count,
+        )
+        if questions_data is None:
+            return None
+        logger.info("Successfully parsed JSON with %d questions", len(questions_data))
+        metrics.observe("gemini_questions_per_response", len(questions_data), **labels)
 
-            # Insert question
-            cursor.execute(
-                "INSERT INTO questions (text, category_id, difficulty) VALUES (?, ?, ?)",
-                (question_text, category_id, difficulty),
-            )
-            question_id = cursor.lastrowid
-            logger.debug(f"Inserted question with ID: {question_id}")
-
-            # Insert answers
-            correct_count = 0
-            for j, option in enumerate(options):
-                if "text" not in option or "isCorrect" not in option:
-                    logger.warning(
-                        f"Question {i + 1}, option {j + 1} missing required fields"
-                    )
-                    continue
-
-                cursor.execute(
-                    "INSERT INTO answers (question_id, text, is_correct) VALUES (?, ?, ?)",
-                    (question_id, option["text"], option["isCorrect"]),
+        # Log question validation
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, question in enumerate(questions_data):
+                options = question.get("options", [])
+                logger.debug(
+                    "Question %d: %d options, %d correct",
+                    i + 1,
+                    len(options),
+                    sum(1 for opt in options if opt.get("isCorrect", False)),
                 )
 
-                if option["isCorrect"]:
-                    correct_count += 1
+        return questions_data
 
-            logger.debug(
-                f"Question {i + 1}: Added {len(options)} options, {correct_count} correct"
-            )
-            added_count += 1
+    except json.JSONDecodeError as e:
+        logger.error("JSON parsing error: %s", e)
+        metrics.inc("gemini_failures_total", reason="invalid_json", **labels)
+        return None
+    except Exception as e:
+        logger.error("Error generating questions: %s", e)
+        logger.error("Error type: %s", type(e).__name__)
+        metrics.inc("gemini_failures_total", reason=type(e).__name__, **labels)
+        return None
 
-        conn.commit()
-        conn.close()
 
-        logger.info(f"Successfully added {added_count} questions to database")
-        return added_count
+def generate_questions_stream(category, difficulty, count=5, client=None, cache=None):
+    """
+    Stream trivia questions from Gemini, yielding each one as soon as its JSON
+    object is complete.
+
+    Uses generate_content_stream and json_stream.iter_json_array, so the first
+    question is available long before the whole response has arrived.
+    Elements that aren't objects with the required fields are logged and
+    skipped. Raises JSONStreamError if the response isn't a valid JSON array,
+    and lets API errors propagate. The response is only cached once the whole
+    array has parsed.
+    """
+    logger.info(
+        "Starting streamed question generation - Category: %s, Difficulty: %s, Count: %d",
+        category,
+        difficulty,
+        count,
+    )
 
-    except sqlite3.Error as e:
-        logger.error(f"Database error: {e}")
-        return 0
-    except Exception as e:
-        logger.error(f"Error adding questions to database: {e}")
-        logger.error(f"Error type: {type(e).__name__}")
-        return 0
+    model, prompt, contents, generate_content_config = build_request(
+        category, difficulty, count
+    )
 
+    cache_key = None
+    cached_text = None
+    if cache is not None:
+        cache_key = response_cache.cache_key(model, prompt, generate_content_config)
+        cached_text = cache.get(cache_key)
 
-def main():
-    logger.info("Starting generate_questions.py")
-    logger.info(f"Command line arguments: {sys.argv}")
+    received = []
+    if cached_text is not None:
+        logger.info("Using cached response %s", cache_key[:12])
+        chunks = [cached_text]
+    else:
+        if client is None:
+            client = _default_client()
+            if client is None:
+                return
+
+        def stream_chunks():
+            logger.info("Streaming response from Gemini API...")
+            for chunk in client.models.generate_content_stream(
+                model=model,
+                contents=contents,
+                config=generate_content_config,
+            ):
+                text = chunk.text or ""
+                received.append(text)
+                yield text
+
+        chunks = stream_chunks()
+
+    for i, question in enumerate(iter_json_array(chunks)):
+        if not isinstance(question, dict) or any(
+            field not in question for field in REQUIRED_FIELDS
+        ):
+            logger.warning("Streamed element %d is not a complete question, skipping", i + 1)
+            continue
+        yield question
+
+    if cache_key is not None and cached_text is None:
+        cache.put(cache_key, "".join(received))
+
+
+def stream_questions_to_database(
+    category, difficulty, count=5, db_path=DEFAULT_DB_PATH, client=None, cache=None
+):
+    """
+    Generate questions with generate_questions_stream and insert each one as
+    soon as it arrives.
 
-    if len(sys.argv) < 3:
-        logger.error("Insufficient command line arguments")
-        print("Usage: python generate_questions.py <category> <difficulty> [count]")
-        print("Example: python generate_questions.py Technology Easy 5")
-        print(
-            "Categories: Technology, Science, Geography, History, Literature, Sports, Music, Art, Film"
-        )
-        print("Difficulties: Easy, Medium, Hard")
-        sys.exit(1)
+    Returns an IngestResult; questions inserted before an error stay in the
+    database.
+    """
+    result = IngestResult()
+    started = time.perf_counter()
 
-    category = sys.argv[1]
-    difficulty = sys.argv[2]
-    count = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    try:
+        conn = connect(db_path)
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", e)
+        return result
 
-    logger.info(
-        f"Parsed arguments - Category: {category}, Difficulty: {difficulty}, Count: {count}"
-    )
+    try:
+        category_ids = load_category_ids(conn)
+        for question in generate_questions_stream(
+            category, difficulty, count, client=client, cache=cache
+        ):
+            result.merge(insert_questions(conn, [question], category_ids))
+            if result.added == 1:
+                logger.info(
+                    "First question inserted after %.2fs", time.perf_counter() - started
+                )
 
-    # Validate inputs
-    valid_categories = [
-        "Technology",
-        "Science",
-        "Geography",
-        "History",
-        "Literature",
-        "Sports",
-        "Music",
-        "Art",
-        "Film",
-    ]
-    valid_difficulties = ["Easy", "Medium", "Hard"]
-
-    if category not in valid_categories:
-        logger.error(f"Invalid category: {category}")
-        print(f"Invalid category. Valid categories: {', '.join(valid_categories)}")
-        sys.exit(1)
-
-    if difficulty not in valid_difficulties:
-        logger.error(f"Invalid difficulty: {difficulty}")
-        print(
-            f"Invalid difficulty. Valid difficulties: {', '.join(valid_difficulties)}"
-        )
-        sys.exit(1)
+    except JSONStreamError as e:
+        logger.error("JSON parsing error: %s", e)
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", e)
+    except Exception as e:
+        logger.error("Error generating questions: %s", e)
+        logger.error("Error type: %s", type(e).__name__)
+    finally:
+        conn.close()
 
-    if count < 1 or count > 20:
-        logger.error(f"Invalid count: {count}")
-        print("Count must be between 1 and 20")
-        sys.exit(1)
+    logger.info(
+        "Streamed %d questions into %s in %.2fs (%d duplicates skipped)",
+        result.added,
+        db_path,
+        time.perf_counter() - started,
+        result.duplicates + result.near_duplicates,
+    )
+    return result
 
-    logger.info("All input validation passed")
 
-    # Check for API key
-    if not os.environ.get("GEMINI_API_KEY"):
-        logger.error("GEMINI_API_KEY environment variable not set")
-        print("Please set the GEMINI_API_KEY environment variable")
-        sys.exit(1)
+def add_questions_to_database(questions_data, db_path=DEFAULT_DB_PATH):
+    """
+    Add generated questions to the SQLite database.
 
-    logger.info(f"Generating {count} {difficulty} questions for {category}...")
-    print(f"Generating {count} {difficulty} questions for {category}...")
+    All questions are written in one transaction; see question_db.insert_questions.
+    """
+    logger.info("Adding %d questions to database: %s", len(questions_data), db_path)
 
-    # Generate questions
-    questions_data = generate_questions(category, difficulty, count)
+    try:
+        result = add_questions_bulk(questions_data, db_path=db_path)
+        logger.info(
+            "Successfully added %d questions to database "
+            "(%d duplicates skipped, %d quarantined)",
+            result.added,
+            result.duplicates,
+            result.rejected,
+        )
+        return result.added
 
-    if not questions_data:
-        logger.error("Failed to generate questions")
-        print("Failed to generate questions")
-        sys.exit(1)
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", e)
+        return 0
+    except Exception as e:
+        logger.error("Error adding questions to database: %s", e)
+        logger.error("Error type: %s", type(e).__name__)
+        return 0
 
-    logger.info(f"Generated {len(questions_data)} questions")
 
-    # Validate generated data
-    if not isinstance(questions_data, list) or len(questions_data) == 0:
-        logger.error("Invalid response format from AI")
-        print("Invalid response format from AI")
-        sys.exit(1)
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate questions for one category and difficulty and store them."
+    )
+    parser.add_argument("category", help="category name or ' - '-separated path")
+    parser.add_argument("difficulty", choices=DIFFICULTIES)
+    parser.add_argument(
+        "count",
+        type=int,
+        nargs="?",
+        default=5,
+        help="questions to generate, 1-20 (default: 5)",
+    )
+    parser.add_argument(
+        "--db",
+        default=DEFAULT_DB_PATH,
+        help=f"SQLite database path (default: {DEFAULT_DB_PATH})",
+    )
+    parser.add_argument(
+        "--stream", action="store_true", help="insert each question as soon as it arrives"
+    )
+    parser.add_argument("--fake", action="store_true", help="use the offline fake client")
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="only print warnings and errors"
+    )
+    parser.add_argument("--raw", action="store_true", help="log full raw API responses")
+    parser.add_argument(
+        "--log-file",
+        default=DEFAULT_LOG_FILE,
+        help=f"log file (default: {DEFAULT_LOG_FILE}, empty to disable)",
+    )
+    args = parser.parse_args(argv)
+    if not 1 <= args.count <= 20:
+        parser.error("count must be between 1 and 20")
 
-    logger.info("Generated data validation passed")
+    if not args.fake and not os.environ.get("GEMINI_API_KEY"):
+        print("Please set the GEMINI_API_KEY environment variable")
+        return 1
 
-    # Add to database
-    logger.info("Adding questions to database...")
-    print("Adding questions to database...")
-    added_count = add_questions_to_database(questions_data)
+    configure_logging(
+        log_file=args.log_file or None, quiet=args.quiet, raw_responses=args.raw
+    )
 
-    if added_count > 0:
-        logger.info(f"Successfully generated and added {added_count} questions!")
-        print(f"Successfully generated and added {added_count} questions!")
+    # Imported here: generation_session builds on this module.
+    from generation_session import GenerationSession, create_transport
+
+    session = GenerationSession(create_transport(fake=args.fake))
+    print(f"Generating {args.count} {args.difficulty} questions for {args.category}...")
+    if args.stream:
+        added = stream_questions_to_database(
+            args.category,
+            args.difficulty,
+            args.count,
+            db_path=args.db,
+            client=session.client,
+        ).added
     else:
-        logger.error("Failed to add questions to database")
+        questions_data = session.generate(args.category, args.difficulty, args.count)
+        if not questions_data:
+            print("Failed to generate questions")
+            return 1
+        added = add_questions_to_database(questions_data, db_path=args.db)
+
+    if added == 0:
         print("Failed to add questions to database")
+        return 1
+    print(f"Successfully generated and added {added} questions!")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
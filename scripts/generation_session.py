@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Long-lived generation session shared by the question, batch and image paths.
+
+A GenerationSession holds one client, created on first use and reused by
+every request, so its HTTP connection pool stays warm. It also holds the
+response cache, metrics and rate limiter that used to be threaded through
+each call. The per-request pieces that never change (the
+GenerateContentConfig objects and their cache-key fingerprints, the image
+config, the rendered single-job requests) are built once and shared.
+
+The transport is pluggable: any object exposing models.generate_content,
+models.generate_content_stream and models.generate_images can be passed
+as the client, e.g. fake_gemini.FakeClient or a wrapper that records calls.
+"""
+
+import functools
+import threading
+import time
+
+from generate_questions import (
+    create_client,
+    generate_questions,
+    generate_questions_stream,
+)
+from metrics import Metrics
+from request_packing import generate_packed
+
+IMAGE_MODEL = "models/imagen-4.0-generate-preview-06-06"
+
+_default_session = None
+_default_session_lock = threading.Lock()
+
+
+def create_transport(fake=False, **fake_options):
+    """
+    Return a Gemini client, or a fake_gemini.FakeClient built with
+    `fake_options` when `fake` is set. Returns None if GEMINI_API_KEY is
+    not set.
+    """
+    if fake:
+        from fake_gemini import FakeClient
+
+        return FakeClient(**fake_options)
+    return create_client()
+
+
+@functools.lru_cache(maxsize=None)
+def image_config(aspect_ratio="1:1"):
+    """
+    Return the shared generate_images config for one aspect ratio.
+    """
+    return dict(
+        number_of_images=1,
+        output_mime_type="image/png",
+        person_generation="ALLOW_ADULT",
+        aspect_ratio=aspect_ratio,
+    )
+
+
+class GenerationSession:
+    """
+    One client plus the cache, metrics and rate limiter used with it.
+
+    All methods are safe to call from several worker threads; the client is
+    created at most once.
+    """
+
+    def __init__(
+        self, client=None, cache=None, metrics=None, limiter=None, client_factory=None
+    ):
+        self._client = client
+        self._client_factory = client_factory or create_client
+        self._client_lock = threading.Lock()
+        self.cache = cache
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.limiter = limiter
+
+    @property
+    def client(self):
+        """
+        The session's client, created on first access. None if it could not
+        be created (e.g. GEMINI_API_KEY is not set); creation is then retried
+        on the next access.
+        """
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._client_factory()
+        return self._client
+
+    def generate(self, category, difficulty, count=5):
+        """
+        Generate questions for one job; see generate_questions.
+        """
+        return generate_questions(
+            category,
+            difficulty,
+            count,
+            client=self.client,
+            cache=self.cache,
+            metrics=self.metrics,
+            limiter=self.limiter,
+        )
+
+    def generate_packed(self, jobs):
+        """
+        Generate questions for several jobs in one request; see
+        request_packing.generate_packed.
+        """
+        return generate_packed(
+            jobs,
+            client=self.client,
+            cache=self.cache,
+            metrics=self.metrics,
+            limiter=self.limiter,
+        )
+
+    def run_pack(self, pack):
+        """
+        Send a pack of (category, difficulty, count) jobs: a single job with
+        the regular prompt, several as one packed request.
+
+        Returns (one question list or None per job, request seconds).
+        """
+        started = time.perf_counter()
+        if len(pack) == 1:
+            results = [self.generate(*pack[0])]
+        else:
+            results = self.generate_packed(pack)
+            if results is None:
+                results = [None] * len(pack)
+        return results, time.perf_counter() - started
+
+    def stream(self, category, difficulty, count=5):
+        """
+        Yield questions as they arrive; see generate_questions_stream.
+        """
+        return generate_questions_stream(
+            category, difficulty, count, client=self.client, cache=self.cache
+        )
+
+    def generate_image(self, prompt, aspect_ratio="1:1"):
+        """
+        Request one image for `prompt`. Returns (image bytes, mime type), or
+        None if the response holds no image.
+        """
+        client = self.client
+        if client is None:
+            raise RuntimeError("GEMINI_API_KEY environment variable not set")
+
+        def send():
+            return client.models.generate_images(
+                model=IMAGE_MODEL, prompt=prompt, config=image_config(aspect_ratio)
+            )
+
+        started = time.perf_counter()
+        try:
+            result = send() if self.limiter is None else self.limiter.call(send)
+        finally:
+            self.metrics.observe("image_request_seconds", time.perf_counter() - started)
+
+        if not result.generated_images:
+            print("No images generated.")
+            return None
+
+        if len(result.generated_images) != 1:
+            print("Number of images generated does not match the requested number.")
+            return None
+
+        image = result.generated_images[0].image
+        return image.image_bytes, getattr(image, "mime_type", None) or "image/png"
+
+
+def default_session():
+    """
+    Return the process-wide session used when callers don't pass a client.
+    """
+    global _default_session
+    if _default_session is None:
+        with _default_session_lock:
+            if _default_session is None:
+                _default_session = GenerationSession()
+    return _default_session
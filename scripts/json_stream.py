@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Incremental parsing of a top-level JSON array.
+
+iter_json_array() takes text chunks as they arrive (from a streaming API
+response or a file) and yields each array element as soon as its closing
+bracket has been seen, without holding the whole document in memory.
+"""
+
+import json
+import re
+
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+_NUMBER_TAIL = re.compile(r"[0-9eE+.-]*")
+# Decode errors this close to the end of the buffer may just mean the element
+# continues in the next chunk (e.g. a \uXXXX escape cut in half).
+_TRUNCATION_WINDOW = 6
+# Consumed text is dropped once this much has accumulated.
+_COMPACT_AT = 1 << 16
+
+_decoder = json.JSONDecoder()
+
+# Parser states: before the opening '[', right after it, after a ',' and
+# after an element.
+_BEFORE_ARRAY, _ARRAY_START, _AFTER_COMMA, _AFTER_ELEMENT = range(4)
+
+
+class JSONStreamError(ValueError):
+    """Raised when the stream is not a well-formed JSON array."""
+
+
+def _maybe_truncated(error, buf):
+    return len(buf) - error.pos <= _TRUNCATION_WINDOW or error.msg.startswith(
+        "Unterminated string"
+    )
+
+
+def iter_json_array(chunks):
+    """
+    Yield the elements of a JSON array whose text arrives in `chunks`.
+
+    Any text before the opening '[' (e.g. a stray preamble) is skipped.
+    Elements must be separated by exactly one ','; a missing, doubled or
+    trailing separator raises JSONStreamError.
+    Each element is decoded with json's C scanner (JSONDecoder.raw_decode)
+    as soon as it is complete; an element cut off at the end of a chunk is
+    retried once more text has arrived. Memory stays bounded by the largest
+    element plus one chunk.
+    """
+    chunks = iter(chunks)
+    buf = ""
+    pos = 0
+    state = _BEFORE_ARRAY
+    exhausted = False
+
+    while True:
+        if pos >= _COMPACT_AT:
+            buf = buf[pos:]
+            pos = 0
+
+        need_more = False
+        if state == _BEFORE_ARRAY:
+            bracket = buf.find("[", pos)
+            if bracket < 0:
+                buf, pos = "", 0
+                need_more = True
+            else:
+                state = _ARRAY_START
+                pos = bracket + 1
+
+        if state != _BEFORE_ARRAY:
+            pos = _WHITESPACE.match(buf, pos).end()
+            char = buf[pos] if pos < len(buf) else None
+            if char is None:
+                need_more = True
+            elif state == _AFTER_ELEMENT:
+                if char == "]":
+                    return
+                if char != ",":
+                    raise JSONStreamError(
+                        f"Expected ',' or ']' after array element, got {char!r}"
+                    )
+                state = _AFTER_COMMA
+                pos += 1
+                continue
+            elif char == "]" and state == _ARRAY_START:
+                return
+            elif char in ",]":
+                raise JSONStreamError(f"Expected an array element, got {char!r}")
+            else:
+                try:
+                    value, end = _decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError as e:
+                    if exhausted or not _maybe_truncated(e, buf):
+                        raise JSONStreamError(f"Invalid array element: {e}") from e
+                    need_more = True
+                else:
+                    # A number running up to the end of the buffer may
+                    # continue in the next chunk (e.g. "1.5" + "e3").
+                    if (
+                        not exhausted
+                        and isinstance(value, (int, float))
+                        and not isinstance(value, bool)
+                        and _NUMBER_TAIL.match(buf, end).end() == len(buf)
+                    ):
+                        need_more = True
+                    else:
+                        yield value
+                        state = _AFTER_ELEMENT
+                        pos = end
+                        continue
+
+        if need_more:
+            if exhausted:
+                if state == _BEFORE_ARRAY:
+                    raise JSONStreamError("No JSON array found in stream")
+                raise JSONStreamError("JSON array is truncated")
+            for chunk in chunks:
+                if chunk:
+                    buf += chunk
+                    break
+            else:
+                exhausted = True
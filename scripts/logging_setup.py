@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Logging configuration for the generation scripts.
+
+Log records are handed to a QueueHandler, which merges each message with
+its arguments (and renders any traceback) in the calling thread. A
+background QueueListener thread applies LOG_FORMAT and does the file/stdout
+I/O, so worker threads never block on disk. The log file rotates at a size
+limit and rotated files are gzip-compressed.
+"""
+
+import atexit
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import sys
+
+DEFAULT_LOG_FILE = "generate_questions.log"
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# Full API responses go to this logger; it is silenced unless asked for.
+RAW_RESPONSE_LOGGER = "generate_questions.raw"
+
+_listener = None
+
+
+def _gzip_namer(name):
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source, dest):
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def configure_logging(
+    log_file=DEFAULT_LOG_FILE,
+    quiet=False,
+    verbose=False,
+    raw_responses=False,
+    max_bytes=DEFAULT_MAX_BYTES,
+    backup_count=DEFAULT_BACKUP_COUNT,
+):
+    """
+    Route all logging through a background writer thread.
+
+    By default INFO and above go to stdout and to `log_file`. `quiet` is the
+    production mode: stdout only shows warnings and errors while the file
+    still gets INFO. `verbose` enables DEBUG. Raw API responses are only
+    logged with `raw_responses`. Pass log_file=None to skip the file.
+    Calling this again replaces the previous configuration.
+    """
+    global _listener
+    stop_logging()
+
+    level = logging.DEBUG if verbose else logging.INFO
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    handlers = []
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setLevel(logging.WARNING if quiet else level)
+    stream_handler.setFormatter(formatter)
+    handlers.append(stream_handler)
+
+    if log_file:
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        file_handler.namer = _gzip_namer
+        file_handler.rotator = _gzip_rotator
+        file_handler.setLevel(level)
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+
+    # Don't pay for building huge raw-response records nobody will read.
+    logging.getLogger(RAW_RESPONSE_LOGGER).setLevel(
+        logging.INFO if raw_responses else logging.CRITICAL + 1
+    )
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+
+
+def stop_logging():
+    """
+    Flush queued records and stop the background writer, if running.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
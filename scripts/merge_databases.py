@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Merge question databases into one target.
+
+Each source (e.g. backend/dbs/*.db) is ATTACHed to the target and copied
+with set-based INSERT ... SELECT statements, so rows never round-trip
+through Python. Categories are matched by name, question ids are remapped
+past the target's current ids, and questions whose fingerprint (see
+question_db.question_fingerprint) already exists in the target or earlier
+in the same source are skipped along with their answers. Merged questions
+are added to the target's full-text index (see search_index) if it has one.
+"""
+
+import argparse
+import logging
+import os
+import time
+
+from question_db import (
+    DEFAULT_DB_PATH,
+    connect,
+    ensure_categories,
+    load_category_ids,
+    next_question_id,
+    question_fingerprint,
+)
+from search_index import has_search_index, index_questions_from
+
+logger = logging.getLogger(__name__)
+
+SOURCE_ALIAS = "merge_source"
+
+
+# Separates answer texts in group_concat; question_fingerprint uses the same
+# unit separator between answers, so it can't appear inside one either.
+_ANSWER_SEPARATOR = "\x1f"
+
+
+def _merge_fingerprint(question, answers):
+    # One call per question rather than a Python aggregate step per answer.
+    return question_fingerprint(question, answers.split(_ANSWER_SEPARATOR) if answers else [])
+
+
+def _has_column(conn, schema, table, column):
+    return any(
+        row[1] == column for row in conn.execute(f"PRAGMA {schema}.table_info({table})")
+    )
+
+
+def merge_database(conn, source_path, category_ids=None):
+    """
+    Copy every question and answer from the database at `source_path` into
+    `conn` in one transaction, skipping duplicates.
+
+    Returns a dict with the questions read, added and skipped and the
+    answers added.
+    """
+    if category_ids is None:
+        category_ids = load_category_ids(conn)
+
+    conn.execute(f"ATTACH DATABASE ? AS {SOURCE_ALIAS}", (source_path,))
+    try:
+        # Sources in the current format carry fingerprints already.
+        if _has_column(conn, SOURCE_ALIAS, "questions", "fingerprint"):
+            fingerprint_sql = "COALESCE(q.fingerprint, merge_fingerprint(q.text, {answers}))"
+        else:
+            fingerprint_sql = "merge_fingerprint(q.text, {answers})"
+        fingerprint_sql = fingerprint_sql.format(answers="group_concat(a.text, char(31))")
+
+        known_categories = dict(category_ids)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            names = [
+                name
+                for (name,) in conn.execute(f"SELECT name FROM {SOURCE_ALIAS}.categories")
+            ]
+            ensure_categories(conn, names, category_ids)
+
+            conn.execute(
+                """
+                CREATE TEMP TABLE merge_questions (
+                    old_id INTEGER PRIMARY KEY,
+                    new_id INTEGER,
+                    text TEXT NOT NULL,
+                    category_id INTEGER NOT NULL,
+                    difficulty TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                f"""
+                INSERT INTO temp.merge_questions
+                    (old_id, text, category_id, difficulty, fingerprint)
+                SELECT q.id, q.text, tc.id, q.difficulty, {fingerprint_sql}
+                FROM {SOURCE_ALIAS}.questions q
+                JOIN {SOURCE_ALIAS}.categories sc ON sc.id = q.category_id
+                JOIN main.categories tc ON tc.name = sc.name
+                LEFT JOIN {SOURCE_ALIAS}.answers a ON a.question_id = q.id
+                GROUP BY q.id
+                """
+            )
+            (read,) = conn.execute("SELECT COUNT(*) FROM temp.merge_questions").fetchone()
+
+            # Drop questions already in the target, then repeats within the
+            # source (keeping the oldest copy).
+            conn.execute(
+                """
+                DELETE FROM temp.merge_questions
+                WHERE fingerprint IN (
+                    SELECT fingerprint FROM main.questions WHERE fingerprint IS NOT NULL
+                )
+                OR old_id NOT IN (
+                    SELECT MIN(old_id) FROM temp.merge_questions GROUP BY fingerprint
+                )
+                """
+            )
+            first_id = next_question_id(conn)
+            conn.execute(
+                """
+                UPDATE temp.merge_questions SET new_id = ? + ranked.position
+                FROM (
+                    SELECT old_id, ROW_NUMBER() OVER (ORDER BY old_id) - 1 AS position
+                    FROM temp.merge_questions
+                ) AS ranked
+                WHERE ranked.old_id = merge_questions.old_id
+                """,
+                (first_id,),
+            )
+
+            added = conn.execute(
+                """
+                INSERT INTO main.questions (id, text, category_id, difficulty, fingerprint)
+                SELECT new_id, text, category_id, difficulty, fingerprint
+                FROM temp.merge_questions
+                ORDER BY new_id
+                """
+            ).rowcount
+            answers = conn.execute(
+                f"""
+                INSERT INTO main.answers (question_id, text, is_correct)
+                SELECT m.new_id, a.text, a.is_correct
+                FROM {SOURCE_ALIAS}.answers a
+                JOIN temp.merge_questions m ON m.old_id = a.question_id
+                ORDER BY a.question_id, a.id
+                """
+            ).rowcount
+            if has_search_index(conn):
+                index_questions_from(conn, first_id)
+            conn.execute("DROP TABLE temp.merge_questions")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            category_ids.clear()
+            category_ids.update(known_categories)
+            conn.execute("DROP TABLE IF EXISTS temp.merge_questions")
+            raise
+    finally:
+        conn.execute(f"DETACH DATABASE {SOURCE_ALIAS}")
+
+    return {
+        "source": source_path,
+        "questions_read": read,
+        "questions_added": added,
+        "duplicates_skipped": read - added,
+        "answers_added": answers,
+    }
+
+
+def merge_databases(target_path, source_paths):
+    """
+    Merge every database in `source_paths` into `target_path` (created if
+    missing). A source that is the target itself is skipped.
+
+    Returns one merge_database result dict per merged source.
+    """
+    conn = connect(target_path)
+    conn.create_function("merge_fingerprint", 2, _merge_fingerprint, deterministic=True)
+    category_ids = load_category_ids(conn)
+    target = os.path.realpath(target_path)
+
+    results = []
+    try:
+        for source_path in source_paths:
+            if os.path.realpath(source_path) == target:
+                logger.warning("Skipping %s: it is the merge target", source_path)
+                continue
+            started = time.perf_counter()
+            result = merge_database(conn, source_path, category_ids)
+            result["seconds"] = time.perf_counter() - started
+            results.append(result)
+    finally:
+        conn.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("sources", nargs="+", help="databases to merge from")
+    parser.add_argument(
+        "-o",
+        "--into",
+        default=DEFAULT_DB_PATH,
+        help=f"target database, created if missing (default: {DEFAULT_DB_PATH})",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s - %(message)s")
+
+    for source_path in args.sources:
+        if not os.path.exists(source_path):
+            parser.error(f"no such database: {source_path}")
+
+    started = time.perf_counter()
+    results = merge_databases(args.into, args.sources)
+    elapsed = time.perf_counter() - started
+
+    for result in results:
+        print(
+            f"{result['source']}: {result['questions_added']}/{result['questions_read']} "
+            f"questions added ({result['duplicates_skipped']} duplicates), "
+            f"{result['answers_added']} answers in {result['seconds']:.2f}s"
+        )
+    answers = sum(result["answers_added"] for result in results)
+    print(
+        f"Merged {sum(result['questions_added'] for result in results)} questions and "
+        f"{answers} answers into {args.into} in {elapsed:.2f}s "
+        f"({answers / (elapsed or 1e-9):.0f} answer rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Structured metrics for generation runs: counters, gauges and latency
+histograms with labels, exportable as JSON lines and as a Prometheus
+textfile (for node_exporter's textfile collector).
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds in seconds; covers a cache hit (ms) up to a slow thinking
+# request (minutes).
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300,
+)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50)
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class Metrics:
+    """
+    Thread-safe registry of labelled counters, gauges and histograms.
+
+    Names follow Prometheus conventions (snake_case, _total for counters,
+    unit suffixes such as _seconds and _bytes).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._histogram_buckets = {}
+        self._help = {}
+
+    def describe(self, name, help_text, buckets=None):
+        """
+        Attach help text to a metric and, for histograms, its bucket bounds.
+        """
+        with self._lock:
+            self._help[name] = help_text
+            if buckets is not None:
+                self._histogram_buckets[name] = tuple(buckets)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = value
+
+    def observe(self, name, value, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                buckets = self._histogram_buckets.get(name, DEFAULT_BUCKETS)
+                histogram = self._histograms[key] = _Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """
+        Observe the wall-clock duration of the with-block in seconds.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def counter_value(self, name, **labels):
+        with self._lock:
+            return self._counters.get((name, _label_key(labels)), 0)
+
+    def snapshot(self):
+        """
+        Return every series as a list of plain dicts.
+        """
+        with self._lock:
+            series = []
+            for (name, labels), value in sorted(self._counters.items()):
+                series.append(
+                    {"type": "counter", "name": name, "labels": dict(labels), "value": value}
+                )
+            for (name, labels), value in sorted(self._gauges.items()):
+                series.append(
+                    {"type": "gauge", "name": name, "labels": dict(labels), "value": value}
+                )
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                series.append(
+                    {
+                        "type": "histogram",
+                        "name": name,
+                        "labels": dict(labels),
+                        "count": histogram.count,
+                        "sum": histogram.sum,
+                        "buckets": dict(zip(histogram.buckets, histogram.counts)),
+                    }
+                )
+            return series
+
+    def write_jsonl(self, path, **run_labels):
+        """
+        Append one JSON line per series to path, tagged with run_labels and a
+        timestamp so several runs can share one file.
+        """
+        timestamp = time.time()
+        with open(path, "a", encoding="utf-8") as f:
+            for series in self.snapshot():
+                f.write(json.dumps({"timestamp": timestamp, **run_labels, **series}))
+                f.write("\n")
+
+    def write_prometheus(self, path):
+        """
+        Atomically write all series in the Prometheus text exposition format.
+        """
+        lines = []
+        declared = set()
+        for series in self.snapshot():
+            name = series["name"]
+            if name not in declared:
+                declared.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {series['type']}")
+
+            labels = series["labels"]
+            if series["type"] != "histogram":
+                lines.append(f"{name}{_format_labels(labels)} {series['value']}")
+                continue
+
+            cumulative = 0
+            for bound, count in series["buckets"].items():
+                cumulative += count
+                lines.append(
+                    f"{name}_bucket{_format_labels(labels, le=_format_bound(bound))} {cumulative}"
+                )
+            lines.append(f"{name}_bucket{_format_labels(labels, le='+Inf')} {series['count']}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {series['sum']}")
+            lines.append(f"{name}_count{_format_labels(labels)} {series['count']}")
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+
+def _format_bound(bound):
+    return repr(float(bound))
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels, **extra):
+    labels = {**labels, **extra}
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def describe_generation_metrics(metrics):
+    """
+    Register help text and buckets for the metrics the generation scripts emit.
+    """
+    metrics.describe("gemini_requests_total", "Gemini requests by outcome")
+    metrics.describe("gemini_request_seconds", "Gemini request latency")
+    metrics.describe("gemini_response_bytes_total", "Bytes of response text received")
+    metrics.describe("gemini_parse_seconds", "Time spent parsing response JSON")
+    metrics.describe(
+        "gemini_questions_per_response",
+        "Questions contained in each parsed response",
+        buckets=COUNT_BUCKETS,
+    )
+    metrics.describe("gemini_failures_total", "Failed generations by reason")
+    metrics.describe("db_write_seconds", "Time spent writing one response to SQLite")
+    metrics.describe("questions_added_total", "Questions inserted into the database")
+    metrics.describe("questions_skipped_total", "Questions skipped at ingest by reason")
+    metrics.describe("batch_jobs_total", "Batch jobs by outcome")
+    metrics.describe("batch_elapsed_seconds", "Wall-clock duration of the batch run")
+    metrics.describe("batch_pack_size", "Current number of jobs packed per request")
+    metrics.describe("gemini_retries_total", "Requests retried after a retryable error")
+    metrics.describe(
+        "gemini_rate_limit_wait_seconds", "Total time workers waited for rate limit budget"
+    )
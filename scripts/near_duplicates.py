@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate question detection with MinHash signatures and LSH banding.
+
+A question is reduced to a feature set: word unigrams and bigrams of its
+normalized topic text plus each normalized answer text. The Jaccard
+similarity of two feature sets is estimated from MinHash signatures, and an
+LSH index (signatures split into bands, one hash bucket per band) only
+compares questions that share at least one bucket, so finding candidates
+stays sub-quadratic as the corpus grows.
+
+Signatures are cached in the question_minhash table so incremental checks
+during ingest don't have to rehash the whole corpus on every run.
+"""
+
+import hashlib
+import random
+from array import array
+
+from question_db import normalize_text
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DEFAULT_THRESHOLD = 0.6
+
+_MERSENNE = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(0x5BD1E995)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE))
+    for _ in range(NUM_PERM)
+]
+
+MINHASH_SCHEMA = """
+CREATE TABLE IF NOT EXISTS question_minhash (
+    question_id INTEGER PRIMARY KEY,
+    signature BLOB NOT NULL,
+    FOREIGN KEY (question_id) REFERENCES questions (id)
+);
+"""
+
+
+def question_features(question_text, answer_texts):
+    """
+    Return the feature set MinHash signatures are computed over.
+    """
+    words = normalize_text(question_text).split()
+    features = {f"q:{word}" for word in words}
+    features.update(f"q:{a} {b}" for a, b in zip(words, words[1:]))
+    features.update(f"a:{normalize_text(text)}" for text in answer_texts)
+    return features
+
+
+def _feature_hash(feature):
+    return int.from_bytes(
+        hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def minhash(features):
+    """
+    Return the MinHash signature (an array of NUM_PERM ints) of a feature set.
+    """
+    if not features:
+        return array("Q", [_MAX_HASH] * NUM_PERM)
+    hashes = [_feature_hash(feature) for feature in features]
+    return array(
+        "Q",
+        [
+            min(((a * h + b) % _MERSENNE) & _MAX_HASH for h in hashes)
+            for a, b in _PERMUTATIONS
+        ],
+    )
+
+
+def estimate_similarity(sig_a, sig_b):
+    """
+    Estimate the Jaccard similarity of two feature sets from their signatures.
+    """
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def _band_keys(signature):
+    for band in range(BANDS):
+        start = band * ROWS
+        yield band, hash(tuple(signature[start : start + ROWS]))
+
+
+class LSHIndex:
+    """
+    Banded LSH index over MinHash signatures.
+
+    Two questions with Jaccard similarity s collide in at least one band
+    with probability 1 - (1 - s^ROWS)^BANDS; with 16 bands of 4 rows that is
+    ~64% at s=0.5 and >99% at s=0.75. Candidates are then confirmed by
+    comparing full signatures against the threshold.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.signatures = {}
+        self._buckets = [{} for _ in range(BANDS)]
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def add(self, key, signature):
+        self.signatures[key] = signature
+        for band, bucket_key in _band_keys(signature):
+            self._buckets[band].setdefault(bucket_key, []).append(key)
+
+    def candidates(self, signature):
+        found = set()
+        for band, bucket_key in _band_keys(signature):
+            found.update(self._buckets[band].get(bucket_key, ()))
+        return found
+
+    def query(self, signature):
+        """
+        Return [(key, estimated similarity), ...] at or above the threshold,
+        most similar first.
+        """
+        matches = []
+        for key in self.candidates(signature):
+            similarity = estimate_similarity(signature, self.signatures[key])
+            if similarity >= self.threshold:
+                matches.append((key, similarity))
+        matches.sort(key=lambda match: -match[1])
+        return matches
+
+
+def create_minhash_table(conn):
+    conn.executescript(MINHASH_SCHEMA)
+
+
+def load_signatures(conn):
+    """
+    Return {question_id: signature} for every question, computing and
+    caching signatures that aren't stored yet.
+    """
+    create_minhash_table(conn)
+
+    signatures = {}
+    for question_id, blob in conn.execute(
+        "SELECT question_id, signature FROM question_minhash"
+    ):
+        signature = array("Q")
+        signature.frombytes(blob)
+        if len(signature) == NUM_PERM:
+            signatures[question_id] = signature
+
+    questions = dict(conn.execute("SELECT id, text FROM questions"))
+    stale = [(question_id,) for question_id in signatures if question_id not in questions]
+    if stale:
+        conn.executemany("DELETE FROM question_minhash WHERE question_id = ?", stale)
+        conn.commit()
+        for (question_id,) in stale:
+            del signatures[question_id]
+
+    missing = {
+        question_id: text
+        for question_id, text in questions.items()
+        if question_id not in signatures
+    }
+    if missing:
+        answers = {}
+        for question_id, text in conn.execute(
+            "SELECT question_id, text FROM answers ORDER BY question_id"
+        ):
+            if question_id in missing:
+                answers.setdefault(question_id, []).append(text)
+
+        new_rows = []
+        for question_id, text in missing.items():
+            signature = minhash(question_features(text, answers.get(question_id, ())))
+            signatures[question_id] = signature
+            new_rows.append((question_id, signature.tobytes()))
+        store_signatures(conn, new_rows)
+
+    return signatures
+
+
+def store_signatures(conn, rows):
+    """
+    Cache (question_id, signature bytes) rows in question_minhash.
+    """
+    conn.executemany(
+        "INSERT OR REPLACE INTO question_minhash (question_id, signature) VALUES (?, ?)",
+        rows,
+    )
+    conn.commit()
+
+
+def build_index(conn, threshold=DEFAULT_THRESHOLD):
+    """
+    Return an LSHIndex of every question in the database, keyed by id.
+    """
+    index = LSHIndex(threshold)
+    for question_id, signature in load_signatures(conn).items():
+        index.add(question_id, signature)
+    return index
+
+
+def find_near_duplicates(conn, threshold=DEFAULT_THRESHOLD):
+    """
+    Scan the database for near-duplicate pairs.
+
+    Returns [(earlier id, later id, estimated similarity), ...] sorted by
+    decreasing similarity. Exact duplicates show up with similarity 1.0.
+    """
+    index = LSHIndex(threshold)
+    pairs = []
+    for question_id, signature in sorted(load_signatures(conn).items()):
+        for other_id, similarity in index.query(signature):
+            pairs.append((other_id, question_id, similarity))
+        index.add(question_id, signature)
+    pairs.sort(key=lambda pair: (-pair[2], pair[0], pair[1]))
+    return pairs
+
+
+def _question_signature(question_data):
+    return minhash(
+        question_features(
+            question_data["question"],
+            (option["text"] for option in question_data["options"] if "text" in option),
+        )
+    )
+
+
+class NearDuplicateFilter:
+    """
+    Incremental near-duplicate check used by question_db.insert_questions.
+
+    Holds an LSH index of the existing corpus. Accepted questions are staged
+    in a pending index that check() also consults, so near-duplicates within
+    one batch are caught too. save() moves them into the corpus index and
+    caches their signatures once the batch is committed; discard() drops
+    them if it is rolled back.
+    """
+
+    def __init__(self, conn, threshold=DEFAULT_THRESHOLD):
+        self.index = build_index(conn, threshold)
+        self._pending = LSHIndex(threshold)
+
+    def check(self, question_data):
+        """
+        Return (match, signature) where match is the (id, similarity) of the
+        closest indexed or pending question at or above the threshold, or
+        None.
+        """
+        signature = _question_signature(question_data)
+        matches = self.index.query(signature) + self._pending.query(signature)
+        return max(matches, key=lambda match: match[1], default=None), signature
+
+    def add(self, question_id, signature):
+        self._pending.add(question_id, signature)
+
+    def save(self, conn):
+        pending, self._pending = self._pending, LSHIndex(self.index.threshold)
+        rows = []
+        for question_id, signature in pending.signatures.items():
+            self.index.add(question_id, signature)
+            rows.append((question_id, signature.tobytes()))
+        store_signatures(conn, rows)
+
+    def discard(self):
+        self._pending = LSHIndex(self.index.threshold)
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Build resized, compressed variants of the frontend's image assets.
+
+Avatars are cropped square at 64/128/256 px and backgrounds fitted to
+common viewport widths (never upscaled). Every variant is written as WebP
+and as an optimized PNG under frontend/public/optimized/<group>/, and
+manifest.json there maps each source file name to its variants. Sources whose
+content hash (and the pipeline settings) match the manifest are skipped,
+and images are processed on a process pool.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from PIL import Image, ImageOps
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PUBLIC_DIR = os.path.join(REPO_ROOT, "frontend", "public")
+DEFAULT_OUT_DIR = os.path.join(PUBLIC_DIR, "optimized")
+MANIFEST_FILE = "manifest.json"
+
+WEBP_QUALITY = 80
+
+# mode "square" crops to a centred square; "fit" keeps the aspect ratio
+# and scales to the given width.
+PROFILES = {
+    "avatar": {"mode": "square", "sizes": (64, 128, 256)},
+    "background": {"mode": "fit", "sizes": (640, 1280, 1920)},
+}
+DEFAULT_GROUPS = {
+    "avatars": (os.path.join(PUBLIC_DIR, "avatars"), "avatar"),
+    "background": (os.path.join(PUBLIC_DIR, "background"), "background"),
+}
+SOURCE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def settings_digest(profile):
+    """
+    Fingerprint the settings that shape a profile's output, so changing
+    them re-processes every source.
+    """
+    settings = {"profile": profile, "webp_quality": WEBP_QUALITY}
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _resized(image, mode, size):
+    if mode == "square":
+        return ImageOps.fit(image, (size, size), Image.LANCZOS)
+    height = round(image.height * size / image.width)
+    return image.resize((size, height), Image.LANCZOS)
+
+
+def _target_sizes(image, profile):
+    sizes = profile["sizes"]
+    limit = min(image.size) if profile["mode"] == "square" else image.width
+    kept = [size for size in sizes if size <= limit]
+    # Small sources still get one variant at their own size.
+    return kept or [limit]
+
+
+def variant_stem(name):
+    """
+    Return the prefix of the variants of source file `name`. The source
+    extension is kept ("1.png" becomes "1-png") so that "1.png" and "1.jpg"
+    don't overwrite each other's variants.
+    """
+    stem, extension = os.path.splitext(name)
+    return f"{stem}-{extension[1:]}"
+
+
+def process_image(group, name, source_path, out_dir, profile):
+    """
+    Write every variant of source file `name`. Runs in a worker process.
+
+    Returns the list of variant dicts for the manifest.
+    """
+    group_dir = os.path.join(out_dir, group)
+    os.makedirs(group_dir, exist_ok=True)
+
+    variants = []
+    with Image.open(source_path) as image:
+        image.load()
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        for size in _target_sizes(image, profile):
+            resized = _resized(image, profile["mode"], size)
+            for fmt, extension, options in (
+                ("WEBP", "webp", {"quality": WEBP_QUALITY, "method": 6}),
+                ("PNG", "png", {"optimize": True}),
+            ):
+                filename = f"{variant_stem(name)}-{size}.{extension}"
+                path = os.path.join(group_dir, filename)
+                tmp_path = f"{path}.tmp"
+                resized.save(tmp_path, fmt, **options)
+                os.replace(tmp_path, path)
+                variants.append(
+                    {
+                        "width": resized.width,
+                        "height": resized.height,
+                        "format": extension,
+                        "path": f"{group}/{filename}",
+                        "bytes": os.path.getsize(path),
+                    }
+                )
+    return variants
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def write_manifest(out_dir, manifest):
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(f"{path}.tmp", path)
+
+
+def _sources(source_dir):
+    if not os.path.isdir(source_dir):
+        return []
+    return sorted(
+        entry.path
+        for entry in os.scandir(source_dir)
+        if entry.is_file() and entry.name.lower().endswith(SOURCE_EXTENSIONS)
+    )
+
+
+def _variants_exist(out_dir, entry):
+    return all(os.path.exists(os.path.join(out_dir, v["path"])) for v in entry["variants"])
+
+
+def optimize_assets(
+    groups=DEFAULT_GROUPS, out_dir=DEFAULT_OUT_DIR, workers=None, force=False
+):
+    """
+    Bring the optimized variants of every group up to date.
+
+    `groups` maps a group name to (source directory, profile name). Returns
+    a summary dict with the number of sources processed, skipped and removed
+    and the source and output byte totals.
+    """
+    manifest = load_manifest(out_dir)
+    summary = {
+        "processed": 0,
+        "skipped": 0,
+        "removed": 0,
+        "source_bytes": 0,
+        "output_bytes": 0,
+    }
+
+    tasks = []
+    for group, (source_dir, profile_name) in groups.items():
+        profile = PROFILES[profile_name]
+        settings = settings_digest(profile)
+        entries = manifest.setdefault(group, {})
+        seen = set()
+        for source_path in _sources(source_dir):
+            name = os.path.basename(source_path)
+            seen.add(name)
+            digest = file_digest(source_path)
+            summary["source_bytes"] += os.path.getsize(source_path)
+            entry = entries.get(name)
+            if (
+                not force
+                and entry is not None
+                and entry["sha256"] == digest
+                and entry["settings"] == settings
+                and _variants_exist(out_dir, entry)
+            ):
+                summary["skipped"] += 1
+                continue
+            entries[name] = {
+                "source": os.path.relpath(source_path, REPO_ROOT),
+                "sha256": digest,
+                "settings": settings,
+                "variants": [],
+            }
+            tasks.append((group, name, source_path, profile))
+
+        # Drop variants of sources that no longer exist.
+        for name in set(entries) - seen:
+            for variant in entries.pop(name)["variants"]:
+                try:
+                    os.remove(os.path.join(out_dir, variant["path"]))
+                except FileNotFoundError:
+                    pass
+            summary["removed"] += 1
+
+    if tasks:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for group, name, path, profile in tasks:
+                future = executor.submit(process_image, group, name, path, out_dir, profile)
+                futures[future] = (group, name)
+            for done, future in enumerate(as_completed(futures), start=1):
+                group, name = futures[future]
+                manifest[group][name]["variants"] = future.result()
+                summary["processed"] += 1
+                print(f"[{done}/{len(futures)}] {group}/{name}")
+
+    for entries in manifest.values():
+        for entry in entries.values():
+            summary["output_bytes"] += sum(variant["bytes"] for variant in entry["variants"])
+    write_manifest(out_dir, manifest)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "-o",
+        "--out-dir",
+        default=DEFAULT_OUT_DIR,
+        help="output directory for variants and manifest.json "
+        "(default: frontend/public/optimized)",
+    )
+    parser.add_argument(
+        "--generated",
+        metavar="DIR",
+        help="also optimize images from generate_image.py in DIR as the "
+        "'generated' group, using the avatar sizes",
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, help="worker processes (default: one per CPU)"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="re-process sources even if unchanged"
+    )
+    args = parser.parse_args()
+
+    groups = dict(DEFAULT_GROUPS)
+    if args.generated:
+        groups["generated"] = (args.generated, "avatar")
+
+    started = time.perf_counter()
+    summary = optimize_assets(groups, args.out_dir, workers=args.workers, force=args.force)
+    print(
+        f"{summary['processed']} processed, {summary['skipped']} unchanged, "
+        f"{summary['removed']} removed in {time.perf_counter() - started:.1f}s"
+    )
+    print(
+        f"Sources: {summary['source_bytes'] / 1024 / 1024:.1f} MB, "
+        f"all variants: {summary['output_bytes'] / 1024 / 1024:.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
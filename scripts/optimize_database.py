@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Read-path maintenance for a question database.
+
+Creates the indexes the game server's queries need and rebuilds a dense,
+gap-free sampling key so a random question - optionally restricted to a
+category, a difficulty or both - is one primary-key lookup instead of an
+ORDER BY RANDOM() scan over the whole table.
+
+Sampling strata are stored in question_sample as (stratum, slot) ->
+question_id with slots numbered 0..size-1, and question_sample_counts holds
+each stratum's size. Strata are 'all', 'c:<category_id>', 'd:<difficulty>'
+and 'cd:<category_id>:<difficulty>'.
+
+Once built, the strata are kept current by triggers on questions, whoever
+writes to it (insert_questions, bulk_import, merge_databases, the server):
+a new question is appended to the end of each of its strata, a deleted
+one's slot is filled with the stratum's last question so slots stay dense,
+and a question whose category or difficulty changes is removed and appended
+again. Rebuilding is a handful of set-based statements and only needed to
+create the triggers on a database sampled before they existed.
+"""
+
+import argparse
+import logging
+import random
+import time
+
+from question_db import DEFAULT_DB_PATH, connect
+
+logger = logging.getLogger(__name__)
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_answers_question_id ON answers (question_id);
+CREATE INDEX IF NOT EXISTS idx_questions_category_difficulty
+    ON questions (category_id, difficulty);
+"""
+
+SAMPLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS question_sample (
+    stratum TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    question_id INTEGER NOT NULL,
+    PRIMARY KEY (stratum, slot)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS question_sample_counts (
+    stratum TEXT PRIMARY KEY,
+    size INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+# (stratum expression, partition columns) for each kind of stratum; {row}
+# is the table prefix ("" or a trigger's "new."/"old.").
+_STRATA = (
+    ("'all'", "1"),
+    ("'c:' || {row}category_id", "category_id"),
+    ("'d:' || {row}difficulty", "difficulty"),
+    ("'cd:' || {row}category_id || ':' || {row}difficulty", "category_id, difficulty"),
+)
+
+
+def _row_strata(row):
+    # SELECT of the names of every stratum the `row` question belongs to.
+    return " UNION ALL ".join(
+        f"SELECT {stratum.format(row=row)} AS stratum" for stratum, _ in _STRATA
+    )
+
+
+def _append_to_strata(row):
+    # Trigger statements that append the `row` question to its strata.
+    return f"""
+    INSERT INTO question_sample (stratum, slot, question_id)
+    SELECT s.stratum,
+           COALESCE((SELECT size FROM question_sample_counts c WHERE c.stratum = s.stratum), 0),
+           {row}id
+    FROM ({_row_strata(row)}) s;
+    -- WHERE 1 keeps ON CONFLICT from parsing as a join constraint.
+    INSERT INTO question_sample_counts (stratum, size)
+    SELECT stratum, 1 FROM ({_row_strata(row)}) WHERE 1
+    ON CONFLICT (stratum) DO UPDATE SET size = size + 1;
+"""
+
+
+def _remove_from_strata(row):
+    # Trigger statements that take the `row` question out of its strata.
+    return f"""
+    UPDATE question_sample_counts SET size = size - 1
+    WHERE stratum IN ({_row_strata(row)})
+      AND EXISTS (
+        SELECT 1 FROM question_sample s
+        WHERE s.stratum = question_sample_counts.stratum AND s.question_id = {row}id
+      );
+    -- Move each stratum's last question into the removed one's slot...
+    UPDATE question_sample SET question_id = (
+        SELECT last.question_id
+        FROM question_sample last
+        JOIN question_sample_counts c ON c.stratum = last.stratum
+        WHERE last.stratum = question_sample.stratum AND last.slot = c.size
+    )
+    WHERE question_id = {row}id;
+    -- ...and drop the now duplicated last slot.
+    DELETE FROM question_sample
+    WHERE (stratum, slot) IN (
+        SELECT stratum, size FROM question_sample_counts
+        WHERE stratum IN ({_row_strata(row)})
+    );
+"""
+
+
+SAMPLE_TRIGGERS = f"""
+CREATE INDEX IF NOT EXISTS idx_question_sample_question_id
+    ON question_sample (question_id);
+
+CREATE TRIGGER IF NOT EXISTS question_sample_insert AFTER INSERT ON questions BEGIN
+{_append_to_strata("new.")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS question_sample_delete AFTER DELETE ON questions BEGIN
+{_remove_from_strata("old.")}
+END;
+
+-- A question moved to another category or difficulty changes strata.
+CREATE TRIGGER IF NOT EXISTS question_sample_update
+AFTER UPDATE OF category_id, difficulty ON questions
+WHEN old.category_id IS NOT new.category_id OR old.difficulty IS NOT new.difficulty
+BEGIN
+{_remove_from_strata("old.")}
+{_append_to_strata("new.")}
+END;
+"""
+
+
+def create_read_indexes(conn):
+    """
+    Create the answers/questions indexes used by question lookups.
+    """
+    conn.executescript(INDEXES)
+
+
+def rebuild_sample_keys(conn):
+    """
+    Rebuild question_sample and question_sample_counts from scratch, and
+    create the triggers that keep them current.
+
+    Returns the number of questions in the 'all' stratum.
+    """
+    conn.executescript(SAMPLE_SCHEMA)
+    conn.executescript(SAMPLE_TRIGGERS)
+    with conn:
+        conn.execute("DELETE FROM question_sample")
+        conn.execute("DELETE FROM question_sample_counts")
+        for stratum, partition in _STRATA:
+            conn.execute(
+                f"""
+                INSERT INTO question_sample (stratum, slot, question_id)
+                SELECT {stratum.format(row="")},
+                       ROW_NUMBER() OVER (PARTITION BY {partition} ORDER BY id) - 1,
+                       id
+                FROM questions
+                """
+            )
+        conn.execute(
+            """
+            INSERT INTO question_sample_counts (stratum, size)
+            SELECT stratum, COUNT(*) FROM question_sample GROUP BY stratum
+            """
+        )
+    row = conn.execute(
+        "SELECT size FROM question_sample_counts WHERE stratum = 'all'"
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def has_sample_keys(conn):
+    """
+    Return True if rebuild_sample_keys has been run on this database.
+    """
+    row = conn.execute(
+        """
+        SELECT 1 FROM sqlite_master
+        WHERE type = 'table' AND name = 'question_sample_counts'
+        """
+    ).fetchone()
+    return row is not None
+
+
+def sample_stratum(category_id=None, difficulty=None):
+    """
+    Return the stratum name for an optional category id and difficulty.
+    """
+    if category_id is not None and difficulty is not None:
+        return f"cd:{category_id}:{difficulty}"
+    if category_id is not None:
+        return f"c:{category_id}"
+    if difficulty is not None:
+        return f"d:{difficulty}"
+    return "all"
+
+
+def random_question_id(conn, category_id=None, difficulty=None, rng=random):
+    """
+    Return a uniformly random question id from the requested stratum, or None
+    if it is empty. Requires rebuild_sample_keys to have been run.
+    """
+    stratum = sample_stratum(category_id, difficulty)
+    row = conn.execute(
+        "SELECT size FROM question_sample_counts WHERE stratum = ?", (stratum,)
+    ).fetchone()
+    if not row or not row[0]:
+        return None
+    row = conn.execute(
+        "SELECT question_id FROM question_sample WHERE stratum = ? AND slot = ?",
+        (stratum, rng.randrange(row[0])),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def optimize(conn):
+    """
+    Create indexes, rebuild sampling keys and refresh planner statistics.
+    """
+    create_read_indexes(conn)
+    size = rebuild_sample_keys(conn)
+    conn.execute("ANALYZE")
+    conn.commit()
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--db",
+        default=DEFAULT_DB_PATH,
+        help=f"SQLite database path (default: {DEFAULT_DB_PATH})",
+    )
+    parser.add_argument(
+        "--check",
+        type=int,
+        default=1000,
+        metavar="N",
+        help="time N random picks after rebuilding (default: 1000, 0 to skip)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+
+    conn = connect(args.db)
+    started = time.perf_counter()
+    size = optimize(conn)
+    print(
+        f"Indexed {size} questions and rebuilt sampling keys in "
+        f"{time.perf_counter() - started:.2f}s"
+    )
+
+    if args.check and size:
+        started = time.perf_counter()
+        for _ in range(args.check):
+            random_question_id(conn)
+        elapsed = time.perf_counter() - started
+        print(f"{args.check} random picks: {elapsed * 1e6 / args.check:.1f} µs each")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
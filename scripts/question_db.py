@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+"""
+SQLite storage for generated questions.
+
+Holds the schema shared with backend/src/database.ts and a set-based ingest
+path: one transaction per batch, executemany for questions and answers, and
+an in-memory category name -> id map instead of a lookup per question.
+"""
+
+import hashlib
+import logging
+import re
+import sqlite3
+import unicodedata
+from dataclasses import dataclass
+
+from validation import (
+    QUARANTINE_SCHEMA,
+    REQUIRED_FIELDS,
+    insert_quarantine,
+    validate_questions,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = "./sport10.db"
+
+# Stored in PRAGMA user_version once create_tables has brought a database up
+# to date; bump it whenever create_tables gains a migration.
+SCHEMA_VERSION = 1
+
+# Large IN (...) lists are split to stay under SQLite's variable limit.
+_IN_CHUNK = 500
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    text TEXT NOT NULL,
+    category_id INTEGER NOT NULL,
+    difficulty TEXT NOT NULL,
+    FOREIGN KEY (category_id) REFERENCES categories (id)
+);
+
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    question_id INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    is_correct BOOLEAN NOT NULL,
+    FOREIGN KEY (question_id) REFERENCES questions (id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_answers_question_id ON answers (question_id);
+CREATE INDEX IF NOT EXISTS idx_questions_category_difficulty
+    ON questions (category_id, difficulty);
+"""
+
+JOURNAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batch_jobs (
+    category TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    requested INTEGER NOT NULL,
+    added INTEGER NOT NULL,
+    completed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (category, difficulty)
+);
+"""
+
+
+@dataclass
+class IngestResult:
+    """
+    Outcome of an insert_questions call.
+    """
+
+    added: int = 0
+    duplicates: int = 0
+    near_duplicates: int = 0
+    rejected: int = 0
+
+    def merge(self, other):
+        self.added += other.added
+        self.duplicates += other.duplicates
+        self.near_duplicates += other.near_duplicates
+        self.rejected += other.rejected
+        return self
+
+
+def normalize_text(text):
+    """
+    Normalize text for duplicate detection: NFKC, casefold, punctuation
+    stripped and whitespace collapsed.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _PUNCTUATION.sub(" ", text)
+    return " ".join(text.split())
+
+
+def question_fingerprint(question_text, answer_texts):
+    """
+    Return a fingerprint of a question's normalized text and answer set.
+
+    Answers are normalized and sorted, so option order and formatting don't
+    matter; two questions match only if the topic and all answers do.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(normalize_text(question_text).encode("utf-8"))
+    for answer in sorted(normalize_text(text) for text in answer_texts):
+        digest.update(b"\x1f")
+        digest.update(answer.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _fingerprint_question(question_data):
+    return question_fingerprint(
+        question_data["question"],
+        (option["text"] for option in question_data["options"] if "text" in option),
+    )
+
+
+def schema_is_current(conn):
+    (version,) = conn.execute("PRAGMA user_version").fetchone()
+    return version >= SCHEMA_VERSION
+
+
+def create_tables(conn):
+    """
+    Create the categories/questions/answers tables if they don't exist.
+
+    Databases created before fingerprints existed get the column added and
+    back-filled once (see backfill_fingerprints). Records SCHEMA_VERSION
+    when done.
+    """
+    conn.executescript(SCHEMA + QUARANTINE_SCHEMA)
+
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(questions)")}
+    if "fingerprint" not in columns:
+        conn.execute("ALTER TABLE questions ADD COLUMN fingerprint TEXT")
+        backfill_fingerprints(conn)
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_questions_fingerprint ON questions (fingerprint)"
+    )
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.commit()
+
+
+def backfill_fingerprints(conn):
+    """
+    Compute fingerprints for questions that don't have one yet.
+
+    The oldest copy of a duplicated question keeps the fingerprint; later
+    copies stay NULL. Returns the ids of those duplicate questions.
+    """
+    taken = {
+        row[0]
+        for row in conn.execute(
+            "SELECT fingerprint FROM questions WHERE fingerprint IS NOT NULL"
+        )
+    }
+    answers = {}
+    for question_id, text in conn.execute(
+        """
+        SELECT a.question_id, a.text FROM answers a
+        JOIN questions q ON q.id = a.question_id
+        WHERE q.fingerprint IS NULL
+        """
+    ):
+        answers.setdefault(question_id, []).append(text)
+
+    updates = []
+    duplicate_ids = []
+    for question_id, text in conn.execute(
+        "SELECT id, text FROM questions WHERE fingerprint IS NULL ORDER BY id"
+    ).fetchall():
+        fingerprint = question_fingerprint(text, answers.get(question_id, ()))
+        if fingerprint in taken:
+            duplicate_ids.append(question_id)
+            continue
+        taken.add(fingerprint)
+        updates.append((fingerprint, question_id))
+
+    conn.executemany("UPDATE questions SET fingerprint = ? WHERE id = ?", updates)
+    conn.commit()
+    logger.info(
+        "Fingerprinted %d questions, %d duplicates left unfingerprinted",
+        len(updates),
+        len(duplicate_ids),
+    )
+    return duplicate_ids
+
+
+def delete_questions(conn, question_ids):
+    """
+    Delete questions and their answers by id and commit. Returns the number
+    deleted.
+    """
+    deleted = delete_question_rows(conn, question_ids)
+    conn.commit()
+    return deleted
+
+
+def delete_question_rows(conn, question_ids):
+    """
+    Delete questions and their answers by id inside the caller's
+    transaction. Returns the number deleted.
+    """
+    question_ids = list(question_ids)
+    deleted = 0
+    for start in range(0, len(question_ids), _IN_CHUNK):
+        chunk = question_ids[start : start + _IN_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        conn.execute(f"DELETE FROM answers WHERE question_id IN ({placeholders})", chunk)
+        deleted += conn.execute(
+            f"DELETE FROM questions WHERE id IN ({placeholders})", chunk
+        ).rowcount
+    return deleted
+
+
+def existing_fingerprints(conn, fingerprints):
+    """
+    Return the subset of `fingerprints` already present in the questions table.
+    """
+    fingerprints = list(fingerprints)
+    found = set()
+    for start in range(0, len(fingerprints), _IN_CHUNK):
+        chunk = fingerprints[start : start + _IN_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        found.update(
+            row[0]
+            for row in conn.execute(
+                f"SELECT fingerprint FROM questions WHERE fingerprint IN ({placeholders})",
+                chunk,
+            )
+        )
+    return found
+
+
+def connect(db_path=DEFAULT_DB_PATH):
+    """
+    Open the database and make sure the schema exists.
+
+    The schema is only created or migrated if PRAGMA user_version shows it
+    is older than SCHEMA_VERSION, so opening an up-to-date database writes
+    nothing. Callers ingesting several batches should keep the returned
+    connection open and reuse it rather than reconnecting per batch.
+    """
+    logger.debug("Connecting to database: %s", db_path)
+    conn = sqlite3.connect(db_path)
+    if not schema_is_current(conn):
+        create_tables(conn)
+    return conn
+
+
+def load_category_ids(conn):
+    """
+    Return a {category name: id} map of every category in the database.
+    """
+    return dict(conn.execute("SELECT name, id FROM categories"))
+
+
+def next_question_id(conn):
+    """
+    Return the id the next inserted question should get, for callers that
+    assign ids up front. AUTOINCREMENT never reuses ids, so this stays above
+    both the highest row and the highest id ever handed out.
+    """
+    (max_id,) = conn.execute("SELECT COALESCE(MAX(id), 0) FROM questions").fetchone()
+    row = conn.execute(
+        "SELECT seq FROM sqlite_sequence WHERE name = 'questions'"
+    ).fetchone()
+    return max(max_id, row[0] if row else 0) + 1
+
+
+def ensure_categories(conn, names, category_ids):
+    """
+    Insert the categories in `names` that aren't in `category_ids` yet and
+    add their ids to it, inside the caller's transaction. If that
+    transaction rolls back, the caller must restore `category_ids` too.
+    """
+    missing = sorted(set(names) - category_ids.keys())
+    if not missing:
+        return
+    conn.executemany(
+        "INSERT OR IGNORE INTO categories (name) VALUES (?)",
+        [(name,) for name in missing],
+    )
+    category_ids.update(load_category_ids(conn))
+
+    # Keep the category tree current once taxonomy.py has built one.
+    from taxonomy import add_to_taxonomy, has_taxonomy
+
+    if has_taxonomy(conn):
+        add_to_taxonomy(conn, missing, category_ids)
+
+
+def _index_for_search(conn, question_rows, answer_rows):
+    # Keep the full-text index current once search_index.py has built one.
+    from search_index import add_to_search_index, has_search_index
+
+    if not question_rows or not has_search_index(conn):
+        return
+    answers = {}
+    for question_id, text, _ in answer_rows:
+        answers.setdefault(question_id, []).append(text)
+    add_to_search_index(
+        conn, [(row[0], row[1], answers.get(row[0], [])) for row in question_rows]
+    )
+
+
+def insert_questions(
+    conn, questions_data, category_ids=None, job=None, near_filter=None
+):
+    """
+    Insert a batch of questions and their answers in a single transaction.
+
+    Question ids are assigned up front so answers can be written with one
+    executemany. Pass the same `category_ids` dict (see load_category_ids)
+    across calls to skip re-reading the categories table; new categories
+    are added to it, and taken out again if the transaction rolls back.
+
+    Questions that fail validation.validate_question are not inserted but
+    written to the quarantine table with their reasons, in the same
+    transaction, and counted as rejected.
+
+    Each question is fingerprinted (see question_fingerprint); questions that
+    already exist, or repeat earlier ones in the same batch, are skipped and
+    counted as duplicates. With a near_duplicates.NearDuplicateFilter,
+    questions too similar to an existing one are skipped as well.
+
+    Once search_index.py has built a full-text index, inserted questions are
+    added to it in the same transaction.
+
+    If `job` is a (category, difficulty, count) tuple it is recorded in the
+    batch_jobs journal in the same transaction, so a job is marked complete
+    exactly when its questions are committed.
+
+    Returns an IngestResult.
+    """
+    if category_ids is None:
+        category_ids = load_category_ids(conn)
+
+    result = IngestResult()
+    questions, rejected = validate_questions(questions_data)
+    result.rejected = len(rejected)
+    for question_data, problems in rejected:
+        logger.warning(
+            "Quarantining question %r: %s",
+            question_data.get("question") if isinstance(question_data, dict) else None,
+            "; ".join(detail for _, detail in problems),
+        )
+
+    if not questions:
+        # Leave the job out of the journal so a resumed run asks again.
+        if rejected:
+            with conn:
+                insert_quarantine(conn, rejected)
+        return result
+
+    fingerprints = [_fingerprint_question(q) for q in questions]
+    # New categories are added to the caller's map inside the transaction;
+    # a rollback must take them back out, or their ids would be reused.
+    known_categories = dict(category_ids)
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if rejected:
+            insert_quarantine(conn, rejected)
+        seen = existing_fingerprints(conn, set(fingerprints))
+        unique = []
+        for question_data, fingerprint in zip(questions, fingerprints):
+            if fingerprint in seen:
+                result.duplicates += 1
+                continue
+            seen.add(fingerprint)
+            unique.append((question_data, fingerprint))
+
+        if near_filter is not None:
+            accepted = []
+            next_id = next_question_id(conn)
+            for question_data, fingerprint in unique:
+                match, signature = near_filter.check(question_data)
+                if match is not None:
+                    logger.debug(
+                        "Skipping near-duplicate %r (~%.0f%% similar to question %d)",
+                        question_data["question"],
+                        match[1] * 100,
+                        match[0],
+                    )
+                    result.near_duplicates += 1
+                    continue
+                near_filter.add(next_id, signature)
+                accepted.append((question_data, fingerprint))
+                next_id += 1
+            unique = accepted
+
+        ensure_categories(conn, (q["category"] for q, _ in unique), category_ids)
+
+        question_id = next_question_id(conn)
+        question_rows = []
+        answer_rows = []
+        for question_data, fingerprint in unique:
+            question_rows.append(
+                (
+                    question_id,
+                    question_data["question"],
+                    category_ids[question_data["category"]],
+                    question_data["difficulty"],
+                    fingerprint,
+                )
+            )
+            for option in question_data["options"]:
+                answer_rows.append((question_id, option["text"], option["isCorrect"]))
+            question_id += 1
+
+        conn.executemany(
+            """
+            INSERT INTO questions (id, text, category_id, difficulty, fingerprint)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            question_rows,
+        )
+        conn.executemany(
+            "INSERT INTO answers (question_id, text, is_correct) VALUES (?, ?, ?)",
+            answer_rows,
+        )
+        _index_for_search(conn, question_rows, answer_rows)
+        if job is not None:
+            _record_job(conn, job, len(question_rows))
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        category_ids.clear()
+        category_ids.update(known_categories)
+        if near_filter is not None:
+            near_filter.discard()
+        raise
+
+    if near_filter is not None:
+        near_filter.save(conn)
+
+    result.added = len(question_rows)
+    logger.debug(
+        "Inserted %d questions and %d answers, skipped %d duplicates and "
+        "%d near-duplicates, quarantined %d",
+        len(question_rows),
+        len(answer_rows),
+        result.duplicates,
+        result.near_duplicates,
+        result.rejected,
+    )
+    return result
+
+
+def create_journal(conn):
+    """
+    Create the batch_jobs progress journal if it doesn't exist.
+    """
+    conn.executescript(JOURNAL_SCHEMA)
+
+
+def _record_job(conn, job, added):
+    category, difficulty, count = job
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO batch_jobs (category, difficulty, requested, added)
+        VALUES (?, ?, ?, ?)
+        """,
+        (category, difficulty, count, added),
+    )
+
+
+def completed_jobs(conn):
+    """
+    Return the set of (category, difficulty) pairs recorded as complete.
+    """
+    return set(conn.execute("SELECT category, difficulty FROM batch_jobs"))
+
+
+def reset_journal(conn):
+    """
+    Forget all completed jobs so the next batch run starts from scratch.
+    """
+    conn.execute("DELETE FROM batch_jobs")
+    conn.commit()
+
+
+def add_questions_bulk(questions_data, db_path=DEFAULT_DB_PATH):
+    """
+    Open `db_path`, insert all questions in one transaction and close it.
+
+    Returns an IngestResult.
+    """
+    conn = connect(db_path)
+    try:
+        return insert_questions(conn, questions_data)
+    finally:
+        conn.close()
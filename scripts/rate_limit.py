@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Client-side rate limiting and retries for Gemini requests.
+
+RateLimiter holds a requests-per-minute and a tokens-per-minute token bucket
+shared by every worker thread, so a batch runs at the quota ceiling instead
+of pausing for a fixed time after each request. Calls that fail with a
+retryable error (rate limited, overloaded, timeouts) are retried with
+jittered exponential backoff, and a rate-limit response pauses all workers,
+not just the one that saw it.
+"""
+
+import collections
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETRIES = 5
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 60.0
+# Seconds of quota a bucket may accumulate while idle.
+DEFAULT_BURST_SECONDS = 1.0
+
+RETRYABLE_CODES = {408, 429, 500, 502, 503, 504}
+RATE_LIMITED_CODES = {429}
+
+# Rough token accounting for requests before their real usage is known: the
+# prompt at ~4 characters per token, plus per generated question (ten
+# options plus JSON structure) and a margin for thinking.
+CHARS_PER_TOKEN = 4
+OUTPUT_TOKENS_PER_QUESTION = 250
+THINKING_TOKENS = 1000
+
+
+def estimate_tokens(prompt, questions):
+    """
+    Estimate the total tokens a request for `questions` questions will use.
+    """
+    return (
+        len(prompt) // CHARS_PER_TOKEN
+        + questions * OUTPUT_TOKENS_PER_QUESTION
+        + THINKING_TOKENS
+    )
+
+
+def error_code(error):
+    """
+    Return the HTTP status code carried by an API error, or None.
+    """
+    for attribute in ("code", "status_code"):
+        code = getattr(error, attribute, None)
+        if isinstance(code, int):
+            return code
+    return None
+
+
+def is_retryable(error):
+    """
+    Return True if a failed call is worth retrying.
+    """
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    return error_code(error) in RETRYABLE_CODES
+
+
+def backoff_delay(attempt, base=DEFAULT_BASE_DELAY, cap=DEFAULT_MAX_DELAY, rng=random):
+    """
+    Return the delay before retry number `attempt` (0-based), using "full
+    jitter": uniform between 0 and the capped exponential delay.
+    """
+    return rng.uniform(0, min(cap, base * 2**attempt))
+
+
+class _Bucket:
+    __slots__ = ("rate", "capacity", "level", "updated")
+
+    def __init__(self, per_minute, burst_seconds, now):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self.updated = now
+
+    def refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount):
+        # Requests larger than the bucket go through once it is full and
+        # leave it in debt, which later callers wait out.
+        needed = min(amount, self.capacity) - self.level
+        return needed / self.rate if needed > 0 else 0.0
+
+
+class RateLimiter:
+    """
+    Shared request and token budget with retry/backoff for API calls.
+
+    `rpm` and `tpm` are requests and tokens per minute; either may be None
+    for no limit. Token use is charged up front from an estimate and
+    corrected with the response's reported usage. All methods are safe to
+    call from several worker threads.
+    """
+
+    def __init__(
+        self,
+        rpm=None,
+        tpm=None,
+        retries=DEFAULT_RETRIES,
+        base_delay=DEFAULT_BASE_DELAY,
+        max_delay=DEFAULT_MAX_DELAY,
+        burst_seconds=DEFAULT_BURST_SECONDS,
+    ):
+        now = time.monotonic()
+        self.rpm = rpm
+        self.tpm = tpm
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._requests = _Bucket(rpm, burst_seconds, now) if rpm else None
+        self._tokens = _Bucket(tpm, burst_seconds, now) if tpm else None
+        self._lock = threading.Lock()
+        self._paused_until = now
+        self._window = collections.deque()
+        self._rng = random.Random()
+        self.requests = 0
+        self.retried = 0
+        self.rate_limited = 0
+        self.wait_seconds = 0.0
+
+    def acquire(self, tokens=0):
+        """
+        Block until one request and `tokens` tokens fit in the budget, then
+        take them. Returns the seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._paused_until - now
+                for bucket, amount in ((self._requests, 1), (self._tokens, tokens)):
+                    if bucket is not None:
+                        bucket.refill(now)
+                        wait = max(wait, bucket.wait_time(amount))
+                if wait <= 0:
+                    if self._requests is not None:
+                        self._requests.level -= 1
+                    if self._tokens is not None:
+                        self._tokens.level -= tokens
+                    self.requests += 1
+                    self.wait_seconds += waited
+                    self._window.append((now, 1, tokens))
+                    return waited
+            time.sleep(wait)
+            waited += wait
+
+    def record_usage(self, estimated, actual):
+        """
+        Correct the token budget once a request's real usage is known.
+        """
+        if actual is None:
+            return
+        delta = actual - estimated
+        with self._lock:
+            if self._tokens is not None:
+                self._tokens.level -= delta
+            self._window.append((time.monotonic(), 0, delta))
+
+    def pause(self, seconds):
+        """
+        Hold back every caller for `seconds`, e.g. after a rate-limit error.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def call(self, fn, tokens=0, usage=None):
+        """
+        Call fn() within the budget, retrying retryable errors with jittered
+        exponential backoff. `usage(result)` may return the call's actual
+        token count. The last error is re-raised once retries run out.
+        """
+        for attempt in range(self.retries + 1):
+            self.acquire(tokens)
+            try:
+                result = fn()
+            except Exception as e:
+                if attempt == self.retries or not is_retryable(e):
+                    raise
+                delay = backoff_delay(attempt, self.base_delay, self.max_delay, self._rng)
+                code = error_code(e)
+                with self._lock:
+                    self.retried += 1
+                    if code in RATE_LIMITED_CODES:
+                        self.rate_limited += 1
+                if code in RATE_LIMITED_CODES:
+                    self.pause(delay)
+                logger.warning(
+                    "Retryable error (%s), retry %d/%d in %.1fs",
+                    e,
+                    attempt + 1,
+                    self.retries,
+                    delay,
+                )
+                time.sleep(delay)
+                continue
+            if usage is not None:
+                self.record_usage(tokens, usage(result))
+            return result
+
+    def current_rate(self):
+        """
+        Return (requests per minute, tokens per minute) over the last minute.
+        """
+        with self._lock:
+            cutoff = time.monotonic() - 60
+            while self._window and self._window[0][0] < cutoff:
+                self._window.popleft()
+            requests = sum(entry[1] for entry in self._window)
+            tokens = sum(entry[2] for entry in self._window)
+        return requests, tokens
+
+    def stats(self):
+        """
+        Return request/retry counters, time spent waiting and the current rate.
+        """
+        requests_per_minute, tokens_per_minute = self.current_rate()
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retried,
+                "rate_limited": self.rate_limited,
+                "wait_seconds": self.wait_seconds,
+                "requests_per_minute": requests_per_minute,
+                "tokens_per_minute": tokens_per_minute,
+                "rpm_limit": self.rpm,
+                "tpm_limit": self.tpm,
+            }
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Multi-job request packing.
+
+Most batch jobs ask for only a handful of questions, so a request's fixed
+cost (connection, thinking, JSON wrapper) dominates its latency. Packing
+sends several (category, difficulty, count) jobs in one request with a
+combined response schema, and splits the response back into one question
+list per job so each job is still ingested and journaled on its own.
+
+AdaptivePacker picks how many jobs go into each request from the observed
+questions per second of request time and failure rate at each pack size.
+"""
+
+import functools
+import json
+import logging
+
+from generate_questions import MODEL, request_json, user_contents
+from metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PACK = 8
+# Upper bound on questions per packed request, to stay well inside the
+# model's output token limit.
+DEFAULT_MAX_PACK_QUESTIONS = 40
+
+
+def build_packed_prompt(jobs):
+    """
+    Render one prompt asking for every (category, difficulty, count) job.
+    """
+    job_lines = "\n".join(
+        f"{i}. Category: {category} | Difficulty: {difficulty} | Count: {count}"
+        for i, (category, difficulty, count) in enumerate(jobs, start=1)
+    )
+    return f"""Generate trivia questions for a Smart10-style game for each of the numbered jobs below. Each question should be a clear and direct topic.
+
+Jobs:
+{job_lines}
+
+Requirements:
+- Generate exactly Count questions for each job, in that job's category and at that job's difficulty
+- The "question" should be a direct topic, not a full interrogative sentence. For example, instead of "Which of the following players have won the Ballon d'Or?", the question should be "Ballon d'Or Winners".
+- Avoid unnecessary filler phrases like "Which of the following are..." or "Identify the...". The topic itself should be the question.
+- Provide exactly 10 answer options per question
+- 1-10 options should be correct answers
+- 0-9 options should be incorrect but plausible answers
+- Vary the number of correct answers between questions
+
+Return the response as a JSON object with this exact structure:
+{{
+  "jobs": [
+    {{
+      "job": 1,
+      "questions": [
+        {{
+          "question": "Direct Topic Name",
+          "options": [
+            {{"text": "Option 1", "isCorrect": true}},
+            {{"text": "Option 2", "isCorrect": false}},
+            // ... exactly 10 options total
+          ],
+          "category": "Category of job 1",
+          "difficulty": "Difficulty of job 1"
+        }}
+      ]
+    }}
+    // ... one entry per job
+  ]
+}}
+
+Make sure the JSON is valid and properly formatted. Do not include any text before or after the JSON object."""
+
+
+def _schema(type_, **fields):
+    return {"type": type_, **fields}
+
+
+def packed_response_schema():
+    """
+    Return the response schema for a packed request.
+    """
+    string = _schema("STRING")
+    option = _schema(
+        "OBJECT",
+        properties={"text": string, "isCorrect": _schema("BOOLEAN")},
+        required=["text", "isCorrect"],
+    )
+    question = _schema(
+        "OBJECT",
+        properties={
+            "question": string,
+            "options": _schema("ARRAY", items=option),
+            "category": string,
+            "difficulty": string,
+        },
+        required=["question", "options", "category", "difficulty"],
+    )
+    job = _schema(
+        "OBJECT",
+        properties={
+            "job": _schema("INTEGER"),
+            "questions": _schema("ARRAY", items=question),
+        },
+        required=["job", "questions"],
+    )
+    return _schema(
+        "OBJECT",
+        properties={"jobs": _schema("ARRAY", items=job)},
+        required=["jobs"],
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def packed_generation_config():
+    """
+    Return the GenerateContentConfig shared by every packed request.
+    """
+    return {
+        "thinking_config": {"thinking_budget": -1},
+        "response_mime_type": "application/json",
+        "response_schema": packed_response_schema(),
+    }
+
+
+def build_packed_request(jobs):
+    """
+    Build the (model, prompt, contents, config) for a packed request.
+    """
+    prompt = build_packed_prompt(jobs)
+    logger.debug("Generated packed prompt for %d jobs (length: %d)", len(jobs), len(prompt))
+    return MODEL, prompt, user_contents(prompt), packed_generation_config()
+
+
+def split_packed_response(jobs, data):
+    """
+    Split a packed response into one question list per job, in job order.
+
+    Entries are matched by their 1-based "job" number (falling back to
+    position when it's missing). Each question's category and difficulty are
+    set to its job's, and extra questions beyond the job's count are dropped.
+    Jobs the response doesn't cover get None.
+    """
+    if isinstance(data, dict):
+        data = data.get("jobs")
+    if not isinstance(data, list):
+        raise ValueError("packed response has no jobs array")
+
+    results = [None] * len(jobs)
+    for position, entry in enumerate(data):
+        if not isinstance(entry, dict) or not isinstance(entry.get("questions"), list):
+            continue
+        index = entry.get("job", position + 1)
+        if not isinstance(index, int) or not 1 <= index <= len(jobs):
+            logger.warning("Packed response has an entry for unknown job %r", index)
+            continue
+        category, difficulty, count = jobs[index - 1]
+        questions = [
+            {**question, "category": category, "difficulty": difficulty}
+            for question in entry["questions"]
+            if isinstance(question, dict)
+        ]
+        results[index - 1] = (results[index - 1] or []) + questions
+        del results[index - 1][count:]
+    return results
+
+
+def generate_packed(jobs, client=None, cache=None, metrics=None, limiter=None):
+    """
+    Generate questions for several jobs with a single request.
+
+    Returns a list with one question list (or None) per job, or None if the
+    request failed. Metrics and rate limiting work as in generate_questions;
+    metrics are labelled with the pack size.
+    """
+    logger.info(
+        "Starting packed question generation - %d jobs, %d questions",
+        len(jobs),
+        sum(count for _, _, count in jobs),
+    )
+
+    if metrics is None:
+        metrics = Metrics()
+    labels = {"pack_size": len(jobs)}
+
+    try:
+        data = request_json(
+            build_packed_request(jobs),
+            client=client,
+            cache=cache,
+            metrics=metrics,
+            labels=labels,
+            limiter=limiter,
+            questions=sum(count for _, _, count in jobs),
+        )
+        if data is None:
+            return None
+        results = split_packed_response(jobs, data)
+    except json.JSONDecodeError as e:
+        logger.error("JSON parsing error: %s", e)
+        metrics.inc("gemini_failures_total", reason="invalid_json", **labels)
+        return None
+    except Exception as e:
+        logger.error("Error generating packed questions: %s", e)
+        logger.error("Error type: %s", type(e).__name__)
+        metrics.inc("gemini_failures_total", reason=type(e).__name__, **labels)
+        return None
+
+    received = sum(len(questions) for questions in results if questions)
+    logger.info("Successfully parsed packed response with %d questions", received)
+    metrics.observe("gemini_questions_per_response", received, **labels)
+    return results
+
+
+class _SizeStats:
+    __slots__ = ("questions", "seconds", "failures", "requests")
+
+    def __init__(self):
+        self.questions = 0.0
+        self.seconds = 0.0
+        self.failures = 0.0
+        self.requests = 0.0
+
+
+class AdaptivePacker:
+    """
+    Choose how many jobs to pack per request by hill-climbing on goodput.
+
+    For every pack size it keeps exponentially decayed totals of questions
+    delivered, request seconds and failures. After `window` requests at the
+    current size it moves to the neighbouring size with the higher
+    questions per request-second, always trying an unmeasured larger size
+    first, and halves the size when the failure rate passes
+    `max_failure_rate`. The larger neighbour is periodically forgotten so a
+    change in API behaviour is noticed.
+
+    Not thread-safe; the batch loop calls it from one thread.
+    """
+
+    def __init__(
+        self,
+        initial=2,
+        max_pack=DEFAULT_MAX_PACK,
+        max_questions=DEFAULT_MAX_PACK_QUESTIONS,
+        window=3,
+        decay=0.8,
+        max_failure_rate=0.25,
+        probe_every=5,
+    ):
+        self.size = max(1, min(initial, max_pack))
+        self.max_pack = max_pack
+        self.max_questions = max_questions
+        self.window = window
+        self.decay = decay
+        self.max_failure_rate = max_failure_rate
+        self.probe_every = probe_every
+        self._stats = {}
+        self._since_decision = 0
+        self._decisions = 0
+
+    def take(self, pending):
+        """
+        Pop the next pack of jobs from the left of the `pending` deque.
+
+        A pack holds up to `size` jobs and at most `max_questions` questions
+        (but always at least one job).
+        """
+        pack = [pending.popleft()]
+        total = pack[0][2]
+        while pending and len(pack) < self.size:
+            if total + pending[0][2] > self.max_questions:
+                break
+            total += pending[0][2]
+            pack.append(pending.popleft())
+        return pack
+
+    def rate(self, size):
+        """
+        Return the decayed questions per request-second at `size`, or None.
+        """
+        stats = self._stats.get(size)
+        if stats is None or stats.requests < 1 or not stats.seconds:
+            return None
+        return stats.questions / stats.seconds
+
+    def failure_rate(self, size):
+        stats = self._stats.get(size)
+        if stats is None or not stats.requests:
+            return 0.0
+        return stats.failures / stats.requests
+
+    def record(self, size, questions, seconds, failed=False):
+        """
+        Record the outcome of one request that packed `size` jobs.
+        """
+        stats = self._stats.setdefault(size, _SizeStats())
+        stats.questions = stats.questions * self.decay + questions
+        stats.seconds = stats.seconds * self.decay + seconds
+        stats.failures = stats.failures * self.decay + (1 if failed else 0)
+        stats.requests = stats.requests * self.decay + 1
+
+        if size == self.size:
+            self._since_decision += 1
+            if self._since_decision >= self.window:
+                self._decide()
+
+    def _decide(self):
+        self._since_decision = 0
+        self._decisions += 1
+        current = self.size
+
+        if self.failure_rate(current) > self.max_failure_rate:
+            self.size = max(1, current // 2)
+        else:
+            up, down = current + 1, current - 1
+            if self._decisions % self.probe_every == 0:
+                self._stats.pop(up, None)
+            current_rate = self.rate(current) or 0.0
+            up_rate = self.rate(up)
+            down_rate = self.rate(down) if down >= 1 else None
+            if up <= self.max_pack and (up_rate is None or up_rate > current_rate):
+                self.size = up
+            elif down_rate is not None and down_rate > current_rate:
+                self.size = down
+
+        if self.size != current:
+            logger.info(
+                "Pack size %d -> %d (%.2f questions/s, %.0f%% failures at %d)",
+                current,
+                self.size,
+                self.rate(current) or 0.0,
+                self.failure_rate(current) * 100,
+                current,
+            )
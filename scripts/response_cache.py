@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk cache for Gemini responses.
+
+Entries are keyed by a SHA-256 of the model name, the rendered prompt and the
+serialized GenerateContentConfig, so a request is only replayed when all
+three are identical. The cache directory is bounded in size and evicts the
+least recently used entries first.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+# Fingerprints of the shared, never-mutated config objects (see
+# generate_questions.generation_config), keyed by id. Entries hold a
+# reference to their config, so an id can't be reused while cached.
+_FINGERPRINT_MEMO_SIZE = 64
+_fingerprints = {}
+
+
+def _config_fingerprint(config):
+    if config is None:
+        return ""
+    memo = _fingerprints.get(id(config))
+    if memo is not None:
+        return memo[1]
+    if isinstance(config, dict):
+        fingerprint = json.dumps(config, sort_keys=True)
+    elif hasattr(config, "model_dump_json"):
+        fingerprint = config.model_dump_json(exclude_none=True)
+    else:
+        fingerprint = repr(config)
+    if len(_fingerprints) < _FINGERPRINT_MEMO_SIZE:
+        _fingerprints[id(config)] = (config, fingerprint)
+    return fingerprint
+
+
+def cache_key(model, prompt, config=None):
+    """
+    Return the hex digest identifying a (model, prompt, config) request.
+    """
+    digest = hashlib.sha256()
+    for part in (model, prompt, _config_fingerprint(config)):
+        encoded = part.encode("utf-8")
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """
+    Size-bounded response cache stored as one file per entry under cache_dir.
+
+    Reads refresh an entry's mtime, which is what eviction orders by. All
+    methods are safe to call from several worker threads.
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._sizes = {}
+        self._total_bytes = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        for root, _, files in os.walk(cache_dir):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    size = os.path.getsize(path)
+                    self._sizes[name[: -len(".json")]] = size
+                    self._total_bytes += size
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """
+        Return the cached response text for key, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        logger.debug("Cache hit: %s", key)
+        return text
+
+    def put(self, key, text):
+        """
+        Store response text under key, evicting old entries if over budget.
+        """
+        path = self._path(key)
+        data = text.encode("utf-8")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._total_bytes += len(data) - self._sizes.get(key, 0)
+            self._sizes[key] = len(data)
+            self.writes += 1
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Called with the lock held.
+        entries = []
+        for key in self._sizes:
+            try:
+                entries.append((os.path.getmtime(self._path(key)), key))
+            except FileNotFoundError:
+                entries.append((0, key))
+        entries.sort()
+
+        target = self.max_bytes * 0.9
+        for _, key in entries:
+            if self._total_bytes <= target:
+                break
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            self._total_bytes -= self._sizes.pop(key)
+            self.evictions += 1
+
+    def stats(self):
+        """
+        Return hit/miss/eviction counters and the current cache size.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "entries": len(self._sizes),
+                "bytes": self._total_bytes,
+            }
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Full-text search over questions and their answers.
+
+question_fts is an FTS5 table with one row per question (rowid = question
+id) holding the question text and all of its answers. It is tokenized with
+unicode61 with diacritics removed, so "Mbappe" finds "Mbappé", and hits
+are ranked by BM25 with matches in the question text weighted above
+matches in the answers.
+
+Once built, the index is kept current without rebuilding:
+question_db.insert_questions and merge_databases index new questions in
+the same transaction, and a trigger drops deleted questions from it.
+
+Plain queries match questions containing every word; a trailing * makes a
+word a prefix and "double quotes" group a phrase. --raw passes the query to
+FTS5 unchanged (AND/OR/NOT, NEAR, column filters).
+"""
+
+import argparse
+import re
+import sqlite3
+import time
+
+SEARCH_TABLE = "question_fts"
+ANSWER_SEPARATOR = " | "
+# BM25 weights for the question and answers columns.
+RANK = "bm25(2.0, 1.0)"
+DEFAULT_LIMIT = 20
+
+SEARCH_SCHEMA = (
+    f"""
+    CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5(
+        question,
+        answers,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}, rank) VALUES ('rank', '{RANK}')",
+    f"""
+    CREATE TRIGGER {SEARCH_TABLE}_delete AFTER DELETE ON questions BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id;
+    END
+    """,
+)
+
+_TERM_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def has_search_index(conn):
+    return (
+        conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (SEARCH_TABLE,),
+        ).fetchone()
+        is not None
+    )
+
+
+def drop_search_index(conn):
+    """
+    Remove the index and its trigger.
+    """
+    conn.executescript(
+        f"""
+        DROP TRIGGER IF EXISTS {SEARCH_TABLE}_delete;
+        DROP TABLE IF EXISTS {SEARCH_TABLE};
+        """
+    )
+
+
+def build_search_index(conn):
+    """
+    (Re)build the index from every question in the database in one
+    transaction. Returns the number of questions indexed.
+    """
+    drop_search_index(conn)
+    with conn:
+        for statement in SEARCH_SCHEMA:
+            conn.execute(statement)
+        index_questions_from(conn, 0)
+        conn.execute(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')")
+    (count,) = conn.execute(f"SELECT COUNT(*) FROM {SEARCH_TABLE}").fetchone()
+    return count
+
+
+def index_questions_from(conn, first_id):
+    """
+    Index every question with id >= `first_id`, inside the caller's
+    transaction. Used after set-based inserts that hand out ascending ids.
+    """
+    conn.execute(
+        f"""
+        INSERT INTO {SEARCH_TABLE} (rowid, question, answers)
+        SELECT q.id, q.text, group_concat(a.text, ?)
+        FROM questions q
+        LEFT JOIN answers a ON a.question_id = q.id
+        WHERE q.id >= ?
+        GROUP BY q.id
+        """,
+        (ANSWER_SEPARATOR, first_id),
+    )
+
+
+def add_to_search_index(conn, documents):
+    """
+    Index (question id, question text, answer texts) triples inside the
+    caller's transaction.
+    """
+    conn.executemany(
+        f"INSERT INTO {SEARCH_TABLE} (rowid, question, answers) VALUES (?, ?, ?)",
+        [
+            (question_id, text, ANSWER_SEPARATOR.join(answers))
+            for question_id, text, answers in documents
+        ],
+    )
+
+
+def match_query(text):
+    """
+    Turn plain search text into an FTS5 query: every word (or "quoted
+    phrase") must match, and a trailing * makes a word a prefix. Words are
+    quoted, so punctuation such as "d'Or" or "E-Sports" can't break the
+    query syntax.
+    """
+    terms = []
+    for phrase, word in _TERM_RE.findall(text):
+        term = phrase if phrase else word
+        prefix = not phrase and term.endswith("*") and len(term) > 1
+        term = term.rstrip("*") if prefix else term
+        if term.strip():
+            terms.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def search(conn, query, limit=DEFAULT_LIMIT, raw=False):
+    """
+    Return up to `limit` best matches for `query`, best first, as
+    (question id, question, category, difficulty, snippet, score) tuples.
+    Lower scores are better (BM25 as reported by FTS5).
+
+    Raises sqlite3.OperationalError for malformed raw queries.
+    """
+    expression = query if raw else match_query(query)
+    if not expression:
+        return []
+    return conn.execute(
+        f"""
+        SELECT q.id, q.text, c.name, q.difficulty,
+               snippet({SEARCH_TABLE}, -1, '[', ']', '...', 12), f.rank
+        FROM {SEARCH_TABLE} f
+        JOIN questions q ON q.id = f.rowid
+        JOIN categories c ON c.id = q.category_id
+        WHERE {SEARCH_TABLE} MATCH ?
+        ORDER BY f.rank
+        LIMIT ?
+        """,
+        (expression, limit),
+    ).fetchall()
+
+
+def print_hits(hits, seconds):
+    for question_id, text, category, difficulty, snippet, score in hits:
+        print(f"#{question_id:<7} {score:7.2f}  {text}  ({category}, {difficulty})")
+        if snippet != text:
+            print(f"          {snippet}")
+    print(f"{len(hits)} hits in {seconds * 1000:.1f} ms")
+
+
+def main():
+    from question_db import DEFAULT_DB_PATH, connect
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--db",
+        default=DEFAULT_DB_PATH,
+        help=f"SQLite database path (default: {DEFAULT_DB_PATH})",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("build", help="build or rebuild the index")
+    subparsers.add_parser("drop", help="remove the index")
+    query_parser = subparsers.add_parser("query", help="search the index")
+    query_parser.add_argument("terms", nargs="+", help="words to search for")
+    query_parser.add_argument(
+        "-n",
+        "--limit",
+        type=int,
+        default=DEFAULT_LIMIT,
+        help=f"most hits to show (default: {DEFAULT_LIMIT})",
+    )
+    query_parser.add_argument(
+        "--raw", action="store_true", help="pass the query to FTS5 unchanged"
+    )
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    try:
+        if args.command == "build":
+            started = time.perf_counter()
+            count = build_search_index(conn)
+            print(f"Indexed {count} questions in {time.perf_counter() - started:.2f}s")
+        elif args.command == "drop":
+            drop_search_index(conn)
+            print("Search index removed")
+        else:
+            if not has_search_index(conn):
+                parser.error("no search index; run `search_index.py build` first")
+            started = time.perf_counter()
+            try:
+                hits = search(conn, " ".join(args.terms), args.limit, raw=args.raw)
+            except sqlite3.OperationalError as e:
+                parser.error(f"invalid query: {e}")
+            print_hits(hits, time.perf_counter() - started)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
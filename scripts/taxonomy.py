@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Hierarchical category taxonomy.
+
+Category names are " - "-delimited paths ("Sports - Football - Premier
+League - Records"). This module turns them into a tree stored in the
+categories table itself: every path prefix becomes a category row, each
+row's parent_id points at its parent, and a category_closure table holds
+one (ancestor, descendant, depth) row per ancestor of every node, so subtree
+lookups and counts are plain indexed joins at any depth.
+
+Paths are normalized before building the tree: whitespace is collapsed,
+empty segments are dropped and "Soccer" is spelled "Football". A category
+whose raw name differs from its normalized path (e.g. "Sports - Soccer") is
+kept as an alias and attached as a child of the canonical node, so its
+questions show up in the canonical subtree.
+"""
+
+import argparse
+import random
+import re
+import sys
+
+from optimize_database import has_sample_keys
+from question_db import DEFAULT_DB_PATH, connect
+
+SEPARATOR = " - "
+# A free-standing hyphen; "E-Sports" and "Play-offs" stay one segment.
+_SEPARATOR_RE = re.compile(r"(?:^|(?<=\s))-(?=\s|$)")
+
+# Segment spellings folded into one canonical name.
+SEGMENT_ALIASES = {
+    "soccer": "Football",
+}
+
+TAXONOMY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS category_closure (
+    ancestor_id INTEGER NOT NULL,
+    descendant_id INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    PRIMARY KEY (ancestor_id, descendant_id),
+    FOREIGN KEY (ancestor_id) REFERENCES categories (id),
+    FOREIGN KEY (descendant_id) REFERENCES categories (id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_category_closure_descendant
+    ON category_closure (descendant_id, depth);
+"""
+
+
+def category_path(name):
+    """
+    Return the normalized path of a category name as a tuple of segments.
+    """
+    segments = []
+    for segment in _SEPARATOR_RE.split(name):
+        segment = " ".join(segment.split())
+        if not segment:
+            continue
+        segments.append(SEGMENT_ALIASES.get(segment.casefold(), segment))
+    return tuple(segments)
+
+
+def canonical_name(name):
+    """
+    Return the canonical category name for a raw " - "-delimited name.
+    """
+    return SEPARATOR.join(category_path(name))
+
+
+def create_taxonomy_tables(conn):
+    """
+    Add categories.parent_id and the closure table if they don't exist.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(categories)")}
+    if "parent_id" not in columns:
+        conn.execute(
+            "ALTER TABLE categories ADD COLUMN parent_id INTEGER REFERENCES categories (id)"
+        )
+    conn.executescript(
+        TAXONOMY_SCHEMA
+        + "CREATE INDEX IF NOT EXISTS idx_categories_parent ON categories (parent_id);"
+    )
+
+
+def has_taxonomy(conn):
+    """
+    Return True if build_taxonomy has been run on this database.
+    """
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'category_closure'"
+    ).fetchone()
+    return row is not None
+
+
+def _ensure_node(conn, category_ids, name):
+    """
+    Return the id of the category called name, creating it and any missing
+    ancestors. Aliases are parented under their canonical node.
+    """
+    category_id = category_ids.get(name)
+    path = category_path(name)
+    canonical = SEPARATOR.join(path)
+
+    if canonical != name and canonical:
+        parent_id = _ensure_node(conn, category_ids, canonical)
+    elif len(path) > 1:
+        parent_id = _ensure_node(conn, category_ids, SEPARATOR.join(path[:-1]))
+    else:
+        parent_id = None
+
+    if category_id is None:
+        category_id = conn.execute(
+            "INSERT INTO categories (name, parent_id) VALUES (?, ?)", (name, parent_id)
+        ).lastrowid
+        category_ids[name] = category_id
+        _link_closure(conn, category_id, parent_id)
+    return category_id
+
+
+def _link_closure(conn, category_id, parent_id):
+    conn.execute(
+        "INSERT OR IGNORE INTO category_closure VALUES (?, ?, 0)",
+        (category_id, category_id),
+    )
+    if parent_id is not None:
+        conn.execute(
+            """
+            INSERT OR IGNORE INTO category_closure (ancestor_id, descendant_id, depth)
+            SELECT ancestor_id, ?, depth + 1 FROM category_closure WHERE descendant_id = ?
+            """,
+            (category_id, parent_id),
+        )
+
+
+def build_taxonomy(conn, extra_names=()):
+    """
+    Build the tree from every category in the database plus `extra_names`
+    (e.g. the batch category list), then rebuild the closure table.
+
+    Safe to rerun. Returns the number of category nodes.
+    """
+    create_taxonomy_tables(conn)
+    with conn:
+        category_ids = dict(conn.execute("SELECT name, id FROM categories"))
+        for name in list(category_ids) + list(extra_names):
+            _ensure_node(conn, category_ids, name)
+
+        # Re-derive every parent link so renamed aliases and earlier runs agree.
+        updates = []
+        for name, category_id in category_ids.items():
+            path = category_path(name)
+            canonical = SEPARATOR.join(path)
+            if canonical != name and canonical:
+                parent = canonical
+            elif len(path) > 1:
+                parent = SEPARATOR.join(path[:-1])
+            else:
+                parent = None
+            updates.append((category_ids.get(parent), category_id))
+        conn.executemany("UPDATE categories SET parent_id = ? WHERE id = ?", updates)
+
+        conn.execute("DELETE FROM category_closure")
+        conn.execute(
+            """
+            WITH RECURSIVE tree (ancestor_id, descendant_id, depth) AS (
+                SELECT id, id, 0 FROM categories
+                UNION ALL
+                SELECT tree.ancestor_id, c.id, tree.depth + 1
+                FROM tree JOIN categories c ON c.parent_id = tree.descendant_id
+            )
+            INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+            SELECT ancestor_id, descendant_id, depth FROM tree
+            """
+        )
+    return len(category_ids)
+
+
+def add_to_taxonomy(conn, names, category_ids):
+    """
+    Attach newly created categories (and any missing ancestors) to an
+    existing taxonomy. Runs inside the caller's transaction; `category_ids`
+    is updated with any ancestor rows created.
+    """
+    for name in names:
+        category_id = category_ids[name]
+        path = category_path(name)
+        canonical = SEPARATOR.join(path)
+        if canonical != name and canonical:
+            parent_id = _ensure_node(conn, category_ids, canonical)
+        elif len(path) > 1:
+            parent_id = _ensure_node(conn, category_ids, SEPARATOR.join(path[:-1]))
+        else:
+            parent_id = None
+        conn.execute(
+            "UPDATE categories SET parent_id = ? WHERE id = ?", (parent_id, category_id)
+        )
+        _link_closure(conn, category_id, parent_id)
+
+
+def find_category(conn, name):
+    """
+    Return the id of a category by raw or canonical name, or None.
+    """
+    row = conn.execute(
+        "SELECT id FROM categories WHERE name IN (?, ?) ORDER BY name = ? DESC LIMIT 1",
+        (name, canonical_name(name), canonical_name(name)),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def subtree_question_count(conn, category_id, difficulty=None):
+    """
+    Return the number of questions in a category's subtree.
+    """
+    sql = """
+        SELECT COUNT(*) FROM category_closure cc
+        JOIN questions q ON q.category_id = cc.descendant_id
+        WHERE cc.ancestor_id = ?
+    """
+    params = [category_id]
+    if difficulty is not None:
+        sql += " AND q.difficulty = ?"
+        params.append(difficulty)
+    return conn.execute(sql, params).fetchone()[0]
+
+
+def random_subtree_question(conn, category_id, difficulty=None, rng=random):
+    """
+    Return a uniformly random question id from a category's subtree, or None.
+
+    With sampling keys (see optimize_database) this reads one stratum size
+    per category in the subtree and then a single slot, so the cost doesn't
+    grow with the number of questions. Without them it scans the subtree.
+    """
+    if not has_sample_keys(conn):
+        return _scan_subtree_question(conn, category_id, difficulty, rng)
+
+    if difficulty is None:
+        stratum_sql, params = "'c:' || cc.descendant_id", [category_id]
+    else:
+        stratum_sql = "'cd:' || cc.descendant_id || ':' || ?"
+        params = [difficulty, category_id]
+    strata = conn.execute(
+        f"""
+        SELECT s.stratum, s.size FROM category_closure cc
+        JOIN question_sample_counts s ON s.stratum = {stratum_sql}
+        WHERE cc.ancestor_id = ? AND s.size > 0
+        """,
+        params,
+    ).fetchall()
+    total = sum(size for _, size in strata)
+    if not total:
+        return None
+    slot = rng.randrange(total)
+    for stratum, size in strata:
+        if slot < size:
+            break
+        slot -= size
+    return conn.execute(
+        "SELECT question_id FROM question_sample WHERE stratum = ? AND slot = ?",
+        (stratum, slot),
+    ).fetchone()[0]
+
+
+def _scan_subtree_question(conn, category_id, difficulty, rng):
+    count = subtree_question_count(conn, category_id, difficulty)
+    if not count:
+        return None
+    sql = """
+        SELECT q.id FROM category_closure cc
+        JOIN questions q ON q.category_id = cc.descendant_id
+        WHERE cc.ancestor_id = ?
+    """
+    params = [category_id]
+    if difficulty is not None:
+        sql += " AND q.difficulty = ?"
+        params.append(difficulty)
+    sql += " LIMIT 1 OFFSET ?"
+    params.append(rng.randrange(count))
+    return conn.execute(sql, params).fetchone()[0]
+
+
+def subtree_counts(conn, max_depth=None):
+    """
+    Return [(depth, name, subtree question count), ...] in tree order.
+    """
+    counts = dict(
+        conn.execute(
+            """
+            SELECT cc.ancestor_id, COUNT(q.id)
+            FROM category_closure cc
+            LEFT JOIN questions q ON q.category_id = cc.descendant_id
+            GROUP BY cc.ancestor_id
+            """
+        )
+    )
+    children = {}
+    names = {}
+    for category_id, name, parent_id in conn.execute(
+        "SELECT id, name, parent_id FROM categories ORDER BY name"
+    ):
+        names[category_id] = name
+        children.setdefault(parent_id, []).append(category_id)
+
+    rows = []
+    stack = [(category_id, 0) for category_id in reversed(children.get(None, []))]
+    while stack:
+        category_id, depth = stack.pop()
+        rows.append((depth, names[category_id], counts.get(category_id, 0)))
+        if max_depth is None or depth < max_depth:
+            stack.extend(
+                (child, depth + 1) for child in reversed(children.get(category_id, []))
+            )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--db",
+        default=DEFAULT_DB_PATH,
+        help=f"SQLite database path (default: {DEFAULT_DB_PATH})",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser(
+        "build", help="build the tree from the database and batch category list"
+    )
+    tree_parser = subparsers.add_parser("tree", help="print the tree with question counts")
+    tree_parser.add_argument("--depth", type=int, help="maximum depth to print")
+    count_parser = subparsers.add_parser(
+        "count", help="count questions in a category subtree"
+    )
+    count_parser.add_argument("category")
+    count_parser.add_argument("--difficulty")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+
+    if args.command == "build":
+        from categories import CATEGORIES
+
+        nodes = build_taxonomy(conn, (name for name, _ in CATEGORIES))
+        print(f"Taxonomy built with {nodes} category nodes")
+    elif not has_taxonomy(conn):
+        print("No taxonomy in this database yet; run the build command first")
+        sys.exit(1)
+    elif args.command == "tree":
+        for depth, name, count in subtree_counts(conn, args.depth):
+            print(f"{'  ' * depth}{name.split(SEPARATOR)[-1]} ({count})")
+    else:
+        category_id = find_category(conn, args.category)
+        if category_id is None:
+            print(f"Unknown category: {args.category}")
+            sys.exit(1)
+        print(subtree_question_count(conn, category_id, args.difficulty))
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Journal and resume behaviour of generate_batch_questions.generate_batch,
+run offline against fake_gemini.
+"""
+
+import pytest
+
+from generate_batch_questions import generate_batch
+from generation_session import create_transport
+from question_db import completed_jobs, connect
+
+JOBS = [("Sports", "Easy", 2), ("History", "Hard", 3), ("Music", "Medium", 1)]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "questions.db")
+    connect(path).close()
+    return path
+
+
+def _run(db_path, jobs=JOBS, **kwargs):
+    return generate_batch(
+        jobs,
+        concurrency=2,
+        client=create_transport(fake=True, seed=3),
+        db_path=db_path,
+        **kwargs,
+    )
+
+
+def _journal(db_path):
+    conn = connect(db_path)
+    try:
+        has_journal = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'batch_jobs'"
+        ).fetchone()
+        return completed_jobs(conn) if has_journal else set()
+    finally:
+        conn.close()
+
+
+def _question_count(db_path):
+    conn = connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_completed_jobs_are_journaled(db_path):
+    summary = _run(db_path)
+
+    assert summary["questions_added"] == 6
+    assert _journal(db_path) == {(category, difficulty) for category, difficulty, _ in JOBS}
+
+
+def test_resume_skips_journaled_jobs(db_path):
+    _run(db_path, JOBS[:2])
+
+    summary = _run(db_path)
+
+    assert summary["jobs"] == 1
+    assert summary["questions_added"] == 1
+    assert _question_count(db_path) == 6
+
+
+def test_fresh_run_clears_the_journal(db_path):
+    _run(db_path, JOBS[:2])
+
+    summary = _run(db_path, JOBS[2:], resume=False)
+
+    assert summary["jobs"] == 1
+    assert _journal(db_path) == {("Music", "Medium")}
+
+
+def test_journal_off_neither_records_nor_skips(db_path):
+    _run(db_path, JOBS[:1])
+
+    summary = _run(db_path, journal=False)
+
+    assert summary["jobs"] == len(JOBS)
+    assert _journal(db_path) == {("Sports", "Easy")}
+    assert _run(db_path)["jobs"] == len(JOBS) - 1
@@ -0,0 +1,32 @@
+"""
+Benchmark smoke tests: every stage runs on a tiny corpus, in-process and
+isolated in its own interpreter.
+"""
+
+import pytest
+
+from benchmark import STAGES, _run_isolated, percentile, run_stage
+
+
+def test_percentile_is_nearest_rank():
+    values = [10, 1, 9, 2, 8, 3, 7, 4, 6, 5]
+
+    assert [percentile(values, pct) for pct in (50, 90, 99, 100)] == [5, 9, 10, 10]
+    assert percentile([3], 1) == 3
+    assert percentile([], 50) == 0.0
+
+
+@pytest.mark.parametrize("stage", STAGES)
+def test_stage_processes_every_question(stage):
+    result = run_stage(stage, 20, latency=0.0, concurrency=4)
+
+    assert (result["stage"], result["size"], result["questions"]) == (stage, 20, 20)
+    assert result["questions_per_sec"] > 0
+    assert result["p50_ms"] <= result["p90_ms"] <= result["p99_ms"]
+
+
+def test_isolated_stage_reports_json():
+    result = _run_isolated("ingest", 20, latency=0.0, concurrency=4)
+
+    assert (result["stage"], result["questions"]) == ("ingest", 20)
+    assert result["peak_rss_mb"] > 0
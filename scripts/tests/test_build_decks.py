@@ -0,0 +1,133 @@
+"""
+Deck building: round allocation, weighted category draws, no-repeat decks
+and replacing the decks table.
+"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from build_decks import (
+    DEFAULT_ROUNDS,
+    AliasTable,
+    allocate,
+    build_decks,
+    load_strata,
+    read_max_rounds,
+    write_decks,
+)
+from fake_gemini import fake_questions
+from question_db import connect, insert_questions
+
+DIFFICULTY_SIZES = {"Easy": 6, "Medium": 3, "Hard": 1}
+
+
+def _strata(categories=16):
+    # Category c has c * size questions of each difficulty, ids unique.
+    strata = {}
+    next_id = 1
+    for category_id in range(1, categories + 1):
+        for difficulty, size in DIFFICULTY_SIZES.items():
+            count = category_id * size
+            strata[(category_id, difficulty)] = list(range(next_id, next_id + count))
+            next_id += count
+    return strata
+
+
+def _keys(strata):
+    return {question_id: key for key, ids in strata.items() for question_id in ids}
+
+
+def test_read_max_rounds(tmp_path):
+    config = tmp_path / "config.ts"
+    config.write_text("export const config = {\n  maxRounds: 12,\n};\n")
+
+    assert read_max_rounds(str(config)) == 12
+    assert read_max_rounds(str(tmp_path / "missing.ts")) == DEFAULT_ROUNDS
+    config.write_text("export const config = {};\n")
+    assert read_max_rounds(str(config)) == DEFAULT_ROUNDS
+
+
+def test_allocate_uses_largest_remainders():
+    slots = allocate(10, {"Easy": 55, "Medium": 30, "Hard": 15})
+
+    assert slots == {"Easy": 6, "Medium": 3, "Hard": 1}
+    assert sum(allocate(7, {"a": 1, "b": 1, "c": 1}).values()) == 7
+
+
+def test_alias_table_follows_weights():
+    table = AliasTable("abc", [1, 2, 7])
+    rng = random.Random(0)
+
+    draws = Counter(table.draw(rng) for _ in range(20000))
+
+    for item, weight in zip("abc", [0.1, 0.2, 0.7]):
+        assert draws[item] / 20000 == pytest.approx(weight, abs=0.02)
+
+
+def test_decks_never_repeat_a_question_or_category():
+    strata = _strata()
+    keys = _keys(strata)
+
+    decks = list(build_decks(strata, 50, 10, rng=random.Random(1)))
+
+    assert len(decks) == 50
+    for deck in decks:
+        assert len(deck) == 10
+        assert len({keys[question_id][0] for question_id in deck}) == 10
+        difficulties = Counter(keys[question_id][1] for question_id in deck)
+        assert difficulties == Counter(DIFFICULTY_SIZES)
+
+
+def test_questions_are_dealt_before_any_repeats():
+    strata = {(1, "Easy"): [1, 2, 3, 4, 5]}
+
+    dealt = [deck[0] for deck in build_decks(strata, 15, 1, rng=random.Random(2))]
+
+    for cycle in range(3):
+        assert sorted(dealt[cycle * 5 : cycle * 5 + 5]) == [1, 2, 3, 4, 5]
+
+
+def test_too_few_categories_repeat_a_category_but_not_a_question():
+    strata = {(1, "Easy"): [1, 2, 3], (2, "Easy"): [4]}
+
+    (deck,) = build_decks(strata, 1, 4, rng=random.Random(3))
+
+    assert sorted(deck) == [1, 2, 3, 4]
+
+
+def test_too_few_questions():
+    with pytest.raises(ValueError):
+        list(build_decks({(1, "Easy"): [1, 2]}, 1, 3))
+
+
+def test_write_decks_replaces_the_table(tmp_path):
+    conn = connect(str(tmp_path / "questions.db"))
+    insert_questions(conn, fake_questions("Sports", "Easy", 4, random.Random(0)))
+    insert_questions(conn, fake_questions("History", "Hard", 2, random.Random(0)))
+    strata = load_strata(conn)
+    assert sorted(len(ids) for ids in strata.values()) == [2, 4]
+
+    write_decks(conn, build_decks(strata, 5, 2, rng=random.Random(4)))
+    assert write_decks(conn, build_decks(strata, 2, 3, rng=random.Random(5))) == (2, 6)
+
+    rows = conn.execute("SELECT deck_id, position FROM decks ORDER BY deck_id, position")
+    assert rows.fetchall() == [(deck, position) for deck in range(2) for position in range(3)]
+    conn.close()
+
+
+def test_failed_build_keeps_the_previous_decks(tmp_path):
+    conn = connect(str(tmp_path / "questions.db"))
+    write_decks(conn, [[1, 2], [3, 4]])
+
+    def decks():
+        yield [5, 6]
+        raise ValueError("could not fill a deck without repeats")
+
+    with pytest.raises(ValueError):
+        write_decks(conn, decks())
+
+    rows = conn.execute("SELECT question_id FROM decks ORDER BY deck_id, position")
+    assert [question_id for (question_id,) in rows] == [1, 2, 3, 4]
+    conn.close()
@@ -0,0 +1,85 @@
+"""
+bulk_import: both input formats, malformed NDJSON lines and per-file errors.
+"""
+
+import json
+import random
+
+import pytest
+
+from bulk_import import detect_format, import_file, main
+from fake_gemini import fake_questions
+from question_db import connect
+
+
+@pytest.fixture
+def questions():
+    return fake_questions("Sports", "Easy", 7, random.Random(0))
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "questions.db"))
+    yield conn
+    conn.close()
+
+
+def _write_ndjson(path, lines):
+    path.write_bytes(b"".join(line + b"\n" for line in lines))
+    return str(path)
+
+
+def _encoded(questions):
+    return [json.dumps(question).encode() for question in questions]
+
+
+def _quarantine(conn):
+    return conn.execute("SELECT reasons, payload FROM quarantine ORDER BY id").fetchall()
+
+
+def test_json_array_in_small_batches(conn, tmp_path, questions):
+    path = tmp_path / "questions.json"
+    path.write_text(" \n" + json.dumps(questions, indent=1), encoding="utf-8-sig")
+
+    assert detect_format(str(path)) == "json"
+    result = import_file(conn, str(path), batch_size=3, progress=False)
+
+    assert result.added == 7
+    assert conn.execute("SELECT COUNT(*) FROM questions").fetchone() == (7,)
+
+
+def test_malformed_ndjson_lines_are_quarantined(conn, tmp_path, questions):
+    lines = _encoded(questions)
+    lines[2:2] = [b'{"question": "cut off', b"\xff\xfe not utf-8", b"   "]
+    path = _write_ndjson(tmp_path / "questions.ndjson", lines)
+
+    assert detect_format(path) == "ndjson"
+    result = import_file(conn, path, batch_size=2, progress=False)
+
+    assert (result.added, result.rejected) == (7, 2)
+    assert [reasons for reasons, _ in _quarantine(conn)] == ["malformed_json"] * 2
+    assert json.loads(_quarantine(conn)[0][1]) == '{"question": "cut off'
+
+
+def test_trailing_malformed_line_is_counted(conn, tmp_path, questions):
+    path = _write_ndjson(tmp_path / "questions.ndjson", _encoded(questions) + [b"]"])
+
+    result = import_file(conn, path, batch_size=7, progress=False)
+
+    assert (result.added, result.rejected) == (7, 1)
+
+
+def test_main_reports_bad_files_and_imports_the_rest(tmp_path, questions, capsys):
+    db_path = str(tmp_path / "questions.db")
+    good = _write_ndjson(tmp_path / "good.ndjson", _encoded(questions))
+    latin1 = tmp_path / "latin1.json"
+    latin1.write_bytes('[{"question": "Göteborg"}]'.encode("latin-1"))
+    missing = str(tmp_path / "missing.json")
+
+    status = main(["-q", "--db", db_path, str(latin1), missing, good])
+
+    assert status == 1
+    output = capsys.readouterr().out
+    assert f"{latin1}: 'utf-8' codec can't decode" in output
+    assert f"{missing}: [Errno 2]" in output
+    assert f"{good}: 7 added, 0 duplicates, 0 quarantined" in output
@@ -0,0 +1,72 @@
+"""
+cli.py exit statuses for the subcommands that delegate to other scripts.
+"""
+
+import pytest
+
+from cli import main
+from logging_setup import stop_logging
+from question_db import connect
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    yield str(tmp_path / "questions.db")
+    stop_logging()
+
+
+def _question_count(db_path):
+    conn = connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("stream", [[], ["--stream"]])
+def test_generate_stores_questions(db_path, stream):
+    argv = ["generate", "Sports", "Easy", "3", "--fake", "--db", db_path, "--log-file", ""]
+
+    assert main(argv + stream) == 0
+    assert _question_count(db_path) == 3
+
+
+def test_generate_without_api_key_fails(db_path):
+    assert main(["generate", "Sports", "Easy", "--db", db_path]) == 1
+
+
+def test_generate_rejects_bad_count(db_path):
+    with pytest.raises(SystemExit) as excinfo:
+        main(["generate", "Sports", "Easy", "21", "--fake", "--db", db_path])
+    assert excinfo.value.code == 2
+
+
+def _batch(db_path, *options):
+    return main(
+        [
+            "batch",
+            "--fake",
+            "--fake-latency",
+            "0",
+            "--retries",
+            "0",
+            "--db",
+            db_path,
+            "--log-file",
+            "",
+            "--metrics-prefix",
+            "",
+            *options,
+        ]
+    )
+
+
+def test_batch_reports_failed_jobs(db_path):
+    assert _batch(db_path, "--fake-failure-rate", "1") == 1
+
+
+def test_batch_succeeds(db_path):
+    assert _batch(db_path) == 0
+    assert _question_count(db_path) > 0
@@ -0,0 +1,86 @@
+"""
+Coverage planning: counting by canonical category, deficit jobs, and a
+planned batch closing the gaps.
+"""
+
+import random
+
+from coverage_planner import plan_coverage, question_counts
+from fake_gemini import fake_questions
+from generate_batch_questions import generate_batch
+from generation_session import create_transport
+from question_db import connect, insert_questions
+
+CATEGORIES = [("Sports - Football", 12), ("History", 3)]
+DIFFICULTIES = ("Easy", "Hard")
+
+
+def test_old_spellings_count_towards_the_canonical_category(tmp_path):
+    conn = connect(str(tmp_path / "questions.db"))
+    rng = random.Random(0)
+    insert_questions(conn, fake_questions("Sports - Soccer", "Easy", 2, rng))
+    insert_questions(conn, fake_questions("Sports - Football", "Easy", 3, rng))
+    insert_questions(conn, fake_questions("History", "Hard", 1, rng))
+
+    assert question_counts(conn) == {("Sports - Football", "Easy"): 5, ("History", "Hard"): 1}
+    conn.close()
+
+
+def test_jobs_cover_only_the_deficits():
+    counts = {("Sports - Football", "Easy"): 5, ("History", "Hard"): 7}
+
+    jobs, rows = plan_coverage(
+        counts, categories=CATEGORIES, difficulties=DIFFICULTIES, max_job_size=5
+    )
+
+    assert jobs == [
+        ("Sports - Football", "Easy", 5),
+        ("Sports - Football", "Easy", 2),
+        ("Sports - Football", "Hard", 5),
+        ("Sports - Football", "Hard", 5),
+        ("Sports - Football", "Hard", 2),
+        ("History", "Easy", 3),
+    ]
+    history_hard = rows[-1]
+    assert (history_hard["have"], history_hard["deficit"], history_hard["requests"]) == (7, 0, 0)
+
+
+def test_scale_rounds_quotas_up():
+    jobs, _ = plan_coverage({}, categories=[("History", 3)], difficulties=("Easy",), scale=0.5)
+
+    assert jobs == [("History", "Easy", 2)]
+
+
+def test_equivalent_names_share_the_largest_quota():
+    categories = [("Sports - Soccer", 4), ("Sports - Football", 9)]
+
+    jobs, rows = plan_coverage({}, categories=categories, difficulties=("Easy",))
+
+    assert jobs == [("Sports - Football", "Easy", 9)]
+    assert len(rows) == 1
+
+
+def _plan(db_path):
+    conn = connect(db_path)
+    try:
+        jobs, _ = plan_coverage(
+            question_counts(conn), categories=CATEGORIES, difficulties=DIFFICULTIES
+        )
+        return jobs
+    finally:
+        conn.close()
+
+
+def test_planned_batch_fills_every_quota(tmp_path):
+    db_path = str(tmp_path / "questions.db")
+    connect(db_path).close()
+
+    summary = generate_batch(
+        _plan(db_path),
+        client=create_transport(fake=True, seed=5),
+        db_path=db_path,
+        journal=False,
+    )
+
+    assert summary["questions_added"] == 2 * (12 + 3)
+    assert _plan(db_path) == []
@@ -0,0 +1,93 @@
+"""
+Packed deck round trip: every question read back from the deck matches the
+database it was exported from.
+"""
+
+import random
+import sqlite3
+
+import pytest
+
+from export_deck import PackedDeck, _connect_read_only, export_deck
+from fake_gemini import fake_questions
+from question_db import connect, insert_questions
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "questions.db")
+    conn = connect(path)
+    for category in ("Sports", "Räksmörgås"):
+        insert_questions(
+            conn, fake_questions(category, "Medium", 5, random.Random(category))
+        )
+    conn.close()
+    return path
+
+
+def _database_questions(db_path):
+    conn = sqlite3.connect(db_path)
+    questions = []
+    for question_id, text, category, difficulty in conn.execute(
+        """
+        SELECT q.id, q.text, c.name, q.difficulty
+        FROM questions q JOIN categories c ON c.id = q.category_id
+        ORDER BY q.id
+        """
+    ):
+        options = [
+            {"text": answer, "isCorrect": bool(is_correct)}
+            for answer, is_correct in conn.execute(
+                "SELECT text, is_correct FROM answers WHERE question_id = ? ORDER BY id",
+                (question_id,),
+            )
+        ]
+        questions.append(
+            {
+                "id": question_id,
+                "question": text,
+                "options": options,
+                "category": category,
+                "difficulty": difficulty,
+            }
+        )
+    conn.close()
+    return questions
+
+
+def test_deck_round_trip(db_path, tmp_path):
+    deck_path = str(tmp_path / "questions.deck")
+    conn = _connect_read_only(db_path)
+    assert export_deck(conn, deck_path) == 10
+    conn.close()
+
+    with PackedDeck(deck_path) as deck:
+        assert [deck.question(i) for i in range(len(deck))] == _database_questions(db_path)
+
+
+def test_deck_integers_are_little_endian(db_path, tmp_path):
+    deck_path = str(tmp_path / "questions.deck")
+    conn = _connect_read_only(db_path)
+    export_deck(conn, deck_path)
+    conn.close()
+
+    with open(deck_path, "rb") as f:
+        data = f.read()
+    # Question count right after the 8-byte magic.
+    assert data[8:12] == (10).to_bytes(4, "little")
+
+
+def test_non_deck_file_is_rejected(tmp_path):
+    path = tmp_path / "not.deck"
+    path.write_bytes(b"\0" * 64)
+
+    with pytest.raises(ValueError):
+        PackedDeck(str(path))
+
+
+def test_missing_database_is_not_created(tmp_path):
+    path = tmp_path / "missing.db"
+
+    with pytest.raises(sqlite3.OperationalError):
+        _connect_read_only(str(path))
+    assert not path.exists()
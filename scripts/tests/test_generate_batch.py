@@ -0,0 +1,100 @@
+"""
+generate_batch's worker pool: the concurrency bound and per-job failure
+handling, run offline against fake_gemini.
+"""
+
+import threading
+
+import pytest
+
+from fake_gemini import FakeAPIError
+from generate_batch_questions import generate_batch
+from generation_session import create_transport
+from question_db import connect
+from request_packing import AdaptivePacker
+
+CATEGORIES = ("Sports", "History", "Music", "Art", "Film", "Food")
+JOBS = [(category, "Easy", 2) for category in CATEGORIES]
+
+
+class _TrackingClient:
+    # Wraps the fake transport, recording how many calls overlap and failing
+    # every request for `fail_category`.
+    def __init__(self, fail_category=None):
+        self.models = self
+        self._fake = create_transport(fake=True, seed=3, latency=0.05)
+        self._lock = threading.Lock()
+        self.fail_category = fail_category
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    def generate_content(self, model, contents, config=None):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.fail_category and f"Category: {self.fail_category}" in str(contents):
+                raise FakeAPIError(400, "Bad request (simulated)")
+            return self._fake.models.generate_content(model, contents, config)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "questions.db")
+    connect(path).close()
+    return path
+
+
+def _categories(db_path):
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT DISTINCT c.name FROM questions q JOIN categories c ON c.id = q.category_id"
+        )
+        return {name for (name,) in rows}
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_requests_in_flight_never_exceed_concurrency(db_path, concurrency):
+    client = _TrackingClient()
+
+    summary = generate_batch(JOBS, concurrency=concurrency, client=client, db_path=db_path)
+
+    assert client.calls == len(JOBS)
+    assert client.max_in_flight == concurrency
+    assert summary["questions_added"] == 2 * len(JOBS)
+
+
+def test_failed_job_does_not_stop_the_others(db_path):
+    client = _TrackingClient(fail_category="Music")
+
+    summary = generate_batch(JOBS, concurrency=3, client=client, db_path=db_path)
+
+    assert summary["failed_jobs"] == 1
+    assert summary["questions_added"] == 2 * (len(JOBS) - 1)
+    assert _categories(db_path) == set(CATEGORIES) - {"Music"}
+
+
+def test_failed_pack_fails_only_its_jobs(db_path):
+    client = _TrackingClient(fail_category="Music")
+
+    summary = generate_batch(
+        JOBS,
+        concurrency=2,
+        client=client,
+        db_path=db_path,
+        packer=AdaptivePacker(initial=2, window=100),
+    )
+
+    # Music is packed with one other job; both fail, the rest are added.
+    assert summary["requests"] == 3
+    assert summary["failed_jobs"] == 2
+    assert summary["questions_added"] == 2 * (len(JOBS) - 2)
+    assert client.max_in_flight <= 2
@@ -0,0 +1,86 @@
+"""
+Image generation: content-addressed storage, the index file and the
+concurrent prompt runner, against fake_gemini.
+"""
+
+import json
+import os
+
+from fake_gemini import FakeAPIError, fake_png
+from generate_image import generate_images, main, read_prompts, save_image
+from generation_session import GenerationSession, create_transport
+
+
+class _FailingClient:
+    # The fake transport, except that prompts mentioning "fail" error out.
+    def __init__(self):
+        self.models = self
+        self._fake = create_transport(fake=True)
+
+    def generate_images(self, model, prompt, config=None):
+        if "fail" in prompt:
+            raise FakeAPIError(400, "Bad request (simulated)")
+        return self._fake.models.generate_images(model, prompt, config)
+
+
+def _index(images_dir):
+    with open(os.path.join(images_dir, "index.jsonl"), encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_identical_images_are_stored_once(tmp_path):
+    image = fake_png(b"seed")
+
+    path, digest, created = save_image(image, str(tmp_path))
+    again = save_image(image, str(tmp_path), mime_type="image/png")
+
+    assert os.path.basename(path) == f"{digest}.png"
+    assert created
+    assert again == (path, digest, False)
+    assert save_image(image, str(tmp_path), mime_type="image/jpeg")[0].endswith(".jpg")
+    assert sorted(os.listdir(tmp_path)) == [f"{digest}.jpg", f"{digest}.png"]
+
+
+def test_every_prompt_is_saved_and_indexed(tmp_path):
+    prompts = ["A red bicycle", "Café at dusk", "A blue whale"]
+    session = GenerationSession(create_transport(fake=True))
+
+    results = generate_images(prompts, concurrency=2, session=session, images_dir=str(tmp_path))
+
+    assert set(results) == set(prompts)
+    assert len(set(results.values())) == 3
+    entries = {entry["prompt"]: entry for entry in _index(str(tmp_path))}
+    assert set(entries) == set(prompts)
+    for prompt, path in results.items():
+        assert entries[prompt]["file"] == os.path.basename(path)
+        assert entries[prompt]["bytes"] == os.path.getsize(path)
+
+
+def test_failed_prompts_do_not_stop_the_others(tmp_path, capsys):
+    session = GenerationSession(_FailingClient())
+
+    results = generate_images(
+        ["A red bicycle", "please fail", "A blue whale"],
+        concurrency=3,
+        session=session,
+        images_dir=str(tmp_path),
+    )
+
+    assert results["please fail"] is None
+    assert all(results[prompt] for prompt in ("A red bicycle", "A blue whale"))
+    assert [entry["prompt"] for entry in _index(str(tmp_path))].count("please fail") == 0
+    assert "Bad request (simulated)" in capsys.readouterr().out
+
+
+def test_read_prompts_skips_blanks_and_comments(tmp_path):
+    path = tmp_path / "prompts.txt"
+    path.write_text("# avatars\nA red bicycle\n\n   \n  A blue whale  \n", encoding="utf-8")
+
+    assert read_prompts(str(path)) == ["A red bicycle", "A blue whale"]
+
+
+def test_main_drops_duplicate_prompts(tmp_path, capsys):
+    main(["--fake", "-o", str(tmp_path), "A red bicycle", "A blue whale", "A red bicycle"])
+
+    assert len(_index(str(tmp_path))) == 2
+    assert capsys.readouterr().out.endswith(f"2/2 images saved to {tmp_path}\n")
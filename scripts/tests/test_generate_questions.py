@@ -0,0 +1,93 @@
+"""
+Offline tests for the request path, against fake_gemini through
+generation_session.create_transport.
+"""
+
+import json
+
+import pytest
+
+from fake_gemini import FakeResponse
+from generate_questions import build_request, generate_questions, request_json
+from generation_session import create_transport
+from metrics import Metrics
+from response_cache import ResponseCache, cache_key
+
+
+class _TextClient:
+    # Stub transport that answers every request with fixed text.
+    def __init__(self, text):
+        self.models = self
+        self.text = text
+
+    def generate_content(self, model, contents, config=None):
+        return FakeResponse(self.text)
+
+
+def test_request_json_parses_fake_response():
+    client = create_transport(fake=True, seed=1)
+
+    data = request_json(build_request("Sports", "Easy", 3), client=client)
+
+    assert len(data) == 3
+    for question in data:
+        assert question["category"] == "Sports"
+        assert question["difficulty"] == "Easy"
+        assert len(question["options"]) == 10
+    assert client.calls == 1
+
+
+def test_request_json_replays_cached_response(tmp_path):
+    client = create_transport(fake=True, seed=1)
+    cache = ResponseCache(tmp_path)
+    request = build_request("History", "Hard", 2)
+
+    first = request_json(request, client=client, cache=cache)
+    second = request_json(request, client=client, cache=cache)
+
+    assert second == first
+    assert client.calls == 1
+
+
+def test_request_json_raises_on_invalid_json(tmp_path):
+    cache = ResponseCache(tmp_path)
+    request = build_request("Music", "Medium", 2)
+
+    with pytest.raises(json.JSONDecodeError):
+        request_json(request, client=_TextClient("not json"), cache=cache)
+    model, prompt, _, config = request
+    assert cache.get(cache_key(model, prompt, config)) is None
+
+
+def test_generate_questions_with_fake_transport():
+    metrics = Metrics()
+
+    client = create_transport(fake=True, seed=2)
+
+    questions = generate_questions("Science", "Medium", 4, client=client, metrics=metrics)
+
+    assert len(questions) == 4
+    assert metrics.counter_value(
+        "gemini_requests_total", outcome="ok", category="Science", difficulty="Medium"
+    ) == 1
+
+
+def test_generate_questions_returns_none_on_api_error():
+    metrics = Metrics()
+    client = create_transport(fake=True, failure_rate=1.0)
+
+    assert generate_questions("Art", "Easy", 2, client=client, metrics=metrics) is None
+    assert metrics.counter_value(
+        "gemini_failures_total", reason="FakeAPIError", category="Art", difficulty="Easy"
+    ) == 1
+
+
+def test_generate_questions_returns_none_on_invalid_json():
+    metrics = Metrics()
+
+    result = generate_questions("Film", "Hard", 2, client=_TextClient("[{"), metrics=metrics)
+
+    assert result is None
+    assert metrics.counter_value(
+        "gemini_failures_total", reason="invalid_json", category="Film", difficulty="Hard"
+    ) == 1
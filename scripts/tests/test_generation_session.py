@@ -0,0 +1,94 @@
+"""
+GenerationSession: one lazily created client shared by every request, and
+the cache, metrics and rate limiter it applies.
+"""
+
+import threading
+import time
+
+import pytest
+
+import generation_session
+from generation_session import GenerationSession, create_transport, default_session
+from rate_limit import RateLimiter
+from response_cache import ResponseCache
+
+
+def test_client_is_created_once_across_threads():
+    created = []
+
+    def factory():
+        time.sleep(0.01)
+        created.append(create_transport(fake=True))
+        return created[-1]
+
+    session = GenerationSession(client_factory=factory)
+    clients = []
+    threads = [threading.Thread(target=lambda: clients.append(session.client)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(client is created[0] for client in clients)
+
+
+def test_missing_client_is_retried_on_next_access():
+    client = create_transport(fake=True)
+    results = [None, None, client]
+    session = GenerationSession(client_factory=lambda: results.pop(0))
+
+    assert session.client is None
+    with pytest.raises(RuntimeError):
+        session.generate_image("A red bicycle")
+    assert session.client is client
+    assert session.client is client
+
+
+def test_requests_share_the_cache_and_limiter(tmp_path):
+    client = create_transport(fake=True, seed=1)
+    limiter = RateLimiter()
+    session = GenerationSession(client, cache=ResponseCache(str(tmp_path)), limiter=limiter)
+
+    first = session.generate("Sports", "Easy", 3)
+    again = session.generate("Sports", "Easy", 3)
+    packed = session.generate_packed([("History", "Hard", 2), ("Art", "Easy", 1)])
+
+    assert again == first
+    assert [len(questions) for questions in packed] == [2, 1]
+    assert client.calls == 2
+    assert limiter.stats()["requests"] == 2
+    assert session.cache.stats()["hits"] == 1
+    outcomes = [
+        series["labels"]["outcome"]
+        for series in session.metrics.snapshot()
+        if series["name"] == "gemini_requests_total"
+    ]
+    assert sorted(outcomes) == ["cache_hit", "ok", "ok"]
+
+
+def test_stream_yields_questions():
+    session = GenerationSession(create_transport(fake=True, seed=2))
+
+    questions = list(session.stream("Music", "Medium", 4))
+
+    assert len(questions) == 4
+    assert {question["category"] for question in questions} == {"Music"}
+
+
+def test_generate_image_is_timed():
+    session = GenerationSession(create_transport(fake=True))
+
+    image_bytes, mime_type = session.generate_image("A red bicycle")
+
+    assert image_bytes.startswith(b"\x89PNG")
+    assert mime_type == "image/png"
+    (series,) = [s for s in session.metrics.snapshot() if s["name"] == "image_request_seconds"]
+    assert series["count"] == 1
+
+
+def test_default_session_is_shared(monkeypatch):
+    monkeypatch.setattr(generation_session, "_default_session", None)
+
+    assert default_session() is default_session()
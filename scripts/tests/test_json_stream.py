@@ -0,0 +1,81 @@
+"""
+iter_json_array against every way a document can be cut into chunks, and
+against malformed separators.
+"""
+
+import json
+
+import pytest
+
+from json_stream import JSONStreamError, iter_json_array
+
+DOCUMENT = json.dumps(
+    [
+        {"question": "Café — \"quoted\" \\ tab\t", "options": [1, 2.5, -3e-2]},
+        -1.5e3,
+        12,
+        "🏆 trophy",
+        True,
+        None,
+        [[], {}],
+    ]
+)
+
+
+def _split(text, *cuts):
+    bounds = [0, *cuts, len(text)]
+    return [text[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def test_every_split_point():
+    expected = json.loads(DOCUMENT)
+    for cut in range(len(DOCUMENT) + 1):
+        assert list(iter_json_array(_split(DOCUMENT, cut))) == expected, cut
+
+
+def test_one_character_chunks():
+    assert list(iter_json_array(DOCUMENT)) == json.loads(DOCUMENT)
+
+
+def test_escaped_unicode_split_inside_escape():
+    text = json.dumps(["é—"], ensure_ascii=True)
+    for cut in range(len(text) + 1):
+        assert list(iter_json_array(_split(text, cut))) == ["é—"], cut
+
+
+def test_preamble_before_array_is_skipped():
+    chunks = ["Here are your questions:\n```json\n", '[{"a": 1},', ' {"b": 2}]\n```']
+    assert list(iter_json_array(chunks)) == [{"a": 1}, {"b": 2}]
+
+
+def test_elements_are_yielded_before_the_stream_ends():
+    def chunks():
+        yield '[{"a": 1}, '
+        raise AssertionError("read past the first element")
+
+    assert next(iter_json_array(chunks())) == {"a": 1}
+
+
+@pytest.mark.parametrize("text", ["[]", " [ ] ", "[\n]"])
+def test_empty_array(text):
+    assert list(iter_json_array([text])) == []
+
+
+@pytest.mark.parametrize(
+    "text", ["[1,,2]", "[1 2]", "[1,]", "[,1]", '[{"a": 1} {"b": 2}]']
+)
+def test_malformed_separators(text):
+    for cut in range(len(text) + 1):
+        with pytest.raises(JSONStreamError):
+            list(iter_json_array(_split(text, cut)))
+
+
+@pytest.mark.parametrize("text", ["", "no array here", "[1, 2", '[{"a": "unterminated'])
+def test_missing_or_truncated_array(text):
+    with pytest.raises(JSONStreamError):
+        list(iter_json_array([text]))
+
+
+def test_invalid_element():
+    with pytest.raises(JSONStreamError):
+        list(iter_json_array(['[{"a": 1}, {"b": nope}]']))
@@ -0,0 +1,95 @@
+"""
+configure_logging: levels per destination, raw responses, compressed
+rotation and formatting in the calling thread.
+"""
+
+import gzip
+import logging
+
+import pytest
+
+from logging_setup import RAW_RESPONSE_LOGGER, configure_logging, stop_logging
+
+logger = logging.getLogger("tests.logging_setup")
+
+
+@pytest.fixture(autouse=True)
+def restore_logging():
+    # configure_logging replaces the root handlers, including pytest's.
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    raw_level = logging.getLogger(RAW_RESPONSE_LOGGER).level
+    yield
+    stop_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+    logging.getLogger(RAW_RESPONSE_LOGGER).setLevel(raw_level)
+
+
+def test_quiet_keeps_info_out_of_stdout_but_in_the_file(tmp_path, capsys):
+    log_file = tmp_path / "run.log"
+    configure_logging(log_file=str(log_file), quiet=True)
+
+    logger.info("Added %d questions", 5)
+    logger.warning("Retrying")
+    logger.debug("Prompt details")
+    stop_logging()
+
+    assert capsys.readouterr().out.endswith(" - WARNING - Retrying\n")
+    lines = log_file.read_text(encoding="utf-8").splitlines()
+    assert [line.split(" - ", 1)[1] for line in lines] == [
+        "INFO - Added 5 questions",
+        "WARNING - Retrying",
+    ]
+
+
+def test_verbose_logs_debug(capsys):
+    configure_logging(log_file=None, verbose=True)
+
+    logger.debug("Prompt details")
+    stop_logging()
+
+    assert "DEBUG - Prompt details" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("raw_responses", [False, True])
+def test_raw_responses_are_opt_in(capsys, raw_responses):
+    configure_logging(log_file=None, raw_responses=raw_responses)
+
+    logging.getLogger(RAW_RESPONSE_LOGGER).info("Raw response: %s", "[...]")
+    stop_logging()
+
+    assert ("Raw response: [...]" in capsys.readouterr().out) is raw_responses
+
+
+def test_message_is_formatted_when_logged(tmp_path):
+    log_file = tmp_path / "run.log"
+    configure_logging(log_file=str(log_file), quiet=True)
+    jobs = ["Sports"]
+
+    logger.info("Jobs: %s", jobs)
+    jobs.append("History")
+    stop_logging()
+
+    assert log_file.read_text(encoding="utf-8").endswith("Jobs: ['Sports']\n")
+
+
+def test_rotated_files_are_compressed(tmp_path):
+    log_file = tmp_path / "run.log"
+    configure_logging(log_file=str(log_file), quiet=True, max_bytes=2000, backup_count=2)
+
+    for i in range(100):
+        logger.info("Message %03d", i)
+    stop_logging()
+
+    rotated = sorted(path.name for path in tmp_path.iterdir())
+    assert rotated == ["run.log", "run.log.1.gz", "run.log.2.gz"]
+    with gzip.open(tmp_path / "run.log.1.gz", "rt", encoding="utf-8") as f:
+        previous = f.read().splitlines()
+    current = log_file.read_text(encoding="utf-8").splitlines()
+    # The newest rotated file ends right where the live file starts.
+    assert int(previous[-1].rsplit(" ", 1)[1]) + 1 == int(current[0].rsplit(" ", 1)[1])
+    assert current[-1].endswith("Message 099")
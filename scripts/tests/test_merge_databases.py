@@ -0,0 +1,95 @@
+"""
+merge_databases: dedupe against the target and within a source, and
+re-merging the same source.
+"""
+
+import random
+
+import pytest
+
+from fake_gemini import fake_questions
+from merge_databases import merge_databases
+from question_db import connect, insert_questions
+
+
+def _questions(category, count=3, seed=0):
+    return fake_questions(category, "Easy", count, random.Random(f"{category}{seed}"))
+
+
+def _database(path, *batches):
+    conn = connect(str(path))
+    try:
+        for batch in batches:
+            insert_questions(conn, batch)
+    finally:
+        conn.close()
+    return str(path)
+
+
+def _rows(path):
+    conn = connect(path)
+    try:
+        return conn.execute(
+            """
+            SELECT q.text, c.name, COUNT(a.id), SUM(a.is_correct)
+            FROM questions q
+            JOIN categories c ON c.id = q.category_id
+            LEFT JOIN answers a ON a.question_id = q.id
+            GROUP BY q.id
+            ORDER BY q.id
+            """
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def shared():
+    return _questions("Sports")
+
+
+def test_merge_skips_questions_already_in_target(tmp_path, shared):
+    target = _database(tmp_path / "target.db", shared)
+    source = _database(tmp_path / "source.db", _questions("Art"), shared)
+
+    (result,) = merge_databases(target, [source])
+
+    assert (result["questions_read"], result["questions_added"]) == (6, 3)
+    assert result["answers_added"] == 30
+    rows = _rows(target)
+    assert len(rows) == 6
+    assert set(rows) == set(_rows(source))
+    for text, category, answers, _ in rows:
+        assert text.startswith(f"{category} Topic")
+        assert answers == 10
+
+
+def test_merge_skips_repeats_across_sources(tmp_path, shared):
+    target = _database(tmp_path / "target.db")
+    first = _database(tmp_path / "first.db", shared)
+    second = _database(tmp_path / "second.db", _questions("Film"), shared)
+
+    results = merge_databases(target, [first, second])
+
+    assert [result["questions_added"] for result in results] == [3, 3]
+    assert len(_rows(target)) == 6
+
+
+def test_merge_is_idempotent(tmp_path, shared):
+    target = _database(tmp_path / "target.db", _questions("Music"))
+    source = _database(tmp_path / "source.db", shared, _questions("Art"))
+    merge_databases(target, [source])
+    merged = _rows(target)
+
+    (result,) = merge_databases(target, [source])
+
+    assert result["questions_added"] == 0
+    assert result["duplicates_skipped"] == 6
+    assert _rows(target) == merged
+
+
+def test_merge_skips_the_target_itself(tmp_path, shared):
+    target = _database(tmp_path / "target.db", shared)
+
+    assert merge_databases(target, [target]) == []
+    assert len(_rows(target)) == 3
@@ -0,0 +1,104 @@
+"""
+Metrics: labelled series, histogram buckets and both export formats.
+"""
+
+import json
+import threading
+
+from metrics import Metrics
+
+
+def test_counters_are_keyed_by_labels():
+    metrics = Metrics()
+    metrics.inc("jobs_total", outcome="ok", category="Sports")
+    metrics.inc("jobs_total", 2, category="Sports", outcome="ok")
+    metrics.inc("jobs_total", outcome="error", category="Sports")
+
+    assert metrics.counter_value("jobs_total", outcome="ok", category="Sports") == 3
+    assert metrics.counter_value("jobs_total", outcome="error", category="Sports") == 1
+    assert metrics.counter_value("jobs_total") == 0
+
+
+def test_increments_from_many_threads_are_not_lost():
+    metrics = Metrics()
+
+    def work():
+        for _ in range(1000):
+            metrics.inc("calls_total")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert metrics.counter_value("calls_total") == 8000
+
+
+def test_histogram_buckets():
+    metrics = Metrics()
+    metrics.describe("size", "Sizes", buckets=(1, 5))
+    for value in (0, 1, 3, 9):
+        metrics.observe("size", value)
+
+    (series,) = metrics.snapshot()
+
+    assert series["type"] == "histogram"
+    assert (series["count"], series["sum"]) == (4, 13)
+    # Values above the last bound only show up in the count (+Inf).
+    assert series["buckets"] == {1: 2, 5: 1}
+
+
+def test_timer_observes_the_block():
+    metrics = Metrics()
+
+    with metrics.timer("step_seconds", step="parse"):
+        pass
+
+    (series,) = metrics.snapshot()
+    assert series["labels"] == {"step": "parse"}
+    assert series["count"] == 1
+
+
+def test_write_jsonl_appends_tagged_runs(tmp_path):
+    path = str(tmp_path / "metrics.jsonl")
+    metrics = Metrics()
+    metrics.inc("jobs_total")
+    metrics.set("pack_size", 3)
+
+    metrics.write_jsonl(path, concurrency=2)
+    metrics.write_jsonl(path, concurrency=4)
+
+    with open(path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert [(line["name"], line["concurrency"]) for line in lines] == [
+        ("jobs_total", 2),
+        ("pack_size", 2),
+        ("jobs_total", 4),
+        ("pack_size", 4),
+    ]
+    assert all("timestamp" in line for line in lines)
+
+
+def test_write_prometheus(tmp_path):
+    path = tmp_path / "metrics.prom"
+    metrics = Metrics()
+    metrics.describe("latency_seconds", "Request latency", buckets=(0.5, 1))
+    metrics.observe("latency_seconds", 0.2, model="flash")
+    metrics.observe("latency_seconds", 0.7, model="flash")
+    metrics.observe("latency_seconds", 2, model="flash")
+    metrics.inc("failures_total", reason='bad "json"\n')
+
+    metrics.write_prometheus(str(path))
+
+    assert path.read_text(encoding="utf-8").splitlines() == [
+        "# TYPE failures_total counter",
+        'failures_total{reason="bad \\"json\\"\\n"} 1',
+        "# HELP latency_seconds Request latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{model="flash",le="0.5"} 1',
+        'latency_seconds_bucket{model="flash",le="1.0"} 2',
+        'latency_seconds_bucket{model="flash",le="+Inf"} 3',
+        'latency_seconds_sum{model="flash"} 2.9',
+        'latency_seconds_count{model="flash"} 3',
+    ]
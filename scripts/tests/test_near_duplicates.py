@@ -0,0 +1,105 @@
+"""
+Near-duplicate detection: the LSH index, the ingest-time filter and its
+rollback handling.
+"""
+
+import copy
+import random
+
+import pytest
+
+import question_db
+from fake_gemini import fake_questions
+from near_duplicates import (
+    LSHIndex,
+    NearDuplicateFilter,
+    find_near_duplicates,
+    minhash,
+    question_features,
+)
+from question_db import connect, delete_questions, insert_questions
+
+
+def _questions(category, count=3, seed=0):
+    return fake_questions(category, "Easy", count, random.Random(f"{category}{seed}"))
+
+
+def _variant(question):
+    # Same topic, one answer reworded: a near-duplicate, not an exact one.
+    question = copy.deepcopy(question)
+    question["options"][0]["text"] += " (variant)"
+    return question
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "questions.db"))
+    yield conn
+    conn.close()
+
+
+def test_similar_feature_sets_match():
+    base = question_features("Who won the 1998 World Cup?", [f"Team {i}" for i in range(10)])
+    index = LSHIndex(threshold=0.6)
+    index.add(1, minhash(base))
+    index.add(2, minhash(question_features("Capital of Peru?", ["Lima", "Cusco"])))
+
+    (match,) = index.query(minhash(base | {"a:team 10"}))
+
+    assert match[0] == 1
+    assert match[1] >= 0.6
+
+
+def test_filter_skips_near_duplicates_of_the_corpus(conn):
+    questions = _questions("Sports")
+    insert_questions(conn, questions)
+    near_filter = NearDuplicateFilter(conn)
+
+    result = insert_questions(
+        conn, [_variant(questions[0])] + _questions("Art"), near_filter=near_filter
+    )
+
+    assert (result.added, result.near_duplicates) == (3, 1)
+
+
+def test_filter_skips_near_duplicates_within_a_batch(conn):
+    (question,) = _questions("Sports", count=1)
+    near_filter = NearDuplicateFilter(conn)
+
+    result = insert_questions(conn, [question, _variant(question)], near_filter=near_filter)
+
+    assert (result.added, result.near_duplicates) == (1, 1)
+
+
+def test_rolled_back_questions_are_not_remembered(conn, monkeypatch):
+    questions = _questions("Sports")
+    near_filter = NearDuplicateFilter(conn)
+
+    def fail(*args):
+        raise RuntimeError("simulated failure")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(question_db, "_index_for_search", fail)
+        with pytest.raises(RuntimeError):
+            insert_questions(conn, questions, near_filter=near_filter)
+
+    result = insert_questions(
+        conn, [_variant(question) for question in questions], near_filter=near_filter
+    )
+    assert (result.added, result.near_duplicates) == (3, 0)
+    assert len(near_filter.index) == 3
+
+
+def test_find_near_duplicates_follows_deletes(conn):
+    questions = _questions("Sports")
+    insert_questions(conn, questions)
+    insert_questions(conn, [_variant(questions[1])])
+    ids = [row[0] for row in conn.execute("SELECT id FROM questions ORDER BY id")]
+
+    ((earlier, later, similarity),) = find_near_duplicates(conn)
+
+    assert (earlier, later) == (ids[1], ids[3])
+    assert similarity >= 0.6
+
+    delete_questions(conn, [ids[3]])
+    assert find_near_duplicates(conn) == []
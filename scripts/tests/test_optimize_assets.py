@@ -0,0 +1,63 @@
+"""
+optimize_assets: variant naming, the manifest's skip logic and cleanup of
+removed sources.
+"""
+
+import pytest
+from PIL import Image
+
+from optimize_assets import load_manifest, optimize_assets
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    path = tmp_path / "avatars"
+    path.mkdir()
+    Image.new("RGB", (80, 80), "red").save(path / "1.png")
+    Image.new("RGB", (80, 80), "blue").save(path / "1.jpg")
+    return path
+
+
+def _run(source_dir, out_dir):
+    return optimize_assets({"avatars": (str(source_dir), "avatar")}, str(out_dir), workers=1)
+
+
+def test_sources_differing_in_extension_keep_separate_variants(source_dir, tmp_path):
+    out_dir = tmp_path / "optimized"
+
+    summary = _run(source_dir, out_dir)
+
+    assert summary["processed"] == 2
+    entries = load_manifest(str(out_dir))["avatars"]
+    assert set(entries) == {"1.png", "1.jpg"}
+    paths = [v["path"] for entry in entries.values() for v in entry["variants"]]
+    assert len(paths) == len(set(paths)) == 4
+    with Image.open(out_dir / "avatars" / "1-png-64.png") as image:
+        assert image.getpixel((0, 0)) == (255, 0, 0)
+    with Image.open(out_dir / "avatars" / "1-jpg-64.png") as image:
+        assert image.getpixel((0, 0))[2] > 200
+
+
+def test_unchanged_sources_are_skipped(source_dir, tmp_path):
+    out_dir = tmp_path / "optimized"
+    _run(source_dir, out_dir)
+    Image.new("RGB", (80, 80), "green").save(source_dir / "1.png")
+
+    summary = _run(source_dir, out_dir)
+
+    assert (summary["processed"], summary["skipped"]) == (1, 1)
+
+
+def test_removed_sources_lose_their_variants(source_dir, tmp_path):
+    out_dir = tmp_path / "optimized"
+    _run(source_dir, out_dir)
+    (source_dir / "1.jpg").unlink()
+
+    summary = _run(source_dir, out_dir)
+
+    assert summary["removed"] == 1
+    assert set(load_manifest(str(out_dir))["avatars"]) == {"1.png"}
+    assert sorted(p.name for p in (out_dir / "avatars").iterdir()) == [
+        "1-png-64.png",
+        "1-png-64.webp",
+    ]
@@ -0,0 +1,116 @@
+"""
+optimize_database sampling keys: the triggers keep every stratum dense and
+in step with questions through inserts, deletes and updates.
+"""
+
+import random
+
+import pytest
+
+from fake_gemini import fake_questions
+from optimize_database import random_question_id, rebuild_sample_keys
+from question_db import connect, delete_questions, insert_questions, load_category_ids
+
+
+def _questions(category, difficulty, count, seed=0):
+    return fake_questions(
+        category, difficulty, count, random.Random(f"{category}{difficulty}{seed}")
+    )
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "questions.db"))
+    for category in ("Sports", "Art"):
+        for difficulty in ("Easy", "Hard"):
+            insert_questions(conn, _questions(category, difficulty, 5))
+    rebuild_sample_keys(conn)
+    yield conn
+    conn.close()
+
+
+def _expected_strata(conn):
+    strata = {}
+    for question_id, category_id, difficulty in conn.execute(
+        "SELECT id, category_id, difficulty FROM questions"
+    ):
+        for stratum in (
+            "all",
+            f"c:{category_id}",
+            f"d:{difficulty}",
+            f"cd:{category_id}:{difficulty}",
+        ):
+            strata.setdefault(stratum, set()).add(question_id)
+    return strata
+
+
+def _assert_consistent(conn):
+    expected = _expected_strata(conn)
+    counts = dict(conn.execute("SELECT stratum, size FROM question_sample_counts"))
+    for stratum, question_ids in expected.items():
+        rows = conn.execute(
+            "SELECT slot, question_id FROM question_sample WHERE stratum = ? ORDER BY slot",
+            (stratum,),
+        ).fetchall()
+        assert [slot for slot, _ in rows] == list(range(len(question_ids))), stratum
+        assert {question_id for _, question_id in rows} == question_ids, stratum
+        assert counts[stratum] == len(question_ids), stratum
+    # Strata emptied by deletes or updates have no slots left.
+    assert not conn.execute(
+        "SELECT stratum FROM question_sample WHERE stratum NOT IN (%s)"
+        % ",".join("?" * len(expected)),
+        list(expected),
+    ).fetchall()
+    assert all(size == 0 for stratum, size in counts.items() if stratum not in expected)
+
+
+def test_rebuild_fills_every_stratum(conn):
+    _assert_consistent(conn)
+    assert conn.execute(
+        "SELECT size FROM question_sample_counts WHERE stratum = 'all'"
+    ).fetchone() == (20,)
+
+
+def test_inserts_append_to_strata(conn):
+    insert_questions(conn, _questions("Film", "Easy", 3))
+    insert_questions(conn, _questions("Sports", "Hard", 2, seed=1))
+
+    _assert_consistent(conn)
+
+
+def test_deletes_keep_slots_dense(conn):
+    ids = [row[0] for row in conn.execute("SELECT id FROM questions ORDER BY id")]
+
+    delete_questions(conn, ids[::3])
+    _assert_consistent(conn)
+    delete_questions(conn, ids[-1:])
+    _assert_consistent(conn)
+
+
+def test_updates_move_questions_between_strata(conn):
+    art = load_category_ids(conn)["Art"]
+    ids = [row[0] for row in conn.execute("SELECT id FROM questions ORDER BY id")]
+
+    with conn:
+        conn.execute("UPDATE questions SET category_id = ? WHERE id = ?", (art, ids[0]))
+        conn.execute("UPDATE questions SET difficulty = 'Medium' WHERE id = ?", (ids[1],))
+        conn.execute(
+            "UPDATE questions SET category_id = ?, difficulty = 'Easy' WHERE id = ?",
+            (art, ids[-1]),
+        )
+        conn.execute("UPDATE questions SET text = 'Renamed' WHERE id = ?", (ids[2],))
+
+    _assert_consistent(conn)
+    assert random_question_id(conn, difficulty="Medium") == ids[1]
+
+
+def test_random_question_id_stays_in_stratum(conn):
+    sports = load_category_ids(conn)["Sports"]
+    rng = random.Random(0)
+
+    for _ in range(50):
+        question_id = random_question_id(conn, sports, "Hard", rng=rng)
+        assert conn.execute(
+            "SELECT category_id, difficulty FROM questions WHERE id = ?", (question_id,)
+        ).fetchone() == (sports, "Hard")
+    assert random_question_id(conn, sports, "Medium") is None
@@ -0,0 +1,111 @@
+"""
+Set-based ingest in question_db.insert_questions.
+"""
+
+import random
+import sqlite3
+
+import pytest
+
+import question_db
+from fake_gemini import fake_questions
+from question_db import SCHEMA_VERSION, connect, insert_questions, load_category_ids
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "questions.db"))
+    yield conn
+    conn.close()
+
+
+def _questions(category, count=3, seed=0):
+    return fake_questions(category, "Easy", count, random.Random(f"{category}{seed}"))
+
+
+def _filed_categories(conn):
+    # fake_questions topics start with their category name.
+    return conn.execute(
+        """
+        SELECT q.text, c.name FROM questions q
+        JOIN categories c ON c.id = q.category_id
+        """
+    ).fetchall()
+
+
+def test_insert_questions_adds_questions_and_answers(conn):
+    result = insert_questions(conn, _questions("Sports"))
+
+    assert result.added == 3
+    assert conn.execute("SELECT COUNT(*) FROM answers").fetchone() == (30,)
+
+
+def test_duplicates_are_skipped(conn):
+    questions = _questions("Sports")
+    insert_questions(conn, questions)
+
+    result = insert_questions(conn, questions + questions[:1])
+
+    assert (result.added, result.duplicates) == (0, 4)
+
+
+def test_rollback_restores_category_cache(conn, monkeypatch):
+    category_ids = load_category_ids(conn)
+
+    def fail(*args):
+        raise RuntimeError("simulated failure")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(question_db, "_index_for_search", fail)
+        with pytest.raises(RuntimeError):
+            insert_questions(conn, _questions("Art"), category_ids)
+    assert "Art" not in category_ids
+
+    insert_questions(conn, _questions("Film"), category_ids)
+    insert_questions(conn, _questions("Art", seed=1), category_ids)
+
+    filed = _filed_categories(conn)
+    assert len(filed) == 6
+    for text, category in filed:
+        assert text.startswith(f"{category} Topic")
+    assert category_ids == load_category_ids(conn)
+
+
+def test_old_schema_is_migrated_once(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    legacy = sqlite3.connect(path)
+    legacy.executescript(
+        """
+        CREATE TABLE categories (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT UNIQUE NOT NULL);
+        CREATE TABLE questions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            text TEXT NOT NULL,
+            category_id INTEGER NOT NULL,
+            difficulty TEXT NOT NULL
+        );
+        CREATE TABLE answers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            question_id INTEGER NOT NULL,
+            text TEXT NOT NULL,
+            is_correct BOOLEAN NOT NULL
+        );
+        INSERT INTO categories (name) VALUES ('Sports');
+        INSERT INTO questions (text, category_id, difficulty) VALUES ('Topic', 1, 'Easy');
+        INSERT INTO answers (question_id, text, is_correct) VALUES (1, 'A', 1);
+        """
+    )
+    legacy.close()
+
+    connect(path).close()
+    with open(path, "rb") as f:
+        migrated = f.read()
+    connect(path).close()
+
+    conn = sqlite3.connect(path)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(questions)")}
+    assert "fingerprint" in columns
+    assert conn.execute("SELECT fingerprint FROM questions").fetchone()[0]
+    assert conn.execute("PRAGMA user_version").fetchone() == (SCHEMA_VERSION,)
+    conn.close()
+    with open(path, "rb") as f:
+        assert f.read() == migrated
@@ -0,0 +1,159 @@
+"""
+RateLimiter budgets, retries and pauses, against a fake clock.
+"""
+
+import random
+
+import pytest
+
+import rate_limit
+from rate_limit import RateLimiter, backoff_delay, is_retryable
+
+
+class _Clock:
+    # Stands in for the time module: sleeping advances the clock instantly.
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+        self.on_sleep = None
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        if self.on_sleep is not None:
+            self.on_sleep()
+        self.now += seconds
+
+
+class _APIError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    return clock
+
+
+def test_requests_are_spaced_to_the_rpm_limit(clock):
+    limiter = RateLimiter(rpm=60)
+    started = clock.now
+
+    for _ in range(5):
+        limiter.acquire()
+
+    # One request of burst, then one per second.
+    assert clock.now - started == pytest.approx(4.0)
+    assert limiter.stats()["requests"] == 5
+
+
+def test_oversized_token_request_leaves_the_bucket_in_debt(clock):
+    limiter = RateLimiter(tpm=600)  # 10 tokens a second, bucket of 10
+    started = clock.now
+
+    assert limiter.acquire(tokens=50) == 0.0
+    limiter.acquire(tokens=10)
+
+    # The first request overdrew by 40 tokens, so the second waits 5s.
+    assert clock.now - started == pytest.approx(5.0)
+
+
+def test_record_usage_corrects_the_token_estimate(clock):
+    limiter = RateLimiter(tpm=600)
+    limiter.acquire(tokens=10)
+    limiter.record_usage(estimated=10, actual=0)
+
+    assert limiter.acquire(tokens=10) == 0.0
+
+
+def test_retryable_errors_are_retried(clock):
+    limiter = RateLimiter(retries=3)
+    outcomes = [_APIError(503), ConnectionError("reset"), "ok"]
+
+    def flaky():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert limiter.call(flaky) == "ok"
+    assert limiter.stats()["retries"] == 2
+    assert len(clock.slept) == 2
+
+
+def test_retries_run_out(clock):
+    limiter = RateLimiter(retries=2)
+    calls = []
+
+    def always_busy():
+        calls.append(1)
+        raise _APIError(503)
+
+    with pytest.raises(_APIError):
+        limiter.call(always_busy)
+    assert len(calls) == 3
+
+
+def test_other_errors_are_not_retried(clock):
+    limiter = RateLimiter(retries=5)
+    calls = []
+
+    def bad_request():
+        calls.append(1)
+        raise _APIError(400)
+
+    with pytest.raises(_APIError):
+        limiter.call(bad_request)
+    assert len(calls) == 1
+    assert clock.slept == []
+
+
+@pytest.mark.parametrize("code, other_wait", [(429, 2.0), (503, 0.0)])
+def test_rate_limit_error_pauses_every_caller(clock, monkeypatch, code, other_wait):
+    limiter = RateLimiter(retries=1)
+    monkeypatch.setattr(rate_limit, "backoff_delay", lambda *args: 2.0)
+    outcomes = [_APIError(code), "ok"]
+    other_waits = []
+
+    def other_worker():
+        # Another thread asking for budget while the failed call backs off.
+        clock.on_sleep = None
+        other_waits.append(limiter.acquire())
+
+    def limited():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            clock.on_sleep = other_worker
+            raise outcome
+        return outcome
+
+    assert limiter.call(limited) == "ok"
+    assert other_waits == [pytest.approx(other_wait)]
+    assert limiter.stats()["rate_limited"] == (code == 429)
+
+
+def test_backoff_delay_is_jittered_and_capped():
+    rng = random.Random(0)
+    delays = [backoff_delay(attempt, base=1.0, cap=8.0, rng=rng) for attempt in range(10)]
+
+    assert all(0 <= delay <= min(8.0, 2**attempt) for attempt, delay in enumerate(delays))
+    assert len(set(delays)) == len(delays)
+
+
+@pytest.mark.parametrize(
+    "error, retryable",
+    [
+        (_APIError(429), True),
+        (_APIError(500), True),
+        (_APIError(404), False),
+        (TimeoutError(), True),
+        (ValueError("bad json"), False),
+    ],
+)
+def test_is_retryable(error, retryable):
+    assert is_retryable(error) is retryable
@@ -0,0 +1,127 @@
+"""
+Request packing: filling packs, splitting packed responses and the
+adaptive pack size.
+"""
+
+from collections import deque
+
+import pytest
+
+from fake_gemini import FakeResponse
+from generation_session import GenerationSession, create_transport
+from metrics import Metrics
+from request_packing import AdaptivePacker, generate_packed, split_packed_response
+
+JOBS = [("Sports", "Easy", 2), ("History", "Hard", 3), ("Art", "Medium", 1)]
+
+
+class _TextClient:
+    # Stub transport that answers every request with fixed text.
+    def __init__(self, text):
+        self.models = self
+        self.text = text
+
+    def generate_content(self, model, contents, config=None):
+        return FakeResponse(self.text)
+
+
+def _question(text):
+    return {"question": text, "options": [], "category": "Other", "difficulty": "Other"}
+
+
+def test_take_fills_up_to_size_and_question_budget():
+    packer = AdaptivePacker(initial=3, max_questions=10)
+    pending = deque([("A", "Easy", 4), ("B", "Easy", 4), ("C", "Easy", 4), ("D", "Easy", 1)])
+
+    assert [job[0] for job in packer.take(pending)] == ["A", "B"]
+    assert [job[0] for job in packer.take(pending)] == ["C", "D"]
+    assert not pending
+
+
+def test_take_always_takes_one_job():
+    packer = AdaptivePacker(initial=4, max_questions=10)
+    pending = deque([("A", "Easy", 25), ("B", "Easy", 1)])
+
+    assert packer.take(pending) == [("A", "Easy", 25)]
+
+
+def test_split_matches_jobs_and_trims_to_count():
+    data = {
+        "jobs": [
+            {"job": 2, "questions": [_question(f"H{i}") for i in range(5)]},
+            {"job": 1, "questions": [_question("S0"), "junk"]},
+            {"job": 9, "questions": [_question("X")]},
+        ]
+    }
+
+    sports, history, art = split_packed_response(JOBS, data)
+
+    assert [q["question"] for q in sports] == ["S0"]
+    assert [q["question"] for q in history] == ["H0", "H1", "H2"]
+    assert {(q["category"], q["difficulty"]) for q in history} == {("History", "Hard")}
+    assert art is None
+
+
+def test_split_falls_back_to_position():
+    data = [{"questions": [_question("S0")]}, {"questions": [_question("H0")]}]
+
+    results = split_packed_response(JOBS, data)
+
+    assert [q and q[0]["question"] for q in results] == ["S0", "H0", None]
+
+
+def test_split_rejects_a_response_without_jobs():
+    with pytest.raises(ValueError):
+        split_packed_response(JOBS, {"questions": []})
+
+
+def test_generate_packed_sends_one_request():
+    client = create_transport(fake=True, seed=1)
+
+    results = generate_packed(JOBS, client=client)
+
+    assert client.calls == 1
+    assert [len(questions) for questions in results] == [2, 3, 1]
+    assert {q["category"] for q in results[1]} == {"History"}
+
+
+def test_failed_packed_request_fails_every_job_in_the_pack():
+    metrics = Metrics()
+    session = GenerationSession(client=_TextClient("not json"), metrics=metrics)
+
+    results, seconds = session.run_pack(JOBS)
+
+    assert results == [None, None, None]
+    assert seconds >= 0
+    assert metrics.counter_value(
+        "gemini_failures_total", reason="invalid_json", pack_size=3
+    ) == 1
+
+
+def test_packer_grows_while_larger_packs_are_faster():
+    packer = AdaptivePacker(initial=1, max_pack=3, window=1)
+
+    for _ in range(10):
+        # Fixed request time, so larger packs deliver more per second.
+        packer.record(packer.size, questions=5 * packer.size, seconds=1.0)
+
+    assert packer.size == 3
+
+
+def test_packer_backs_off_when_larger_packs_are_slower():
+    packer = AdaptivePacker(initial=1, max_pack=2, window=1, probe_every=100)
+
+    for _ in range(10):
+        # Time grows faster than the pack: after trying 2, it settles on 1.
+        packer.record(packer.size, questions=5 * packer.size, seconds=packer.size**2)
+
+    assert packer.size == 1
+
+
+def test_packer_halves_on_failures():
+    packer = AdaptivePacker(initial=6, window=2)
+
+    packer.record(6, questions=0, seconds=1.0, failed=True)
+    packer.record(6, questions=30, seconds=1.0)
+
+    assert packer.size == 3
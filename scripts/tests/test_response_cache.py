@@ -0,0 +1,66 @@
+"""
+ResponseCache keys, hits and misses, persistence and LRU eviction.
+"""
+
+import os
+
+from response_cache import ResponseCache, cache_key
+
+
+def _age(cache, key, seconds_ago):
+    # Backdate an entry's last use.
+    mtime = os.path.getmtime(cache._path(key)) - seconds_ago
+    os.utime(cache._path(key), (mtime, mtime))
+
+
+def test_key_covers_model_prompt_and_config():
+    key = cache_key("model", "prompt", {"a": 1, "b": 2})
+
+    assert key == cache_key("model", "prompt", {"b": 2, "a": 1})
+    assert key != cache_key("other", "prompt", {"a": 1, "b": 2})
+    assert key != cache_key("model", "prompt!", {"a": 1, "b": 2})
+    assert key != cache_key("model", "prompt", {"a": 1, "b": 3})
+    # Parts are length-prefixed, so moving text between them changes the key.
+    assert cache_key("ab", "c") != cache_key("a", "bc")
+
+
+def test_get_and_put(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    key = cache_key("model", "prompt")
+
+    assert cache.get(key) is None
+    cache.put(key, "[1, 2, 3]")
+    assert cache.get(key) == "[1, 2, 3]"
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["writes"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+    assert (stats["entries"], stats["bytes"]) == (1, 9)
+
+
+def test_entries_survive_reopening(tmp_path):
+    key = cache_key("model", "prompt")
+    ResponseCache(str(tmp_path)).put(key, "cached")
+
+    cache = ResponseCache(str(tmp_path))
+
+    assert cache.get(key) == "cached"
+    assert (cache.stats()["entries"], cache.stats()["bytes"]) == (1, 6)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=300)
+    keys = [cache_key("model", str(i)) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, "x" * 100)
+        _age(cache, key, 100 - i)
+    # Reading the oldest entry makes it the most recently used.
+    assert cache.get(keys[0]) is not None
+
+    cache.put(cache_key("model", "new"), "x" * 100)
+
+    # Over budget: entries go oldest first until the cache is under 90%.
+    assert [cache.get(key) is not None for key in keys] == [True, False, False]
+    assert cache.get(cache_key("model", "new")) is not None
+    stats = cache.stats()
+    assert (stats["evictions"], stats["entries"], stats["bytes"]) == (2, 2, 200)
@@ -0,0 +1,129 @@
+"""
+Full-text search: query parsing, ranking, and keeping the index in sync
+with inserts, deletes and merges.
+"""
+
+import random
+import sqlite3
+
+import pytest
+
+import question_db
+from fake_gemini import fake_questions
+from merge_databases import merge_databases
+from question_db import connect, delete_questions, insert_questions
+from search_index import (
+    SEARCH_TABLE,
+    build_search_index,
+    drop_search_index,
+    has_search_index,
+    match_query,
+    search,
+)
+
+
+def _question(text, answer="Filler", seed=0):
+    (question,) = fake_questions("Sports", "Easy", 1, random.Random(seed))
+    question["question"] = text
+    question["options"][0]["text"] = answer
+    return question
+
+
+def _indexed_ids(conn):
+    return [row[0] for row in conn.execute(f"SELECT rowid FROM {SEARCH_TABLE} ORDER BY rowid")]
+
+
+def _question_ids(conn):
+    return [row[0] for row in conn.execute("SELECT id FROM questions ORDER BY id")]
+
+
+def _hits(conn, query, **options):
+    return [hit[1] for hit in search(conn, query, **options)]
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "questions.db"))
+    insert_questions(
+        conn,
+        [
+            _question("Ballon d'Or Winners", answer="Kylian Mbappé", seed=1),
+            _question("World Cup Hosts", answer="Ballon Town", seed=2),
+        ],
+    )
+    build_search_index(conn)
+    yield conn
+    conn.close()
+
+
+def test_match_query_quotes_words_and_keeps_prefixes():
+    assert match_query('ballon d\'Or E-Sports world*') == '"ballon" "d\'Or" "E-Sports" "world"*'
+    assert match_query('"world cup" *') == '"world cup" "*"'
+    assert match_query("   ") == ""
+
+
+def test_search_ignores_diacritics_and_ranks_question_text_first(conn):
+    assert _hits(conn, "mbappe") == ["Ballon d'Or Winners"]
+    assert _hits(conn, "ballon") == ["Ballon d'Or Winners", "World Cup Hosts"]
+    assert _hits(conn, "wor*") == ["World Cup Hosts"]
+    assert _hits(conn, "") == []
+
+
+def test_malformed_raw_query_raises(conn):
+    assert _hits(conn, "ballon NOT mbappe", raw=True) == ["World Cup Hosts"]
+    with pytest.raises(sqlite3.OperationalError):
+        search(conn, "ballon AND", raw=True)
+
+
+def test_inserted_questions_are_indexed(conn):
+    insert_questions(conn, [_question("Tour de France Winners", answer="Merckx", seed=3)])
+
+    assert _hits(conn, "merckx") == ["Tour de France Winners"]
+    assert _indexed_ids(conn) == _question_ids(conn)
+
+
+def test_failed_insert_leaves_the_index_unchanged(conn, monkeypatch):
+    def fail(*args):
+        raise RuntimeError("simulated failure")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(question_db, "_index_for_search", fail)
+        with pytest.raises(RuntimeError):
+            insert_questions(conn, [_question("Tour de France Winners", seed=3)])
+
+    assert _hits(conn, "tour") == []
+    assert _indexed_ids(conn) == _question_ids(conn)
+
+
+def test_deleted_questions_leave_the_index(conn):
+    (hit,) = search(conn, "mbappe")
+
+    delete_questions(conn, [hit[0]])
+
+    assert _hits(conn, "mbappe") == []
+    assert _indexed_ids(conn) == _question_ids(conn)
+
+
+def test_merged_questions_are_indexed(conn, tmp_path):
+    source = connect(str(tmp_path / "source.db"))
+    insert_questions(source, [_question("Olympic Hosts", answer="Mbappé Stadium", seed=4)])
+    source.close()
+    target = str(tmp_path / "questions.db")
+    conn.close()
+
+    merge_databases(target, [str(tmp_path / "source.db")])
+
+    conn = connect(target)
+    assert sorted(_hits(conn, "mbappe")) == ["Ballon d'Or Winners", "Olympic Hosts"]
+    assert _indexed_ids(conn) == _question_ids(conn)
+    conn.close()
+
+
+def test_drop_removes_index_and_trigger(conn):
+    drop_search_index(conn)
+
+    assert not has_search_index(conn)
+    assert conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'").fetchall() == []
+    # Inserts and deletes work without an index.
+    insert_questions(conn, [_question("Tour de France Winners", seed=3)])
+    delete_questions(conn, _question_ids(conn)[:1])
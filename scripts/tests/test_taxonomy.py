@@ -0,0 +1,114 @@
+"""
+Category tree: path normalization, subtree counts and subtree sampling with
+and without sampling keys.
+"""
+
+import random
+import sqlite3
+
+import pytest
+
+from fake_gemini import fake_questions
+from optimize_database import rebuild_sample_keys
+from question_db import connect, delete_questions, insert_questions
+from taxonomy import (
+    build_taxonomy,
+    canonical_name,
+    category_path,
+    find_category,
+    random_subtree_question,
+    subtree_question_count,
+)
+
+CATEGORIES = (
+    "Sports - Football - Premier League",
+    "Sports - Soccer",
+    "Sports - Tennis",
+    "Music - Jazz",
+)
+
+
+def test_category_path_normalizes_segments():
+    assert category_path("  Sports -  Soccer - - E-Sports ") == (
+        "Sports",
+        "Football",
+        "E-Sports",
+    )
+    assert canonical_name("Sports - soccer") == "Sports - Football"
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "questions.db"))
+    build_taxonomy(conn)
+    for index, category in enumerate(CATEGORIES):
+        for difficulty in ("Easy", "Hard"):
+            insert_questions(
+                conn,
+                fake_questions(category, difficulty, 3, random.Random(f"{index}{difficulty}")),
+            )
+    yield conn
+    conn.close()
+
+
+def _subtree_ids(conn, prefix, difficulty=None):
+    sql = """
+        SELECT q.id FROM questions q JOIN categories c ON c.id = q.category_id
+        WHERE c.name LIKE ?
+    """
+    params = [f"{prefix}%"]
+    if difficulty is not None:
+        sql += " AND q.difficulty = ?"
+        params.append(difficulty)
+    return {row[0] for row in conn.execute(sql, params)}
+
+
+def test_new_categories_join_the_tree(conn):
+    sports = find_category(conn, "Sports")
+
+    assert subtree_question_count(conn, sports) == 18
+    assert subtree_question_count(conn, sports, "Hard") == 9
+    # The alias's questions are counted under the canonical node.
+    assert subtree_question_count(conn, find_category(conn, "Sports - Football")) == 12
+
+
+@pytest.mark.parametrize("sample_keys", [False, True])
+@pytest.mark.parametrize("difficulty", [None, "Easy"])
+def test_random_subtree_question_covers_the_subtree(conn, sample_keys, difficulty):
+    if sample_keys:
+        rebuild_sample_keys(conn)
+    football = find_category(conn, "Sports - Football")
+    expected = _subtree_ids(conn, "Sports - ", difficulty) - _subtree_ids(
+        conn, "Sports - Tennis"
+    )
+    rng = random.Random(1)
+
+    picked = {random_subtree_question(conn, football, difficulty, rng) for _ in range(300)}
+
+    assert picked == expected
+
+
+def test_random_subtree_question_follows_deletes(conn):
+    rebuild_sample_keys(conn)
+    music = find_category(conn, "Music")
+
+    delete_questions(conn, _subtree_ids(conn, "Music"))
+
+    assert random_subtree_question(conn, music) is None
+
+
+def test_sampling_keys_avoid_reading_questions(conn):
+    rebuild_sample_keys(conn)
+    tables = set()
+
+    def record(action, table, *args):
+        if action == sqlite3.SQLITE_READ:
+            tables.add(table)
+        return sqlite3.SQLITE_OK
+
+    conn.set_authorizer(record)
+    random_subtree_question(conn, find_category(conn, "Sports"), "Hard")
+    conn.set_authorizer(None)
+
+    assert "questions" not in tables
+    assert "question_sample" in tables
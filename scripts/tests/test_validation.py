@@ -0,0 +1,98 @@
+"""
+Validation rules, and quarantining rejects on insert and on a database scan.
+"""
+
+import copy
+import random
+
+import pytest
+
+from fake_gemini import fake_questions
+from question_db import connect, insert_questions
+from validation import (
+    MAX_OPTION_LENGTH,
+    MAX_QUESTION_LENGTH,
+    quarantine_summary,
+    scan_database,
+    validate_question,
+)
+
+
+@pytest.fixture
+def question():
+    return fake_questions("Sports", "Easy", 1, random.Random(0))[0]
+
+
+def _codes(question):
+    return {code for code, _ in validate_question(question)}
+
+
+def _with(question, change):
+    question = copy.deepcopy(question)
+    change(question)
+    return question
+
+
+def test_valid_question_passes(question):
+    assert validate_question(question) == []
+
+
+@pytest.mark.parametrize(
+    "change, code",
+    [
+        (lambda q: q.pop("options"), "missing_field"),
+        (lambda q: q.update(question="  "), "empty_question"),
+        (lambda q: q.update(question="x" * (MAX_QUESTION_LENGTH + 1)), "question_too_long"),
+        (lambda q: q.update(category=""), "empty_category"),
+        (lambda q: q.update(difficulty="Trivial"), "invalid_difficulty"),
+        (lambda q: q.update(options="A, B"), "malformed_options"),
+        (lambda q: q["options"].pop(), "option_count"),
+        (lambda q: q["options"][0].update(isCorrect="yes"), "malformed_option"),
+        (lambda q: q["options"][0].update(text=" "), "empty_option"),
+        (
+            lambda q: q["options"][0].update(text="x" * (MAX_OPTION_LENGTH + 1)),
+            "option_too_long",
+        ),
+        (
+            lambda q: q["options"][1].update(text=f" {q['options'][0]['text'].upper()} "),
+            "duplicate_option",
+        ),
+        (
+            lambda q: [option.update(isCorrect=False) for option in q["options"]],
+            "correct_count",
+        ),
+    ],
+)
+def test_rule(question, change, code):
+    assert code in _codes(_with(question, change))
+
+
+def test_non_object_is_rejected():
+    assert _codes(["not", "a", "question"]) == {"not_an_object"}
+
+
+def test_rejects_are_quarantined_on_insert(tmp_path, question):
+    conn = connect(str(tmp_path / "questions.db"))
+    bad = _with(question, lambda q: q.update(difficulty="Trivial", question="Other"))
+
+    result = insert_questions(conn, [question, bad, "junk"])
+
+    assert (result.added, result.rejected) == (1, 2)
+    assert quarantine_summary(conn) == {"invalid_difficulty": 1, "not_an_object": 1}
+    assert conn.execute(
+        "SELECT category, difficulty, question FROM quarantine WHERE question IS NOT NULL"
+    ).fetchall() == [("Sports", "Trivial", "Other")]
+    conn.close()
+
+
+def test_scan_finds_invalid_live_questions(tmp_path, question):
+    conn = connect(str(tmp_path / "questions.db"))
+    insert_questions(conn, [question])
+    with conn:
+        conn.execute("UPDATE answers SET is_correct = 0")
+
+    ((_, scanned, problems),) = scan_database(conn)
+
+    assert scanned["question"] == question["question"]
+    assert [code for code, _ in problems] == ["correct_count"]
+    conn.close()
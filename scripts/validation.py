@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Validation stage between generation and insert.
+
+Generated questions are checked against the contract in the prompt:
+required fields present, a known difficulty, exactly 10 options with 1-10
+correct, no empty or duplicate option texts, and sane text lengths.
+Questions that fail are not inserted; question_db.insert_questions writes
+them to the quarantine table with the reasons, where they can be reviewed.
+
+Run as a script to summarize the quarantine, or to scan the live tables
+for questions that don't pass and (with --move) quarantine them.
+"""
+
+import argparse
+import json
+import unicodedata
+from collections import Counter
+
+REQUIRED_FIELDS = ("category", "question", "difficulty", "options")
+DIFFICULTY_LEVELS = ("Easy", "Medium", "Hard")
+
+OPTIONS_PER_QUESTION = 10
+MIN_CORRECT = 1
+MAX_CORRECT = 10
+MAX_QUESTION_LENGTH = 200
+MAX_CATEGORY_LENGTH = 200
+MAX_OPTION_LENGTH = 150
+
+QUARANTINE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quarantine (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category TEXT,
+    difficulty TEXT,
+    question TEXT,
+    payload TEXT NOT NULL,
+    reasons TEXT NOT NULL,
+    details TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+
+def _option_key(text):
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def _check_text(problems, value, code, max_length, label):
+    if not isinstance(value, str) or not value.strip():
+        problems.append((f"empty_{code}", f"{label} is empty"))
+    elif len(value) > max_length:
+        problems.append(
+            (f"{code}_too_long", f"{label} is {len(value)} characters (max {max_length})")
+        )
+
+
+def validate_question(question):
+    """
+    Return a list of (reason code, detail) problems with one generated
+    question; an empty list means it is valid.
+    """
+    if not isinstance(question, dict):
+        return [("not_an_object", f"expected an object, got {type(question).__name__}")]
+
+    missing = [field for field in REQUIRED_FIELDS if field not in question]
+    if missing:
+        return [("missing_field", f"missing {', '.join(missing)}")]
+
+    problems = []
+    _check_text(problems, question["question"], "question", MAX_QUESTION_LENGTH, "question")
+    _check_text(problems, question["category"], "category", MAX_CATEGORY_LENGTH, "category")
+    if question["difficulty"] not in DIFFICULTY_LEVELS:
+        expected = ", ".join(DIFFICULTY_LEVELS)
+        problems.append(
+            (
+                "invalid_difficulty",
+                f"difficulty {question['difficulty']!r} is not one of {expected}",
+            )
+        )
+
+    options = question["options"]
+    if not isinstance(options, list):
+        problems.append(("malformed_options", "options is not a list"))
+        return problems
+    if len(options) != OPTIONS_PER_QUESTION:
+        problems.append(
+            ("option_count", f"{len(options)} options (expected {OPTIONS_PER_QUESTION})")
+        )
+
+    correct = 0
+    seen = set()
+    repeated = set()
+    for i, option in enumerate(options, start=1):
+        if (
+            not isinstance(option, dict)
+            or not isinstance(option.get("text"), str)
+            or not isinstance(option.get("isCorrect"), bool)
+        ):
+            problems.append(
+                ("malformed_option", f"option {i} needs text and boolean isCorrect")
+            )
+            continue
+        correct += option["isCorrect"]
+        text = option["text"]
+        if not text.strip():
+            problems.append(("empty_option", f"option {i} is empty"))
+            continue
+        if len(text) > MAX_OPTION_LENGTH:
+            problems.append(
+                (
+                    "option_too_long",
+                    f"option {i} is {len(text)} characters (max {MAX_OPTION_LENGTH})",
+                )
+            )
+        key = _option_key(text)
+        if key in seen and key not in repeated:
+            problems.append(("duplicate_option", f"option {i} repeats {text!r}"))
+            repeated.add(key)
+        seen.add(key)
+
+    if not MIN_CORRECT <= correct <= MAX_CORRECT:
+        expected = f"{MIN_CORRECT}-{MAX_CORRECT}"
+        problems.append(("correct_count", f"{correct} correct options (expected {expected})"))
+    return problems
+
+
+def validate_questions(questions):
+    """
+    Split a batch into (valid, rejected), where rejected is a list of
+    (question, problems) pairs.
+    """
+    valid = []
+    rejected = []
+    for question in questions:
+        problems = validate_question(question)
+        if problems:
+            rejected.append((question, problems))
+        else:
+            valid.append(question)
+    return valid, rejected
+
+
+def quarantine_rows(rejected):
+    """
+    Build quarantine table rows for validate_questions rejects.
+    """
+    rows = []
+    for question, problems in rejected:
+        fields = question if isinstance(question, dict) else {}
+        rows.append(
+            (
+                _as_text(fields.get("category")),
+                _as_text(fields.get("difficulty")),
+                _as_text(fields.get("question")),
+                json.dumps(question, ensure_ascii=False, default=str),
+                ",".join(sorted({code for code, _ in problems})),
+                "; ".join(detail for _, detail in problems),
+            )
+        )
+    return rows
+
+
+def _as_text(value):
+    return value if isinstance(value, str) else None
+
+
+def insert_quarantine(conn, rejected):
+    """
+    Write rejects to the quarantine table inside the caller's transaction.
+    """
+    conn.executemany(
+        """
+        INSERT INTO quarantine (category, difficulty, question, payload, reasons, details)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        quarantine_rows(rejected),
+    )
+
+
+def load_live_questions(conn):
+    """
+    Yield (question id, question dict) for every question in the live tables.
+    """
+    rows = conn.execute(
+        """
+        SELECT q.id, q.text, c.name, q.difficulty, a.text, a.is_correct
+        FROM questions q
+        JOIN categories c ON c.id = q.category_id
+        LEFT JOIN answers a ON a.question_id = q.id
+        ORDER BY q.id, a.id
+        """
+    )
+    current_id = None
+    question = None
+    for question_id, text, category, difficulty, answer, is_correct in rows:
+        if question_id != current_id:
+            if question is not None:
+                yield current_id, question
+            current_id = question_id
+            question = {
+                "question": text,
+                "options": [],
+                "category": category,
+                "difficulty": difficulty,
+            }
+        if answer is not None:
+            question["options"].append({"text": answer, "isCorrect": bool(is_correct)})
+    if question is not None:
+        yield current_id, question
+
+
+def scan_database(conn):
+    """
+    Validate every live question. Returns [(question id, question, problems)]
+    for those that fail.
+    """
+    failures = []
+    for question_id, question in load_live_questions(conn):
+        problems = validate_question(question)
+        if problems:
+            failures.append((question_id, question, problems))
+    return failures
+
+
+def quarantine_summary(conn):
+    """
+    Return a Counter of quarantined questions per reason code.
+    """
+    counts = Counter()
+    for (reasons,) in conn.execute("SELECT reasons FROM quarantine"):
+        counts.update(reasons.split(","))
+    return counts
+
+
+def main():
+    from question_db import DEFAULT_DB_PATH, connect, delete_question_rows
+
+    parser = argparse.ArgumentParser(
+        description="Summarize quarantined questions or validate the live tables."
+    )
+    parser.add_argument(
+        "--db",
+        default=DEFAULT_DB_PATH,
+        help=f"SQLite database path (default: {DEFAULT_DB_PATH})",
+    )
+    parser.add_argument(
+        "--scan",
+        action="store_true",
+        help="validate every question already in the database",
+    )
+    parser.add_argument(
+        "--move",
+        action="store_true",
+        help="with --scan, move failing questions into the quarantine table",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="list each question")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+
+    if args.scan:
+        failures = scan_database(conn)
+        print(f"{len(failures)} live questions fail validation")
+        counts = Counter()
+        for _, _, problems in failures:
+            counts.update({code for code, _ in problems})
+        for code, count in counts.most_common():
+            print(f"  {code}: {count}")
+        if args.verbose:
+            for question_id, question, problems in failures:
+                details = "; ".join(detail for _, detail in problems)
+                print(f"  #{question_id} {question['question']!r}: {details}")
+        if args.move and failures:
+            # One transaction, so a question is never both live and quarantined.
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                insert_quarantine(conn, [(q, problems) for _, q, problems in failures])
+                deleted = delete_question_rows(
+                    conn, [question_id for question_id, _, _ in failures]
+                )
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            print(f"Moved {deleted} questions to the quarantine table")
+    else:
+        counts = quarantine_summary(conn)
+        (total,) = conn.execute("SELECT COUNT(*) FROM quarantine").fetchone()
+        print(f"{total} quarantined questions")
+        for code, count in counts.most_common():
+            print(f"  {code}: {count}")
+        if args.verbose:
+            for question, details, created_at in conn.execute(
+                "SELECT question, details, created_at FROM quarantine ORDER BY id"
+            ):
+                print(f"  [{created_at}] {question!r}: {details}")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()